@@ -0,0 +1,84 @@
+# Utilidades compartidas por los benchmarks: generan archivos CSV sintéticos con el mismo
+# formato que usa TaskManager (tasks.csv y subtasks.csv).
+import csv
+import itertools
+import os
+import random
+import sys
+
+# Permite importar index.py desde la carpeta superior al ejecutar los benchmarks como scripts.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Distribuciones de la cantidad de sub-tareas por tarea:
+#   - 'fixed': todas las tareas tienen subtasks_per_task sub-tareas.
+#   - 'uniform': entre 0 y 2 * subtasks_per_task, al azar (el promedio es subtasks_per_task).
+#   - 'skewed': distribución de Pareto; la mayoría tiene pocas y unas pocas tienen cientos.
+DISTRIBUTIONS = ('fixed', 'uniform', 'skewed')
+
+# Palabras de los títulos aleatorios (con acentos, para ejercitar la búsqueda sin acentos).
+WORDS = ("revisar enviar llamar preparar informe reunión presupuesto cliente proveedor factura "
+         "diseño prueba versión corrección documentación planificación compra entrega equipo "
+         "actualizar migrar servidor copia pedido contrato análisis revisión página menú").split()
+
+
+# Devuelve un generador con la cantidad de sub-tareas de cada una de n_tasks tareas.
+def fan_outs(n_tasks, subtasks_per_task, distribution, rng):
+    if distribution == 'fixed':
+        return itertools.repeat(subtasks_per_task, n_tasks)
+    if distribution == 'uniform':
+        return (rng.randint(0, 2 * subtasks_per_task) for _ in range(n_tasks))
+    if distribution == 'skewed':
+        # paretovariate(1.5) tiene promedio 3; se escala para que el promedio se acerque a
+        # subtasks_per_task (queda algo por debajo, porque se trunca y se limita a 'limit').
+        limit = 1000 * max(subtasks_per_task, 1)
+        return (min(int(rng.paretovariate(1.5) * subtasks_per_task / 3), limit) for _ in range(n_tasks))
+    raise ValueError(f"Distribución desconocida: {distribution!r}")
+
+
+# Escribe un conjunto de datos con n_tasks tareas y subtasks_per_task sub-tareas por tarea.
+# Devuelve las rutas (task_file, subtask_file) de los archivos generados.
+#
+# Sin más argumentos los títulos son "Tarea N" y "Sub N.M", y el estado completada sigue una regla
+# fija, como esperan los benchmarks existentes. Con title_words se generan títulos de esa cantidad
+# de palabras al azar; completed_ratio es la proporción de completadas; 'seed' hace reproducible
+# todo lo aleatorio.
+def write_dataset(directory, n_tasks, subtasks_per_task=2, distribution='fixed', title_words=None,
+                  completed_ratio=None, seed=0):
+    task_file = os.path.join(directory, 'tasks.csv')
+    subtask_file = os.path.join(directory, 'subtasks.csv')
+    rng = random.Random(seed)
+
+    if title_words:
+        def title(default):
+            return ' '.join(rng.choices(WORDS, k=title_words)).capitalize()
+    else:
+        def title(default):
+            return default
+
+    if completed_ratio is None:
+        def done(default):
+            return default
+    else:
+        def done(default):
+            return rng.random() < completed_ratio
+
+    with open(task_file, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["id", "title", "completed"])
+        writer.writerows([task_id, title(f"Tarea {task_id}"), done(task_id % 3 == 0)]
+                         for task_id in range(1, n_tasks + 1))
+
+    with open(subtask_file, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["id", "task_id", "title", "completed"])
+        subtask_id = 1
+        counts = fan_outs(n_tasks, subtasks_per_task, distribution, rng)
+        for task_id, count in zip(range(1, n_tasks + 1), counts):
+            rows = []
+            for position in range(1, count + 1):
+                rows.append([subtask_id, task_id, title(f"Sub {task_id}.{position}"),
+                             done(subtask_id % 2 == 0)])
+                subtask_id += 1
+            writer.writerows(rows)
+
+    return task_file, subtask_file
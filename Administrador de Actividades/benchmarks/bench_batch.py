@@ -0,0 +1,54 @@
+# Benchmark de carga masiva: agregar N tareas (y 2 sub-tareas por tarea) una por una, reescribiendo
+# el CSV en cada alta (O(n²)), frente a add_tasks/add_subtasks dentro de un bloque batch(),
+# que escribe una sola vez (O(n)).
+#
+# Uso: python benchmarks/bench_batch.py [tamaño ...]
+import os
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+SIZES = [1_000, 2_000, 10_000, 100_000]
+
+# Por encima de este tamaño la carga una por una tarda demasiado y no se mide.
+UNBATCHED_LIMIT = 2_000
+
+
+def one_by_one(manager, size):
+    for number in range(size):
+        task = manager.add_task(f"Tarea {number}")
+        manager.add_subtask(task.id, "Sub 1")
+        manager.add_subtask(task.id, "Sub 2")
+
+
+def batched(manager, size):
+    with manager.batch():
+        tasks = manager.add_tasks(f"Tarea {number}" for number in range(size))
+        for task in tasks:
+            manager.add_subtasks(task.id, ["Sub 1", "Sub 2"])
+
+
+def run(loader, size):
+    with tempfile.TemporaryDirectory() as directory:
+        manager = TaskManager(*write_dataset(directory, 0))
+        start = time.perf_counter()
+        loader(manager, size)
+        elapsed = time.perf_counter() - start
+        assert os.path.getsize(manager.task_file) > size
+    return elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tareas':>8} {'una por una':>14} {'batch':>10} {'batch/fila':>12}")
+    for size in sizes:
+        unbatched = f"{run(one_by_one, size):>12.2f} s" if size <= UNBATCHED_LIMIT else f"{'-':>14}"
+        elapsed = run(batched, size)
+        print(f"{size:>8} {unbatched} {elapsed:>8.2f} s {elapsed / (size * 3) * 1e6:>9.1f} us")
+
+
+if __name__ == "__main__":
+    main()
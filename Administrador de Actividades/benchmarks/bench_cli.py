@@ -0,0 +1,72 @@
+# Benchmark de la línea de comandos: aplicar N comandos con 'cli.py batch' (una carga y una
+# escritura) frente a ejecutar 'cli.py' una vez por comando. La ejecución por comando se mide con
+# unos pocos comandos y se extrapola. Al final comprueba que el resultado del batch sea el esperado.
+#
+# Uso: python benchmarks/bench_cli.py [comandos] [cantidad de tareas] [--journal]
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+CLI = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cli.py')
+
+# Cantidad de comandos que se ejecutan uno por uno para estimar su coste.
+SINGLE_SAMPLE = 20
+
+
+# Genera 'count' comandos: por cada grupo de cinco, una tarea nueva con dos sub-tareas, una marca
+# sobre una tarea existente y el borrado de una sub-tarea existente.
+def commands(count, n_tasks):
+    lines = []
+    for number in range(count // 5):
+        lines.append(f"add Tarea nueva {number}\n")
+        lines.append(f"add --parent $ Sub {number}.1\n")
+        lines.append(f"add --parent $ Sub {number}.2\n")
+        lines.append(f"complete {number % n_tasks + 1}\n")
+        lines.append(f"delete --subtask {2 * number + 1}\n")
+    return lines
+
+
+def run(arguments, data=None):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, CLI, *arguments], input=data, text=True, check=True,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    journal = '--journal' in sys.argv
+    count = int(args[0]) if args else 50_000
+    n_tasks = int(args[1]) if len(args) > 1 else 100_000
+    options = ['--journal'] if journal else []
+
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks)
+        options += ['--tasks', task_file, '--subtasks', subtask_file, '--fsync', 'never']
+        lines = commands(count, n_tasks)
+
+        batch_seconds = run(options + ['batch'], ''.join(lines))
+        single_seconds = sum(run(options + line.split()[:1] + [line.split()[-1]])
+                             for line in lines[3:3 + SINGLE_SAMPLE * 5:5]) / SINGLE_SAMPLE
+
+        manager = TaskManager(task_file, subtask_file, journal=journal)
+        completed_tasks, tasks, _, subtasks = manager.summary()
+        groups = count // 5
+        assert tasks == n_tasks + groups, tasks
+        assert subtasks == 2 * n_tasks + groups, subtasks
+        assert all(manager.get_task(number % n_tasks + 1).completed for number in range(groups))
+        manager.close()
+
+    print(f"{n_tasks} tareas, {len(lines)} comandos{' (diario)' if journal else ''}")
+    print(f"  batch:              {batch_seconds:8.2f} s  {len(lines) / batch_seconds:>10.0f} comandos/s")
+    print(f"  un proceso por cmd: {single_seconds * len(lines):8.2f} s  {1 / single_seconds:>10.1f} comandos/s"
+          f"  (estimado con {SINGLE_SAMPLE})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# Benchmark de las políticas de fsync: latencia por mutación con cada política ('always', 'batch',
+# 'never') para la reescritura del CSV, el diario y SQLite. Conviene ejecutarlo sobre el disco real
+# (no en /tmp si es tmpfs), indicando la carpeta con la variable de entorno BENCH_DIR.
+#
+# Uso: python benchmarks/bench_fsync.py [cantidad de tareas] [mutaciones]
+import os
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+
+from index import TaskManager
+from storage import FSYNC_POLICIES, SqliteStorage, import_csv_to_sqlite
+
+
+def run(n_tasks, mutations, mode, fsync):
+    with tempfile.TemporaryDirectory(dir=os.environ.get('BENCH_DIR')) as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks)
+        if mode == 'sqlite':
+            database = os.path.join(directory, 'tasks.db')
+            import_csv_to_sqlite(task_file, subtask_file, database)
+            manager = TaskManager(storage=SqliteStorage(database, fsync=fsync))
+        else:
+            manager = TaskManager(task_file, subtask_file, journal=mode == 'diario',
+                                  journal_limit=1 << 40, fsync=fsync)
+
+        start = time.perf_counter()
+        for number in range(mutations):
+            manager.mark_task_complete(number % n_tasks + 1)
+        elapsed = time.perf_counter() - start
+        manager.close()
+    return elapsed / mutations
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    mutations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{n_tasks} tareas, {mutations} mutaciones")
+    print(f"{'modo':>8}" + ''.join(f"{policy:>14}" for policy in FSYNC_POLICIES))
+    for mode in ('csv', 'diario', 'sqlite'):
+        times = [run(n_tasks, mutations, mode, policy) for policy in FSYNC_POLICIES]
+        print(f"{mode:>8}" + ''.join(f"{seconds * 1e6:>11.1f} us" for seconds in times))
+
+
+if __name__ == "__main__":
+    main()
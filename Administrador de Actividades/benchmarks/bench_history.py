@@ -0,0 +1,196 @@
+# Benchmark del historial para deshacer y rehacer (history.py): cuánto agrega a cada modificación
+# (con y sin historial), cuánto tarda deshacer y rehacer el borrado de una tarea con k sub-tareas
+# según el tamaño de la lista (debería depender de k y no del total), cuánto cuesta devolver a su
+# lugar una tarea restaurada según su id (modo normal y compacto) y cuántos registros guarda con
+# los límites por defecto. Al final comprueba que deshacer y rehacer dejen los datos, en memoria y
+# en los archivos, como estaban (y en el mismo orden), en modo normal, compacto y perezoso.
+#
+# Uso: python benchmarks/bench_history.py [cantidad de tareas] [sub-tareas de la tarea borrada]
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from history import HISTORY_LIMIT
+from index import TaskManager
+
+# Argumentos de TaskManager de las mediciones: diario sin sincronizar ni compactar, para medir el
+# historial y no el disco. El historial está desactivado por defecto.
+OPTIONS = {'journal': True, 'fsync': 'never', 'journal_limit': 1 << 40}
+HISTORY = {'history_limit': HISTORY_LIMIT}
+
+
+# Escribe un conjunto de datos en una carpeta nueva dentro de 'directory' (ver write_dataset).
+def dataset(directory, name, n_tasks, subtasks_per_task):
+    path = os.path.join(directory, name)
+    os.makedirs(path)
+    return write_dataset(path, n_tasks, subtasks_per_task=subtasks_per_task)
+
+
+# Mediana en microsegundos de 'method' aplicado a cada argumento.
+def median_us(method, arguments):
+    samples = []
+    for argument in arguments:
+        start = time.perf_counter()
+        method(argument)
+        samples.append((time.perf_counter() - start) * 1e6)
+    return statistics.median(samples)
+
+
+def overhead(directory, n_tasks):
+    print(f"{'operación':>22} {'sin historial':>14} {'con historial':>14}")
+    ids = range(1, min(n_tasks, 5000) + 1)
+    results = {}
+    for history_limit in (0, HISTORY_LIMIT):
+        task_file, subtask_file = dataset(directory, f'overhead{history_limit}', n_tasks, 2)
+        manager = TaskManager(task_file, subtask_file, history_limit=history_limit, **OPTIONS)
+        results[history_limit] = {
+            'mark_task_complete': median_us(manager.mark_task_complete, ids),
+            'unmark_task_complete': median_us(manager.unmark_task_complete, ids),
+            'add_task': median_us(manager.add_task, (f"Nueva {number}" for number in ids)),
+            'delete_task': median_us(manager.delete_task, ids),
+        }
+        manager.close()
+    for name in results[0]:
+        print(f"{name:>22} {results[0][name]:>11.1f} µs {results[HISTORY_LIMIT][name]:>11.1f} µs")
+
+
+# Borra una tarea con k sub-tareas y mide deshacer y rehacer ese borrado.
+def cascade(directory, n_tasks, fan_out):
+    task_file, subtask_file = dataset(directory, f'cascade{n_tasks}-{fan_out}', n_tasks, 1)
+    manager = TaskManager(task_file, subtask_file, **HISTORY, **OPTIONS)
+    task_id = manager.add_task("Borrada").id
+    manager.add_subtasks(task_id, [f"Sub {number}" for number in range(fan_out)])
+    manager.delete_task(task_id)
+    start = time.perf_counter()
+    undone = manager.undo()
+    undo_ms = (time.perf_counter() - start) * 1e3
+    start = time.perf_counter()
+    redone = manager.redo()
+    redo_ms = (time.perf_counter() - start) * 1e3
+    assert len(undone) == fan_out + 1 and len(redone) == 1
+    manager.close()
+    print(f"{n_tasks:>10} {fan_out:>10} {undo_ms:>10.2f} ms {redo_ms:>10.2f} ms")
+
+
+# Deshace el borrado de una tarea del final, del medio y del principio: en modo normal se mueven
+# detrás de ella los elementos con id mayor; en modo compacto recupera su fila.
+def reinsertion(directory, n_tasks):
+    task_file, subtask_file = dataset(directory, 'reinsertion', n_tasks, 2)
+    for mode, options in (('normal', {}), ('compacto', {'compact': True})):
+        manager = TaskManager(task_file, subtask_file, **HISTORY, **options, **OPTIONS)
+        timings = []
+        for task_id in (n_tasks, n_tasks // 2, 1):
+            manager.delete_task(task_id)
+            start = time.perf_counter()
+            manager.undo()
+            timings.append((time.perf_counter() - start) * 1e3)
+        manager.close()
+        print(f"{mode:>10} " + " ".join(f"{timing:>10.2f} ms" for timing in timings))
+
+
+# Contenido completo de un TaskManager, en el orden en que se muestra, para comparar.
+def contents(manager):
+    manager._load_all_subtasks()
+    tasks = [(task.id, task.title, task.completed) for task in manager.task_index.values()]
+    subtasks = [(subtask.id, subtask.task_id, subtask.title, subtask.completed)
+                for task_id, _, _ in tasks for subtask in manager.subtasks_for(task_id)]
+    return tasks, subtasks, manager.summary()
+
+
+# Comprueba que las tareas y sub-tareas estén ordenadas por id, en memoria y (tras cerrar) en los archivos.
+def assert_sorted(manager, options):
+    for index in (manager.task_index, manager.subtask_index):
+        ids = list(index)
+        assert ids == sorted(ids), f"deshacer no devolvió los elementos a su lugar ({options})"
+
+
+def check(directory):
+    for number, options in enumerate(({}, {'compact': True}, {'lazy': True}, {'journal': True})):
+        task_file, subtask_file = dataset(directory, f'check{number}', 200, 3)
+        manager = TaskManager(task_file, subtask_file, **HISTORY, **options)
+        original = contents(manager)
+
+        # Deshacer y rehacer un borrado en cascada, un cambio de estado y un bloque batch().
+        subtask_ids = [subtask.id for subtask in manager.subtasks_for(5)]
+        manager.delete_task(5)
+        manager.mark_task_complete(7)
+        with manager.batch():
+            manager.delete_subtask(manager.subtasks_for(9)[0].id)
+            task_id = manager.add_task("Nueva").id
+            manager.add_subtask(task_id, "Sub nueva")
+        changed = contents(manager)
+        assert manager.undo() and manager.undo() and manager.undo()
+        assert not manager.can_undo() and manager.undo() == []
+        assert contents(manager) == original, f"deshacer no restauró los datos ({options})"
+        assert [subtask.id for subtask in manager.subtasks_for(5)] == subtask_ids
+        assert manager.redo() and manager.redo() and manager.redo() and not manager.can_redo()
+        assert contents(manager) == changed, f"rehacer no repitió los cambios ({options})"
+        manager.close()
+
+        # Lo deshecho y rehecho quedó en los archivos.
+        manager = TaskManager(task_file, subtask_file, **HISTORY, **options)
+        assert contents(manager) == changed, f"los archivos no tienen los cambios ({options})"
+
+        # Marcar algo ya marcado no es una acción; una acción nueva descarta lo que se podía rehacer.
+        manager.mark_task_complete(7)
+        assert not manager.can_undo()
+        manager.unmark_task_complete(7)
+        manager.undo()
+        manager.mark_task_complete(8)
+        assert not manager.can_redo()
+
+        # Deshacer un borrado devuelve la tarea y sus sub-tareas a su lugar, también en los archivos.
+        manager.delete_task(50)
+        manager.undo()
+        assert_sorted(manager, options)
+        manager.close()
+        manager = TaskManager(task_file, subtask_file, **options)
+        manager._load_all_subtasks()
+        assert_sorted(manager, options)
+        manager.close()
+
+    # Límites: cantidad de acciones y de registros.
+    task_file, subtask_file = dataset(directory, 'limits', 100, 10)
+    manager = TaskManager(task_file, subtask_file, history_limit=5, history_records=30)
+    for task_id in range(1, 11):
+        manager.mark_task_complete(task_id)
+    assert len(manager.history.undo_entries) == 5
+    manager.delete_task(20)
+    assert manager.history.records <= 30
+    manager.add_tasks([f"Nueva {number}" for number in range(40)])
+    assert not manager.can_undo(), "una acción más grande que el límite no debe guardarse"
+    manager.close()
+    print("comprobación: correcta")
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fan_out = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{n_tasks} tareas, {n_tasks * 2} sub-tareas")
+        overhead(directory, n_tasks)
+
+        print(f"\n{'tareas':>10} {'sub-tareas':>10} {'deshacer':>13} {'rehacer':>13}")
+        for size in (1000, n_tasks):
+            for k in (1, fan_out):
+                cascade(directory, size, k)
+
+        print(f"\n{'modo':>10} {'última':>13} {'del medio':>13} {'primera':>13}")
+        reinsertion(directory, n_tasks)
+
+        task_file, subtask_file = dataset(directory, 'deletes', n_tasks, 2)
+        manager = TaskManager(task_file, subtask_file, **HISTORY, **OPTIONS)
+        for task_id in range(1, 1001):
+            manager.delete_task(task_id)
+        print(f"\n1000 borrados: {len(manager.history.undo_entries)} acciones guardadas, "
+              f"{manager.history.records} registros")
+        manager.close()
+
+        check(directory)
+
+
+if __name__ == "__main__":
+    main()
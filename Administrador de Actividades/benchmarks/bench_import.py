@@ -0,0 +1,83 @@
+# Benchmark de arranque de la aplicación: tiempo de importar index e index_gui (que no deben
+# leer ningún archivo) y tiempo hasta tener el TaskManager compartido listo. Además cuenta cuántas
+# veces se leen tasks.csv y subtasks.csv: con un único TaskManager compartido debe ser una vez cada uno,
+# aunque se usen las funciones del módulo y se cree la interfaz (si hay pantalla disponible).
+#
+# Uso: python benchmarks/bench_import.py [cantidad de tareas]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+
+
+# Proceso hijo: se ejecuta en el directorio de los datos, como la aplicación real.
+def child():
+    start = time.perf_counter()
+    import index
+    import index_gui
+    import_seconds = time.perf_counter() - start
+
+    # Cuenta las lecturas de cada archivo.
+    import storage
+    loads = {'tasks.csv': 0, 'subtasks.csv': 0}
+    original_tasks, original_subtasks = storage.CsvStorage.load_tasks, storage.CsvStorage.load_subtasks
+
+    def counted_tasks(self):
+        loads['tasks.csv'] += 1
+        return original_tasks(self)
+
+    def counted_subtasks(self):
+        loads['subtasks.csv'] += 1
+        return original_subtasks(self)
+
+    storage.CsvStorage.load_tasks, storage.CsvStorage.load_subtasks = counted_tasks, counted_subtasks
+    loads_after_import = dict(loads)
+
+    start = time.perf_counter()
+    index.list_tasks()
+    ready_seconds = time.perf_counter() - start
+    index.add_task("Nueva")
+    index.get_task_manager()
+
+    gui = False
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        root = None
+    if root is not None:
+        index_gui.TaskApp(root)
+        root.destroy()
+        gui = True
+
+    print(json.dumps({'import_seconds': import_seconds, 'ready_seconds': ready_seconds,
+                      'loads_after_import': loads_after_import, 'loads': loads, 'gui': gui}))
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    with tempfile.TemporaryDirectory() as directory:
+        write_dataset(directory, n_tasks, subtasks_per_task=2)
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'], cwd=directory,
+                                env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(
+                                    os.path.abspath(__file__)))),
+                                check=True, capture_output=True, text=True).stdout
+    result = json.loads(output)
+    print(f"{n_tasks} tareas")
+    print(f"importar index + index_gui: {result['import_seconds'] * 1e3:.1f} ms")
+    print(f"TaskManager compartido listo: {result['ready_seconds'] * 1e3:.1f} ms")
+    print(f"lecturas al importar: {result['loads_after_import']}")
+    print(f"lecturas en total{' (con TaskApp)' if result['gui'] else ''}: {result['loads']}")
+    if any(result['loads_after_import'].values()) or any(count != 1 for count in result['loads'].values()):
+        sys.exit("ERROR: cada archivo debe leerse una sola vez, y nunca al importar")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['--child']:
+        child()
+    else:
+        main()
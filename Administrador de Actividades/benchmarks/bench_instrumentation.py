@@ -0,0 +1,53 @@
+# Benchmark de la instrumentación: costo por llamada de get_task y de marcar/desmarcar una tarea
+# (en modo diario, sin fsync) sin instrumentación, con ella activada y después de desactivarla,
+# que debe volver al costo original. Al final muestra las mediciones registradas.
+#
+# Uso: python benchmarks/bench_instrumentation.py [cantidad de tareas] [repeticiones]
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+
+def per_call_us(function, ids):
+    start = time.perf_counter()
+    for task_id in ids:
+        function(task_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def measure(manager, ids):
+    lookup = per_call_us(manager.get_task, ids)
+    mark = per_call_us(manager.mark_task_complete, ids)
+    per_call_us(manager.unmark_task_complete, ids)
+    return lookup, mark
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    repetitions = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+    with tempfile.TemporaryDirectory() as directory:
+        # Diario sin límite, para que ninguna compactación caiga dentro de la medición.
+        manager = TaskManager(*write_dataset(directory, n_tasks), journal=True, journal_limit=1 << 40,
+                              fsync='never')
+        ids = [number % n_tasks + 1 for number in range(0, repetitions * 7, 7)]
+
+        print(f"{n_tasks} tareas, {repetitions} llamadas")
+        print(f"{'':>14} {'get_task':>10} {'marcar':>10}")
+        for label in ('sin medir', 'medido', 'desactivado'):
+            if label == 'medido':
+                manager.enable_instrumentation()
+            elif label == 'desactivado':
+                report = manager.instrumentation.report()
+                manager.disable_instrumentation()
+            lookup, mark = measure(manager, ids)
+            print(f"{label:>14} {lookup:>7.2f} us {mark:>7.2f} us")
+        manager.close()
+    print()
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Benchmark de latencia por mutación: reescritura completa del CSV frente al modo diario y al
+# motor SQLite. Con diario o SQLite el coste de marcar una tarea no debe depender del número de tareas.
+#
+# Uso: python benchmarks/bench_journal.py [tamaño ...]
+import os
+import random
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import SqliteStorage, TaskManager
+from storage import import_csv_to_sqlite
+
+SIZES = [1_000, 10_000, 100_000]
+OPERATIONS = 200
+
+
+def run(size, mode):
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, size, subtasks_per_task=2)
+        # Límite alto para medir solo el costo de agregar registros, sin compactaciones intermedias.
+        if mode == 'sqlite':
+            database = os.path.join(directory, 'tasks.db')
+            import_csv_to_sqlite(task_file, subtask_file, database)
+            manager = TaskManager(storage=SqliteStorage(database))
+        else:
+            manager = TaskManager(task_file, subtask_file, journal=mode == 'journal', journal_limit=1 << 40)
+
+        rng = random.Random(size)
+        ids = [rng.randint(1, size) for _ in range(OPERATIONS)]
+        start = time.perf_counter()
+        for task_id in ids:
+            manager.mark_task_complete(task_id)
+            manager.unmark_subtask_complete(task_id * 2)
+        elapsed = (time.perf_counter() - start) / (OPERATIONS * 2) * 1e6
+
+        compact_start = time.perf_counter()
+        if mode == 'journal':
+            manager.compact_journal()
+        compact = (time.perf_counter() - compact_start) * 1e3
+        manager.storage.close()
+    return elapsed, compact
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tareas':>10} {'csv/mutación':>15} {'diario/mutación':>17} {'sqlite/mutación':>17} {'compactación':>14}")
+    for size in sizes:
+        csv_time, _ = run(size, 'csv')
+        journal_time, compact = run(size, 'journal')
+        sqlite_time, _ = run(size, 'sqlite')
+        print(f"{size:>10} {csv_time:>12.1f} us {journal_time:>14.1f} us {sqlite_time:>14.1f} us {compact:>11.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
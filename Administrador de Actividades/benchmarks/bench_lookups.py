@@ -0,0 +1,59 @@
+# Benchmark de búsquedas y mutaciones indexadas de TaskManager.
+# Mide el coste por operación de get_task, get_subtask, marcar/desmarcar y borrar en cascada
+# para tamaños crecientes de archivo. Con los índices por id el coste debe mantenerse plano.
+#
+# Uso: python benchmarks/bench_lookups.py [tamaño ...]
+import random
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+SIZES = [1_000, 10_000, 100_000]
+OPERATIONS = 2_000
+
+
+# Mide el tiempo medio en microsegundos de aplicar func a cada id de la lista.
+def time_per_op(func, ids):
+    start = time.perf_counter()
+    for item_id in ids:
+        func(item_id)
+    return (time.perf_counter() - start) / len(ids) * 1e6
+
+
+def run(size):
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, size, subtasks_per_task=2)
+        manager = TaskManager(task_file, subtask_file)
+
+        # Se desactiva la escritura a disco: este benchmark aísla el coste de los índices en memoria.
+        manager.storage.apply = lambda changes, tasks, subtasks: None
+
+        rng = random.Random(size)
+        task_ids = [rng.randint(1, size) for _ in range(OPERATIONS)]
+        subtask_ids = [rng.randint(1, size * 2) for _ in range(OPERATIONS)]
+        delete_ids = rng.sample(range(1, size + 1), min(OPERATIONS, size))
+
+        results = {
+            'get_task': time_per_op(manager.get_task, task_ids),
+            'get_subtask': time_per_op(manager.get_subtask, subtask_ids),
+            'mark_task': time_per_op(manager.mark_task_complete, task_ids),
+            'unmark_subtask': time_per_op(manager.unmark_subtask_complete, subtask_ids),
+            'delete_task': time_per_op(manager.delete_task, delete_ids),
+        }
+    return results
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tareas':>10} " + " ".join(f"{name:>15}" for name in
+                                         ('get_task', 'get_subtask', 'mark_task', 'unmark_subtask', 'delete_task')))
+    for size in sizes:
+        results = run(size)
+        print(f"{size:>10} " + " ".join(f"{value:>12.2f} us" for value in results.values()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# Benchmark de memoria: bytes por fila que ocupan las tareas y sub-tareas cargadas en TaskManager
+# con objetos (Task/Subtask con __slots__) frente al modo compacto en columnas. Como referencia se
+# mide también la representación anterior, con un __dict__ por instancia.
+#
+# Uso: python benchmarks/bench_memory.py [cantidad de tareas] [sub-tareas por tarea]
+import gc
+import sys
+import tempfile
+import tracemalloc
+
+from _data import write_dataset
+
+import index
+from index import TaskManager
+
+
+# Representación anterior de las tareas: clases comunes, con un __dict__ por instancia.
+class LegacyTask:
+    def __init__(self, title, task_id=None, completed=False):
+        self.id = task_id
+        self.title = title
+        self.completed = completed
+
+
+class LegacySubtask:
+    def __init__(self, title, task_id, subtask_id=None, completed=False):
+        self.id = subtask_id
+        self.task_id = task_id
+        self.title = title
+        self.completed = completed
+
+
+# Mide la memoria que queda retenida después de construir el TaskManager.
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    manager = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rows = len(manager.task_index) + len(manager.subtask_index)
+    del manager
+    gc.collect()
+    return current, rows
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fan_out = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks, subtasks_per_task=fan_out)
+
+        original = index.Task, index.Subtask
+
+        def legacy_build():
+            # Sustituye temporalmente las clases para reproducir la representación anterior.
+            index.Task, index.Subtask = LegacyTask, LegacySubtask
+            try:
+                return TaskManager(task_file, subtask_file)
+            finally:
+                index.Task, index.Subtask = original
+
+        modes = [
+            ('__dict__', legacy_build),
+            ('__slots__', lambda: TaskManager(task_file, subtask_file)),
+            ('columnas', lambda: TaskManager(task_file, subtask_file, compact=True)),
+        ]
+        print(f"{n_tasks} tareas, {n_tasks * fan_out} sub-tareas")
+        print(f"{'modo':>10} {'total':>12} {'por fila':>12}")
+        for name, build in modes:
+            current, rows = measure(build)
+            print(f"{name:>10} {current / 1024 / 1024:>9.1f} MB {current / rows:>9.1f} B")
+
+
+if __name__ == "__main__":
+    main()
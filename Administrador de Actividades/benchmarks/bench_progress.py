@@ -0,0 +1,75 @@
+# Benchmark del progreso por tarea: calcularlo recorriendo las sub-tareas en cada actualización
+# (una pasada por list_subtasks() por tarea, o una pasada agrupada por subtasks_for) frente a los
+# contadores que TaskManager mantiene en cada cambio. También mide el resumen global y el costo
+# que los contadores agregan a marcar y desmarcar una sub-tarea.
+#
+# Uso: python benchmarks/bench_progress.py [tamaño ...]
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+SIZES = [1_000, 10_000, 100_000]
+FAN_OUT = 5
+
+# Por encima de este tamaño el recorrido por tarea tarda demasiado y no se mide.
+QUADRATIC_LIMIT = 5_000
+
+
+# Forma ingenua: filtra todas las sub-tareas una vez por cada tarea.
+def quadratic_progress(manager):
+    subtasks = manager.subtasks
+    return [(sum(1 for subtask in subtasks if subtask.task_id == task.id and subtask.completed),
+             sum(1 for subtask in subtasks if subtask.task_id == task.id))
+            for task in manager.tasks]
+
+
+# Recorre solo las sub-tareas de cada tarea.
+def grouped_progress(manager):
+    progress = []
+    for task in manager.tasks:
+        subtasks = manager.subtasks_for(task.id)
+        progress.append((sum(subtask.completed for subtask in subtasks), len(subtasks)))
+    return progress
+
+
+# Usa los contadores.
+def counted_progress(manager):
+    return [manager.task_progress(task.id) for task in manager.tasks]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1e3, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tareas':>8} {'por tarea':>12} {'agrupado':>12} {'contadores':>12} {'resumen':>10} {'marcar':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            manager = TaskManager(*write_dataset(directory, size, subtasks_per_task=FAN_OUT))
+
+            quadratic = timed(quadratic_progress, manager)[0] if size <= QUADRATIC_LIMIT else float('nan')
+            grouped, expected = timed(grouped_progress, manager)
+            counted, progress = timed(counted_progress, manager)
+            assert progress == expected
+            summary = timed(manager.summary)[0] * 1e3
+
+            # Marcar y desmarcar, sin escribir en disco, para ver solo el costo en memoria.
+            manager.storage.apply = lambda changes, tasks, subtasks: None
+            start = time.perf_counter()
+            for subtask_id in range(1, 1_001):
+                manager.mark_subtask_complete(subtask_id)
+                manager.unmark_subtask_complete(subtask_id)
+            toggle = (time.perf_counter() - start) / 2_000 * 1e6
+
+            print(f"{size:>8} {quadratic:>9.1f} ms {grouped:>9.1f} ms {counted:>9.1f} ms "
+                  f"{summary:>7.1f} us {toggle:>7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmark del pase de renderizado de TaskApp.refresh_task_list.
+#
+# Sin pantalla se mide el recorrido de datos que hace el renderizado: la forma anterior (filtrar
+# list_subtasks() una vez por tarea, O(tareas x sub-tareas)) frente a subtasks_for(task_id), lineal
+# en la cantidad de filas. Si hay pantalla (o Xvfb), mide además el renderizado real con Tk.
+#
+# Uso: python benchmarks/bench_render.py [tamaño ...]
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+SIZES = [500, 2_000, 5_000]
+FAN_OUT = 5
+
+
+# Recorrido anterior: todas las sub-tareas por cada tarea.
+def quadratic_pass(manager):
+    rows = 0
+    subtasks = manager.subtasks
+    for task in manager.tasks:
+        rows += 1
+        for subtask in subtasks:
+            if subtask.task_id == task.id:
+                rows += 1
+    return rows
+
+
+# Recorrido actual: sub-tareas agrupadas por tarea.
+def grouped_pass(manager):
+    rows = 0
+    for task in manager.tasks:
+        rows += 1 + len(manager.subtasks_for(task.id))
+    return rows
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1e3
+
+
+# Mide refresh_task_list con Tk. Devuelve None si no hay pantalla disponible.
+def tk_render(manager):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    try:
+        import index_gui
+        app = index_gui.TaskApp(root, manager)
+        root.update()
+        elapsed = timed(app.refresh_task_list)
+        root.update()
+        return elapsed
+    finally:
+        root.destroy()
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tareas':>8} {'filas':>8} {'cuadrático':>12} {'agrupado':>12} {'Tk':>12}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            manager = TaskManager(*write_dataset(directory, size, subtasks_per_task=FAN_OUT))
+
+            quadratic = timed(quadratic_pass, manager) if size <= 5_000 else float('nan')
+            grouped = timed(grouped_pass, manager)
+            render = tk_render(manager) if size <= 5_000 else None
+            render_text = f"{render:>9.1f} ms" if render is not None else f"{'n/d':>12}"
+            rows = size * (FAN_OUT + 1)
+            print(f"{size:>8} {rows:>8} {quadratic:>9.1f} ms {grouped:>9.1f} ms {render_text}")
+
+
+if __name__ == "__main__":
+    main()
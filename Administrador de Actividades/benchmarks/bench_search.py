@@ -0,0 +1,103 @@
+# Benchmark de búsqueda: tiempo de construir el índice de títulos (también en otro hilo, como hace
+# la interfaz al abrir), de cada consulta con el límite que usa la interfaz y de mantener el
+# índice al día en altas y bajas. Los títulos combinan palabras de un vocabulario (con acentos) y
+# un número, para que haya palabras muy frecuentes y otras raras.
+#
+# Uso: python benchmarks/bench_search.py [cantidad de títulos]
+import csv
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import _data  # noqa: F401  (agrega la carpeta de la aplicación a sys.path)
+
+from index import TaskManager
+from index_gui import SEARCH_LIMIT
+from search import PendingSearchIndex
+
+WORDS = ("revisión informe compras reunión llamar médico pagar factura correo enviar presupuesto "
+         "diseño código pruebas despliegue limpiar cocina jardín comprar pan leche café viaje "
+         "reservar hotel vuelo estudiar examen lectura capítulo entrenar gimnasio correr "
+         "cumpleaños regalo mamá papá escribir artículo corregir traducción inglés español").split()
+
+SUBTASKS_PER_TASK = 3
+
+QUERIES = ["r", "1", "12", "r 1", "rev", "revision", "Revisión 12", "inf rev", "pan leche", "cafe 99", "zzz", "e a"]
+REPEAT = 5
+
+
+def title(rng, number):
+    return f"{' '.join(rng.sample(WORDS, rng.randint(1, 3))).capitalize()} {number}"
+
+
+# Escribe tasks.csv y subtasks.csv con 'total' títulos en total.
+def write_titles(directory, total):
+    rng = random.Random(total)
+    n_tasks = total // (SUBTASKS_PER_TASK + 1)
+    task_file = os.path.join(directory, 'tasks.csv')
+    subtask_file = os.path.join(directory, 'subtasks.csv')
+    with open(task_file, mode='w', newline='') as tasks, open(subtask_file, mode='w', newline='') as subtasks:
+        task_writer, subtask_writer = csv.writer(tasks), csv.writer(subtasks)
+        task_writer.writerow(["id", "title", "completed"])
+        subtask_writer.writerow(["id", "task_id", "title", "completed"])
+        subtask_id = 1
+        for task_id in range(1, n_tasks + 1):
+            task_writer.writerow([task_id, title(rng, task_id), False])
+            for _ in range(SUBTASKS_PER_TASK):
+                subtask_writer.writerow([subtask_id, task_id, title(rng, subtask_id), False])
+                subtask_id += 1
+    return task_file, subtask_file
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        files = write_titles(directory, total)
+
+        # Como la interfaz: el índice se construye en otro hilo al abrir. Se mide cuándo queda listo
+        # y lo que tarda después la primera consulta.
+        manager = TaskManager(*files, fsync='never')
+        start = time.perf_counter()
+        manager.start_search_index()
+        while isinstance(manager.search_index, PendingSearchIndex):
+            time.sleep(0.005)
+        ready = time.perf_counter() - start
+        start = time.perf_counter()
+        manager.search("r", SEARCH_LIMIT)
+        print(f"índice en otro hilo: listo a los {ready:.2f} s; primera consulta: "
+              f"{(time.perf_counter() - start) * 1e3:.2f} ms")
+
+        manager = TaskManager(*files, fsync='never')
+        titles = len(manager.task_index) + len(manager.subtask_index)
+
+        start = time.perf_counter()
+        index = manager.build_search_index()
+        print(f"{titles} títulos, {len(index)} palabras distintas")
+        print(f"construir el índice: {time.perf_counter() - start:.2f} s")
+
+        print(f"{'consulta':>14} {'resultados':>11} {'tiempo':>12}")
+        for query in QUERIES:
+            # Mediana de varias repeticiones, para no medir una recolección de basura ocasional.
+            times = []
+            for _ in range(REPEAT):
+                start = time.perf_counter()
+                results = manager.search(query, SEARCH_LIMIT)
+                times.append((time.perf_counter() - start) * 1e3)
+            print(f"{query!r:>14} {len(results):>11} {statistics.median(times):>9.2f} ms")
+
+        # Mantenimiento incremental del índice (sin escribir en disco).
+        manager.storage.apply = lambda changes, tasks, subtasks: None
+        for _ in range(2):  # La primera vuelta es de calentamiento.
+            start = time.perf_counter()
+            added = manager.add_tasks(f"Nueva revisión número {number}" for number in range(1_000))
+            for task in added:
+                manager.delete_task(task.id)
+            per_change = (time.perf_counter() - start) / 2_000 * 1e6
+        print(f"alta o baja con el índice al día: {per_change:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
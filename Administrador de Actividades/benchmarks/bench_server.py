@@ -0,0 +1,149 @@
+# Prueba de carga del servicio HTTP (server.py): levanta el servicio en otro proceso sobre datos
+# sintéticos y mide peticiones por segundo y latencias (p50 y p95) con varias conexiones
+# simultáneas, para lecturas, listas paginadas (con y sin ETag), modificaciones y una mezcla.
+# En las modificaciones muestra además cuántas se guardaron en cada escritura (el agrupamiento).
+#
+# Uso: python benchmarks/bench_server.py [--tasks 10000] [--connections 32] [--duration 3]
+#                                        [--journal] [--fsync always|batch|never]
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+
+SERVER = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'server.py')
+
+
+# Envía una petición por una conexión abierta y devuelve (código, cabeceras, cuerpo).
+async def request(reader, writer, method, path, payload=None, headers=()):
+    body = b'' if payload is None else json.dumps(payload).encode('utf-8')
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(body)}", *headers]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body)
+    head = await reader.readuntil(b'\r\n\r\n')
+    status_line, *header_lines = head.decode('latin-1').split('\r\n')
+    response_headers = {}
+    for line in header_lines:
+        if line:
+            name, value = line.split(':', 1)
+            response_headers[name.lower()] = value.strip()
+    length = int(response_headers.get('content-length', 0))
+    data = await reader.readexactly(length) if length else b''
+    return int(status_line.split()[1]), response_headers, data
+
+
+# Escenarios: cada uno devuelve la próxima petición (método, ruta, cuerpo, cabeceras).
+def scenarios(n_tasks, etag):
+    def get(rng):
+        return 'GET', f"/tasks/{rng.randint(1, n_tasks)}", None, ()
+
+    def page(rng):
+        return 'GET', f"/tasks?offset={rng.randrange(0, n_tasks, 50)}&limit=50", None, ()
+
+    def page_etag(rng):
+        return 'GET', f"/tasks?offset={rng.randrange(0, n_tasks, 50)}&limit=50", None, (f"If-None-Match: {etag[0]}",)
+
+    def toggle(rng):
+        return 'POST', f"/tasks/{rng.randint(1, n_tasks)}/toggle", None, ()
+
+    def add(rng):
+        return 'POST', "/tasks", {'title': f"Nueva {rng.random():.6f}"}, ()
+
+    def mixed(rng):
+        choice = rng.random()
+        if choice < 0.5:
+            return get(rng)
+        if choice < 0.8:
+            return page(rng)
+        return toggle(rng)
+
+    return {'get': get, 'list': page, 'list-304': page_etag, 'toggle': toggle, 'add': add, 'mixed': mixed}
+
+
+# Una conexión: envía peticiones hasta 'deadline' y anota la latencia de cada una.
+async def worker(port, make_request, deadline, latencies, statuses, seed):
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        while time.perf_counter() < deadline:
+            method, path, payload, headers = make_request(rng)
+            start = time.perf_counter()
+            status, _, _ = await request(reader, writer, method, path, payload, headers)
+            latencies.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def stats(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, _, data = await request(reader, writer, 'GET', '/stats')
+    writer.close()
+    return json.loads(data)['operations']
+
+
+async def current_etag(port):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    _, headers, _ = await request(reader, writer, 'GET', '/tasks?limit=1')
+    writer.close()
+    return headers['etag']
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+async def run(port, n_tasks, connections, duration):
+    etag = [None]
+    print(f"{'escenario':>10} {'pet/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'por escritura':>14}  códigos")
+    for name, make_request in scenarios(n_tasks, etag).items():
+        etag[0] = await current_etag(port)
+        before = await stats(port)
+        latencies, statuses = [], {}
+        deadline = time.perf_counter() + duration
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(port, make_request, deadline, latencies, statuses, number)
+                               for number in range(connections)))
+        elapsed = time.perf_counter() - start
+        after = await stats(port)
+
+        latencies.sort()
+        writes = after.get('write_changes', {}).get('count', 0) - before.get('write_changes', {}).get('count', 0)
+        mutations = sum(count for status, count in statuses.items() if status in (200, 201)) \
+            if name in ('toggle', 'add') else 0
+        grouping = f"{mutations / writes:.1f}" if writes and mutations else '-'
+        print(f"{name:>10} {len(latencies) / elapsed:>9.0f} {percentile(latencies, 0.5) * 1e3:>8.2f} "
+              f"{percentile(latencies, 0.95) * 1e3:>8.2f} {grouping:>14}  {dict(sorted(statuses.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=10_000)
+    parser.add_argument('--connections', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--journal', action='store_true')
+    parser.add_argument('--fsync', default='always')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, args.tasks)
+        command = [sys.executable, SERVER, '--port', '0', '--instrument', '--tasks', task_file,
+                   '--subtasks', subtask_file, '--fsync', args.fsync] + (['--journal'] if args.journal else [])
+        server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stdout.readline().rsplit(':', 1)[1])
+            print(f"{args.tasks} tareas, {args.connections} conexiones, {args.duration:.0f} s por escenario, "
+                  f"{'diario' if args.journal else 'CSV'}, fsync={args.fsync}")
+            asyncio.run(run(port, args.tasks, args.connections, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# Benchmark de la instantánea binaria: tiempo de arranque y pico de memoria (RSS) cargando desde los
+# CSV frente a cargar desde la instantánea, con carga normal y en modo compacto. Cada medición se
+# ejecuta en un proceso nuevo. Al final comprueba que los datos cargados desde la instantánea sean
+# los mismos que los del CSV, que un CSV editado por fuera invalide la instantánea y que al cerrar
+# se vuelva a generar después de guardar cambios.
+#
+# Uso: python benchmarks/bench_snapshot.py [cantidad de tareas] [sub-tareas por tarea]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from bench_startup import peak_rss_mb
+
+
+# Proceso hijo: carga los archivos e imprime el resultado en JSON.
+def child(compact, binary_snapshot, task_file, subtask_file):
+    from index import TaskManager
+
+    start = time.perf_counter()
+    manager = TaskManager(task_file, subtask_file, compact=compact == 'compact',
+                          binary_snapshot=binary_snapshot == 'snapshot')
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'seconds': elapsed, 'peak_rss_mb': peak_rss_mb(),
+                      'tasks': len(manager.task_index), 'subtasks': len(manager.subtask_index)}))
+
+
+def measure(compact, binary_snapshot, task_file, subtask_file):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', compact, binary_snapshot, task_file, subtask_file],
+        check=True, capture_output=True, text=True).stdout
+    return json.loads(output)
+
+
+# Contenido completo de un TaskManager, para comparar cargas.
+def contents(manager):
+    tasks = [(task.id, task.title, task.completed) for task in manager.task_index.values()]
+    subtasks = [(subtask.id, subtask.task_id, subtask.title, subtask.completed)
+                for subtask in manager.subtask_index.values()]
+    progress = [manager.task_progress(task_id) for task_id, _, _ in tasks[:1000]]
+    return tasks, subtasks, progress
+
+
+def check(task_file, subtask_file):
+    from index import TaskManager
+
+    snapshot_file = os.path.splitext(task_file)[0] + '.snap'
+    expected = contents(TaskManager(task_file, subtask_file))
+    for compact in (False, True):
+        manager = TaskManager(task_file, subtask_file, compact=compact, binary_snapshot=True)
+        assert manager.storage.from_csv == set(), "la instantánea no se usó"
+        assert contents(manager) == expected, f"datos distintos (compacto={compact})"
+        manager.close()
+
+    # Un CSV editado por fuera hace que se vuelva a leer y que se regenere la instantánea.
+    modified = os.stat(snapshot_file).st_mtime_ns
+    with open(task_file, mode='a') as file:
+        file.write("999999999,Tarea externa,False\n")
+    manager = TaskManager(task_file, subtask_file, compact=True, binary_snapshot=True)
+    assert os.stat(snapshot_file).st_mtime_ns != modified, "la instantánea no se regeneró"
+    assert manager.get_task(999999999).title == "Tarea externa"
+    manager.close()
+    manager = TaskManager(task_file, subtask_file, compact=True, binary_snapshot=True)
+    assert manager.storage.from_csv == set() and manager.get_task(999999999) is not None
+
+    # Los cambios guardados en los CSV quedan en la instantánea al cerrar.
+    task_id = manager.add_task("Nueva").id
+    manager.add_subtask(task_id, "Sub nueva")
+    manager.mark_task_complete(1)
+    manager.close()
+    manager = TaskManager(task_file, subtask_file, compact=True, binary_snapshot=True)
+    assert manager.storage.from_csv == set()
+    assert manager.get_task(task_id).title == "Nueva" and manager.get_task(1).completed
+    assert [subtask.title for subtask in manager.subtasks_for(task_id)] == ["Sub nueva"]
+    manager.close()
+
+    # Con el diario, la instantánea sigue la última compactación y no se usa si hay registros.
+    manager = TaskManager(task_file, subtask_file, journal=True, binary_snapshot=True)
+    manager.unmark_task_complete(1)
+    manager.close()
+    modified = os.stat(snapshot_file).st_mtime_ns
+    manager = TaskManager(task_file, subtask_file, journal=True, compact=True, binary_snapshot=True)
+    assert not manager.get_task(1).completed
+    manager.close()
+    assert os.stat(snapshot_file).st_mtime_ns == modified
+    print("comprobación: correcta")
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    fan_out = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks, subtasks_per_task=fan_out,
+                                                title_words=4, completed_ratio=0.3)
+        print(f"{n_tasks} tareas, {n_tasks * fan_out} sub-tareas")
+        print(f"{'modo':>9} {'origen':>12} {'tiempo':>10} {'pico RSS':>12}")
+        for compact in ('normal', 'compact'):
+            # La primera carga con instantánea la genera; se mide la segunda.
+            measure(compact, 'snapshot', task_file, subtask_file)
+            for source in ('csv', 'snapshot'):
+                result = measure(compact, source, task_file, subtask_file)
+                rss = 'n/d' if result['peak_rss_mb'] is None else f"{result['peak_rss_mb']:.1f} MB"
+                print(f"{compact:>9} {source:>12} {result['seconds']:>8.2f} s {rss:>12}")
+        check(task_file, subtask_file)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(*sys.argv[2:])
+    else:
+        main()
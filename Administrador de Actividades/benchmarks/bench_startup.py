@@ -0,0 +1,67 @@
+# Benchmark de arranque: tiempo de carga y pico de memoria (RSS) de TaskManager con carga
+# completa frente al modo perezoso, que solo anota desplazamientos de las sub-tareas.
+# Cada medición se ejecuta en un proceso nuevo para que el pico de memoria sea independiente.
+#
+# Uso: python benchmarks/bench_startup.py [cantidad de tareas] [sub-tareas por tarea]
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+
+
+# Devuelve el pico de memoria residente del proceso en MB, o None si la plataforma no lo informa.
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa kilobytes; macOS, bytes.
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+# Proceso hijo: carga los archivos en el modo indicado e imprime el resultado en JSON.
+def child(mode, task_file, subtask_file):
+    from index import TaskManager
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    manager = TaskManager(task_file, subtask_file, lazy=mode == 'lazy')
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        'mode': mode,
+        'seconds': elapsed,
+        'peak_rss_mb': peak_rss_mb(),
+        'baseline_rss_mb': baseline,
+        'tasks': len(manager.task_index),
+    }))
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    fan_out = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks, subtasks_per_task=fan_out)
+        print(f"{n_tasks} tareas, {n_tasks * fan_out} sub-tareas")
+        print(f"{'modo':>8} {'tiempo':>10} {'pico RSS':>12} {'RSS inicial':>13}")
+        for mode in ('eager', 'lazy'):
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--child', mode, task_file, subtask_file],
+                check=True, capture_output=True, text=True).stdout
+            result = json.loads(output)
+            rss, baseline = result['peak_rss_mb'], result['baseline_rss_mb']
+            if rss is None:
+                print(f"{mode:>8} {result['seconds']:>8.2f} s {'n/d':>12} {'n/d':>13}")
+            else:
+                print(f"{mode:>8} {result['seconds']:>8.2f} s {rss:>9.1f} MB {baseline:>10.1f} MB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(*sys.argv[2:5])
+    else:
+        main()
@@ -0,0 +1,60 @@
+# Benchmark de la vigilancia de archivos: otro TaskManager (como si fuera otro programa) hace un
+# cambio pequeño en los CSV y se mide cuánto tarda FileWatcher.poll() en aplicarlo, frente a volver
+# a cargar todo con reload(). También se comprueba que el resultado sea igual al de una carga nueva.
+#
+# Uso: python benchmarks/bench_watch.py [tamaño ...]
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+
+from index import TaskManager
+from watcher import FileWatcher
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def state(manager):
+    return (sorted((task.id, task.title, task.completed) for task in manager.tasks),
+            sorted((subtask.id, subtask.task_id, subtask.title, subtask.completed)
+                   for subtask in manager.subtasks))
+
+
+# Cambios pequeños que hace el otro programa, cada uno en una escritura.
+def edit(other, size):
+    other.mark_task_complete(size // 2)
+    other.add_subtask(size // 3, "Agregada por otro programa")
+    other.delete_subtask(7)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or SIZES
+    print(f"{'tareas':>9} {'vigilar':>10} {'consultar':>11} {'cambios':>8} {'recargar':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            files = write_dataset(directory, size)
+            manager = TaskManager(*files, fsync='never')
+
+            start = time.perf_counter()
+            watcher = FileWatcher(manager)
+            setup = time.perf_counter() - start
+
+            other = TaskManager(*files, fsync='never')
+            edit(other, size)
+
+            start = time.perf_counter()
+            changes = watcher.poll()
+            poll = time.perf_counter() - start
+            assert state(manager) == state(other)
+
+            start = time.perf_counter()
+            manager.reload()
+            reload = time.perf_counter() - start
+
+            print(f"{size:>9} {setup * 1e3:>7.1f} ms {poll * 1e3:>8.1f} ms {len(changes):>8} "
+                  f"{reload * 1e3:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
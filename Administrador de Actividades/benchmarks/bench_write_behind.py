@@ -0,0 +1,61 @@
+# Benchmark de persistencia diferida: latencia de cada mutación vista desde quien la hace (la
+# interfaz) escribiendo en el momento, frente a start_write_behind(), que devuelve el control
+# enseguida y escribe en un hilo aparte. Al final comprueba que lo escrito en segundo plano se
+# puede volver a cargar con el mismo contenido.
+#
+# Uso: python benchmarks/bench_write_behind.py [cantidad de tareas] [mutaciones]
+import statistics
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+from index import TaskManager
+
+MODES = [
+    ('csv', {}),
+    ('diario', {'journal': True}),
+]
+
+
+def run(n_tasks, mutations, options, write_behind):
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks)
+        manager = TaskManager(task_file, subtask_file, **options)
+        if write_behind:
+            manager.start_write_behind()
+
+        latencies = []
+        for number in range(mutations):
+            start = time.perf_counter()
+            if number % 2:
+                manager.mark_task_complete(number)
+            else:
+                manager.add_task(f"Nueva {number}")
+            latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        manager.close()
+        close_seconds = time.perf_counter() - start
+
+        expected = [(task.id, task.title, task.completed) for task in manager.tasks]
+        reloaded = TaskManager(task_file, subtask_file, **options)
+        assert [(task.id, task.title, task.completed) for task in reloaded.tasks] == expected
+        return latencies, close_seconds
+
+
+def main():
+    n_tasks = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    mutations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{n_tasks} tareas, {mutations} mutaciones")
+    print(f"{'modo':>8} {'escritura':>10} {'mediana':>12} {'máximo':>12} {'cierre':>12}")
+    for name, options in MODES:
+        for write_behind in (False, True):
+            latencies, close_seconds = run(n_tasks, mutations, options, write_behind)
+            print(f"{name:>8} {'diferida' if write_behind else 'inmediata':>10} "
+                  f"{statistics.median(latencies) * 1e6:>9.1f} µs {max(latencies) * 1e3:>9.2f} ms "
+                  f"{close_seconds * 1e3:>9.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
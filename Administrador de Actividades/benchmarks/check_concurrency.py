@@ -0,0 +1,98 @@
+# Prueba de concurrencia entre procesos: N procesos cargan los mismos archivos y, a la vez, agregan
+# tareas y marcan como completadas tareas propias y compartidas. Al final se vuelve a cargar y se
+# comprueba que no se perdió ninguna alta ni ninguna marca, y se informa el rendimiento.
+#
+# Se prueba también la forma anterior, sin candado ni versiones, en la que cada proceso guarda su
+# copia en memoria y el último en escribir pisa los cambios de los demás.
+#
+# Uso: python benchmarks/check_concurrency.py [procesos] [altas por proceso] [cantidad de tareas]
+import contextlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from _data import write_dataset
+
+import storage
+from index import TaskManager
+
+
+# Proceso hijo: espera la señal de largada y hace 'count' rondas de alta + dos marcas.
+def child(mode, number, count, n_tasks, task_file, subtask_file):
+    number, count, n_tasks = int(number), int(count), int(n_tasks)
+    if mode == 'sin bloqueo':
+        storage.CsvStorage.locked = lambda self: contextlib.nullcontext()
+        storage.CsvStorage.is_stale = lambda self: False
+    manager = TaskManager(task_file, subtask_file, journal=mode == 'diario', fsync='never')
+    print("listo", flush=True)
+    sys.stdin.readline()
+    for round_number in range(count):
+        task = manager.add_task(f"Proceso {number} tarea {round_number}")
+        manager.mark_task_complete(task.id)
+        manager.mark_task_complete(shared_task(number, round_number, n_tasks))
+    manager.close()
+
+
+# Tarea compartida que marca cada proceso en cada ronda.
+def shared_task(number, round_number, n_tasks):
+    return (number * 7919 + round_number * 104729) % n_tasks + 1
+
+
+def trial(mode, processes, count, n_tasks):
+    with tempfile.TemporaryDirectory() as directory:
+        task_file, subtask_file = write_dataset(directory, n_tasks)
+        children = [subprocess.Popen([sys.executable, os.path.abspath(__file__), '--child', mode,
+                                      str(number), str(count), str(n_tasks), task_file, subtask_file],
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                    for number in range(processes)]
+        for process in children:
+            process.stdout.readline()
+        start = time.perf_counter()
+        for process in children:
+            process.stdin.write("ya\n")
+            process.stdin.flush()
+        for process in children:
+            process.wait()
+            process.stdin.close()
+            process.stdout.close()
+        elapsed = time.perf_counter() - start
+
+        result = TaskManager(task_file, subtask_file, journal=mode == 'diario')
+        tasks = result.tasks
+        completed = {task.title for task in tasks if task.completed}
+        expected = {f"Proceso {number} tarea {round_number}"
+                    for number in range(processes) for round_number in range(count)}
+        titles = [task.title for task in tasks if task.title in expected]
+        lost_adds = len(expected - set(titles)) + len(titles) - len(set(titles))
+        lost_marks = len(expected & set(titles) - completed)
+        lost_marks += sum(not result.get_task(shared_task(number, round_number, n_tasks)).completed
+                          for number in range(processes) for round_number in range(count))
+        duplicated_ids = len(tasks) - len({task.id for task in tasks})
+        return elapsed, lost_adds, lost_marks, duplicated_ids
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    n_tasks = int(sys.argv[3]) if len(sys.argv) > 3 else 1_000
+    operations = processes * count * 3
+    print(f"{processes} procesos, {count} altas y {2 * count} marcas cada uno, {n_tasks} tareas iniciales")
+    print(f"{'modo':>12} {'tiempo':>9} {'ops/s':>8} {'altas perdidas':>15} {'marcas perdidas':>16} {'ids repetidos':>14}")
+    failed = False
+    for mode in ('sin bloqueo', 'csv', 'diario'):
+        elapsed, lost_adds, lost_marks, duplicated_ids = trial(mode, processes, count, n_tasks)
+        print(f"{mode:>12} {elapsed:>7.2f} s {operations / elapsed:>8.0f} {lost_adds:>15} "
+              f"{lost_marks:>16} {duplicated_ids:>14}")
+        if mode != 'sin bloqueo' and (lost_adds or lost_marks or duplicated_ids):
+            failed = True
+    if failed:
+        sys.exit("ERROR: se perdieron cambios con el candado activo")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        child(*sys.argv[2:9])
+    else:
+        main()
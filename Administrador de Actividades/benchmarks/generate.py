@@ -0,0 +1,38 @@
+# Generador de datos sintéticos: escribe tasks.csv y subtasks.csv en una carpeta, con la cantidad
+# de tareas, sub-tareas por tarea, distribución y títulos indicados (ver _data.write_dataset).
+#
+# Uso: python benchmarks/generate.py carpeta --tasks 1000000 [--fan-out 2] [--distribution skewed]
+#                                    [--title-words 4] [--completed 0.3] [--seed 0]
+import argparse
+import os
+import time
+
+from _data import DISTRIBUTIONS, write_dataset
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera tasks.csv y subtasks.csv sintéticos.")
+    parser.add_argument('directory', help="carpeta donde escribir los archivos")
+    parser.add_argument('--tasks', type=int, default=1_000, help="cantidad de tareas")
+    parser.add_argument('--fan-out', type=int, default=2, help="sub-tareas por tarea (promedio)")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='fixed',
+                        help="cómo se reparten las sub-tareas entre las tareas")
+    parser.add_argument('--title-words', type=int, default=0,
+                        help="palabras al azar por título (0: 'Tarea N' y 'Sub N.M')")
+    parser.add_argument('--completed', type=float, help="proporción de completadas (por defecto, regla fija)")
+    parser.add_argument('--seed', type=int, default=0, help="semilla de los valores aleatorios")
+    args = parser.parse_args()
+
+    os.makedirs(args.directory, exist_ok=True)
+    start = time.perf_counter()
+    task_file, subtask_file = write_dataset(args.directory, args.tasks, args.fan_out, args.distribution,
+                                            args.title_words, args.completed, args.seed)
+    elapsed = time.perf_counter() - start
+    with open(subtask_file, mode='rb') as file:
+        subtasks = sum(chunk.count(b'\n') for chunk in iter(lambda: file.read(1 << 20), b'')) - 1
+    size = (os.path.getsize(task_file) + os.path.getsize(subtask_file)) / 1024 / 1024
+    print(f"{args.tasks} tareas y {subtasks} sub-tareas ({size:.1f} MB) en {elapsed:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
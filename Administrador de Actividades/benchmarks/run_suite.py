@@ -0,0 +1,295 @@
+# Suite de benchmarks: para cada tamaño de datos y modo de TaskManager mide el tiempo de carga, el
+# pico de memoria, la latencia de cada mutación, el rendimiento de save() y el tiempo de dibujar
+# TaskApp (con pantalla o, en Linux sin pantalla, con Xvfb si está instalado). Cada medición se
+# hace en un proceso nuevo, sobre una copia de los datos, y el resultado se guarda en JSON para
+# comparar versiones.
+#
+# Uso: python benchmarks/run_suite.py [--sizes 1000,100000] [--modes csv,journal] [--output r.json]
+#      python benchmarks/run_suite.py --compare anterior.json actual.json [--threshold 0.2]
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from _data import DISTRIBUTIONS, write_dataset
+from storage import import_csv_to_sqlite
+
+# Modos de TaskManager que se pueden medir: argumentos de TaskManager de cada uno.
+MODES = {
+    'csv': {},
+    'journal': {'journal': True},
+    'compact': {'compact': True},
+    'lazy': {'lazy': True},
+    'sqlite': {},
+}
+
+# Mutaciones que se miden, en este orden (las bajas al final, sobre elementos que no se tocaron).
+MUTATIONS = ('add_task', 'add_subtask', 'mark_task_complete', 'unmark_task_complete',
+             'mark_subtask_complete', 'delete_subtask', 'delete_task')
+
+# Métricas que se comparan con --compare: todas son mejores cuanto más bajas.
+COMPARED = ('load_s', 'peak_rss_mb', 'save_s', 'render_ms')
+
+
+# Devuelve el pico de memoria residente del proceso en MB, o None si la plataforma no lo informa.
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa kilobytes; macOS, bytes.
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+# Mide una mutación: la repite con los argumentos de 'arguments' hasta agotarlos o hasta pasar
+# 'budget' segundos. Devuelve la mediana y el percentil 95 en microsegundos.
+def time_mutation(method, arguments, budget):
+    samples = []
+    deadline = time.perf_counter() + budget
+    for argument in arguments:
+        start = time.perf_counter()
+        method(argument)
+        samples.append((time.perf_counter() - start) * 1e6)
+        if start > deadline:
+            break
+    samples.sort()
+    return {'median_us': statistics.median(samples),
+            'p95_us': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+            'count': len(samples)}
+
+
+# Mide el dibujo de TaskApp: crear la ventana (que arma la lista) y volver a armarla. Devuelve
+# None si no hay pantalla.
+def time_render(manager):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        return None
+    try:
+        import index_gui
+        start = time.perf_counter()
+        app = index_gui.TaskApp(root, manager, write_behind=False, watch=False)
+        root.update()
+        first = (time.perf_counter() - start) * 1e3
+        start = time.perf_counter()
+        app.refresh_task_list()
+        root.update()
+        return {'first_ms': first, 'refresh_ms': (time.perf_counter() - start) * 1e3}
+    finally:
+        root.destroy()
+
+
+# Proceso hijo: mide un modo sobre los archivos de 'directory' e imprime el resultado en JSON.
+def child(mode, directory, ops, budget, fsync, render):
+    from index import TaskManager
+    from storage import SqliteStorage
+
+    task_file = os.path.join(directory, 'tasks.csv')
+    subtask_file = os.path.join(directory, 'subtasks.csv')
+    storage = SqliteStorage(os.path.join(directory, 'tasks.db'), fsync) if mode == 'sqlite' else None
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    manager = TaskManager(task_file, subtask_file, storage=storage, fsync=fsync, **MODES[mode])
+    load = time.perf_counter() - start
+    peak = peak_rss_mb()
+    _, tasks, _, subtasks = manager.summary()
+    result = {'load_s': load, 'peak_rss_mb': peak, 'baseline_rss_mb': baseline,
+              'tasks': tasks, 'subtasks': subtasks}
+
+    start = time.perf_counter()
+    manager.save()
+    result['save_s'] = time.perf_counter() - start
+    result['save_rows_per_s'] = (tasks + subtasks) / result['save_s']
+
+    # Ids sobre los que se mide cada mutación: las marcas usan la primera mitad y las bajas la
+    # segunda, para no borrar lo que se marca.
+    task_ids = list(manager.task_index)
+    subtask_ids = [subtask.id for subtask in manager.subtasks]
+    first, second = task_ids[:len(task_ids) // 2], task_ids[len(task_ids) // 2:]
+    subtask_half = subtask_ids[len(subtask_ids) // 2:]
+    arguments = {
+        'add_task': [f"Nueva {number}" for number in range(ops)],
+        'add_subtask': first[:ops],
+        'mark_task_complete': first[:ops],
+        'unmark_task_complete': first[:ops],
+        'mark_subtask_complete': subtask_ids[:ops],
+        'delete_subtask': subtask_half[-ops:],
+        'delete_task': second[:ops],
+    }
+    methods = {name: getattr(manager, name) for name in MUTATIONS}
+    methods['add_subtask'] = lambda task_id: manager.add_subtask(task_id, "Nueva sub")
+    result['mutations'] = {name: time_mutation(methods[name], arguments[name], budget)
+                           for name in MUTATIONS if arguments[name]}
+
+    result['render'] = time_render(manager) if render else None
+    manager.close()
+    print(json.dumps(result))
+
+
+# Si no hay pantalla (Linux sin DISPLAY), inicia Xvfb en una pantalla libre. Devuelve el proceso
+# (o None) y las variables de entorno para los procesos hijos.
+def start_display():
+    env = dict(os.environ)
+    if not sys.platform.startswith('linux') or env.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None, env
+    display = ':%d' % (90 + os.getpid() % 9)
+    server = subprocess.Popen(['Xvfb', display, '-nolisten', 'tcp'],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(1)
+    env['DISPLAY'] = display
+    return server, env
+
+
+# Identifica la versión medida: el commit actual, si los datos están en un repositorio git.
+def current_version():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    server, env = start_display()
+    results = []
+    try:
+        for size in args.sizes:
+            with tempfile.TemporaryDirectory() as source:
+                write_dataset(source, size, args.fan_out, args.distribution, args.title_words, seed=args.seed)
+                for mode in args.modes:
+                    with tempfile.TemporaryDirectory() as directory:
+                        for name in ('tasks.csv', 'subtasks.csv'):
+                            shutil.copy(os.path.join(source, name), directory)
+                        # La base SQLite se crea aquí, para no sumar la importación al pico de memoria.
+                        if mode == 'sqlite':
+                            import_csv_to_sqlite(os.path.join(directory, 'tasks.csv'),
+                                                 os.path.join(directory, 'subtasks.csv'),
+                                                 os.path.join(directory, 'tasks.db'))
+                        render = args.render and mode == 'csv'
+                        output = subprocess.run(
+                            [sys.executable, os.path.abspath(__file__), '--child', mode, directory,
+                             str(args.ops), str(args.budget), args.fsync, str(int(render))],
+                            check=True, capture_output=True, text=True, env=env).stdout
+                    result = dict(size=size, mode=mode, **json.loads(output))
+                    results.append(result)
+                    print_result(result)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+    return {
+        'version': current_version(),
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'options': {'sizes': args.sizes, 'modes': args.modes, 'fan_out': args.fan_out,
+                    'distribution': args.distribution, 'title_words': args.title_words,
+                    'seed': args.seed, 'ops': args.ops, 'fsync': args.fsync},
+        'results': results,
+    }
+
+
+def print_result(result):
+    rss = f"{result['peak_rss_mb']:.0f} MB" if result['peak_rss_mb'] is not None else 'n/d'
+    render = result['render']
+    print(f"{result['size']:>9} {result['mode']:>8}  carga {result['load_s']:7.2f} s  pico {rss:>8}  "
+          f"save {result['save_rows_per_s']:>9.0f} filas/s  "
+          f"dibujo {'%.0f ms' % render['first_ms'] if render else 'n/d'}")
+    print('                    ' + '  '.join(f"{name} {value['median_us']:.0f}/{value['p95_us']:.0f} us"
+                                            for name, value in result['mutations'].items()))
+
+
+# Devuelve las métricas comparables de un resultado: las de COMPARED y la mediana de cada mutación.
+def metrics(result):
+    values = {name: result.get(name) for name in COMPARED if name != 'render_ms'}
+    if result.get('render'):
+        values['render_ms'] = result['render']['first_ms']
+    for name, value in result.get('mutations', {}).items():
+        values[name + '_us'] = value['median_us']
+    return values
+
+
+# Compara dos archivos de resultados. Informa las métricas que empeoraron más que 'threshold'
+# (proporción) y devuelve cuántas fueron.
+def compare(base_path, new_path, threshold):
+    with open(base_path) as file:
+        base = json.load(file)
+    with open(new_path) as file:
+        new = json.load(file)
+    base_results = {(result['size'], result['mode']): result for result in base['results']}
+    print(f"{base.get('version')} -> {new.get('version')}")
+    print(f"{'tamaño':>9} {'modo':>8} {'métrica':>24} {'antes':>12} {'ahora':>12} {'cambio':>8}")
+    regressions = 0
+    for result in new['results']:
+        previous = base_results.get((result['size'], result['mode']))
+        if previous is None:
+            continue
+        before = metrics(previous)
+        for name, value in metrics(result).items():
+            if value is None or not before.get(name):
+                continue
+            change = value / before[name] - 1
+            flag = ''
+            if change > threshold:
+                flag = '  <-- peor'
+                regressions += 1
+            print(f"{result['size']:>9} {result['mode']:>8} {name:>24} {before[name]:>12.4g} "
+                  f"{value:>12.4g} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de TaskManager y TaskApp.")
+    parser.add_argument('--sizes', default='1000,10000,100000',
+                        type=lambda text: [int(size) for size in text.split(',')],
+                        help="cantidades de tareas, separadas por comas")
+    parser.add_argument('--modes', default='csv,journal,compact,lazy',
+                        type=lambda text: text.split(','), help=f"modos a medir: {', '.join(MODES)}")
+    parser.add_argument('--fan-out', type=int, default=2, help="sub-tareas por tarea (promedio)")
+    parser.add_argument('--distribution', choices=DISTRIBUTIONS, default='fixed')
+    parser.add_argument('--title-words', type=int, default=0, help="palabras al azar por título")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ops', type=int, default=200, help="repeticiones de cada mutación")
+    parser.add_argument('--budget', type=float, default=2.0,
+                        help="segundos como máximo por mutación (se corta antes de 'ops')")
+    parser.add_argument('--fsync', default='never', help="política de fsync de los modos medidos")
+    parser.add_argument('--no-render', dest='render', action='store_false', help="no medir TaskApp")
+    parser.add_argument('--output', help="archivo JSON donde guardar los resultados")
+    parser.add_argument('--compare', nargs=2, metavar=('ANTES', 'AHORA'),
+                        help="comparar dos archivos de resultados en lugar de medir")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="con --compare, empeoramiento tolerado (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(*args.compare, args.threshold)
+        if regressions:
+            sys.exit(f"{regressions} métricas empeoraron más de {args.threshold:.0%}")
+        return
+
+    unknown = set(args.modes) - set(MODES)
+    if unknown:
+        parser.error(f"modos desconocidos: {', '.join(sorted(unknown))}")
+    report = run(args)
+    if args.output:
+        with open(args.output, mode='w') as file:
+            json.dump(report, file, indent=2)
+        print(f"Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        mode, directory, ops, budget, fsync, render = sys.argv[2:8]
+        child(mode, directory, int(ops), float(budget), fsync, render == '1')
+    else:
+        main()
@@ -0,0 +1,340 @@
+# Interfaz de línea de comandos: permite usar TaskManager sin la interfaz gráfica, por ejemplo
+# desde tareas programadas o scripts de importación.
+#
+# Uso (desde la carpeta de la aplicación):
+#   python -m cli add "Comprar pan"                 agrega una tarea y muestra su id
+#   python -m cli add --parent 3 "Integral"         agrega una sub-tarea a la tarea 3
+#   python -m cli complete 3 [--subtask] [--undo]   marca (o desmarca) una tarea o sub-tarea
+#   python -m cli delete 3 [--subtask]              elimina una tarea (con sus sub-tareas) o sub-tarea
+#   python -m cli list [--subtasks] [--search texto] [--status pending|done] [--json]
+#   python -m cli import archivo.csv                agrega las filas de un CSV (ver import_rows)
+#   python -m cli batch [archivo]                   aplica una lista de comandos (ver run_commands)
+#
+# Cada ejecución carga los datos una vez y los guarda una vez: el modo batch aplica miles de
+# comandos con una sola escritura, dentro de un bloque TaskManager.batch(). Si un comando falla no
+# se guarda ninguno (salvo con --keep-going, que informa la línea y sigue con las demás).
+
+# Importa argparse para interpretar los argumentos de la línea de comandos.
+import argparse
+
+# Importa nullcontext para usar la entrada estándar en un bloque 'with' sin cerrarla.
+from contextlib import nullcontext
+
+# Importa csv para el comando import.
+import csv
+
+# Importa json para la salida de list --json.
+import json
+
+# Importa os para mostrar los nombres de los archivos con filas dañadas.
+import os
+
+# Importa sys para la entrada y salida estándar.
+import sys
+
+# Importa TaskManager y los motores de almacenamiento.
+from index import TaskManager
+from storage import FSYNC_ALWAYS, FSYNC_POLICIES, SqliteStorage
+
+# Valores que el comando import entiende como "completada" (sin distinguir mayúsculas).
+TRUE_VALUES = {'true', '1', 'yes', 'si', 'sí', 'x'}
+
+# En el modo batch, '$' como tarea principal se refiere a la última tarea agregada.
+LAST_TASK = '$'
+
+
+# Error de un comando: se informa con el número de línea en el modo batch.
+class CommandError(ValueError):
+    pass
+
+
+# Crea el TaskManager con los archivos y el motor indicados en la línea de comandos.
+def open_manager(args):
+    storage = SqliteStorage(args.sqlite, args.fsync) if args.sqlite else None
+    return TaskManager(args.tasks, args.subtasks, journal=args.journal, storage=storage,
+                       lazy=args.lazy, fsync=args.fsync, binary_snapshot=args.snapshot)
+
+
+# Convierte un id escrito en el comando en un número.
+def parse_id(text):
+    try:
+        return int(text)
+    except ValueError:
+        raise CommandError(f"Id inválido: {text!r}") from None
+
+
+# Busca una tarea o sub-tarea y falla si no existe.
+def require(manager, item_id, subtask=False):
+    item = manager.get_subtask(item_id) if subtask else manager.get_task(item_id)
+    if item is None:
+        raise CommandError(f"No existe la {'sub-tarea' if subtask else 'tarea'} {item_id}")
+    return item
+
+
+# Agrega una tarea, o una sub-tarea si 'parent' es el id de una tarea. Devuelve el elemento creado.
+def add(manager, title, parent=None):
+    title = title.strip()
+    if not title:
+        raise CommandError("El título está vacío")
+    if parent is None:
+        return manager.add_task(title)
+    require(manager, parent)
+    subtask = manager.add_subtask(parent, title)
+    if subtask is None:
+        # Otro proceso borró la tarea mientras tanto.
+        raise CommandError(f"No existe la tarea {parent}")
+    return subtask
+
+
+# Marca (o con undo=True desmarca) una tarea o sub-tarea.
+def complete(manager, item_id, subtask=False, undo=False):
+    require(manager, item_id, subtask)
+    if subtask:
+        update = manager.unmark_subtask_complete if undo else manager.mark_subtask_complete
+    else:
+        update = manager.unmark_task_complete if undo else manager.mark_task_complete
+    update(item_id)
+
+
+# Elimina una tarea (con sus sub-tareas) o una sub-tarea.
+def delete(manager, item_id, subtask=False):
+    require(manager, item_id, subtask)
+    if subtask:
+        manager.delete_subtask(item_id)
+    else:
+        manager.delete_task(item_id)
+
+
+# Interpreta y aplica una línea del modo batch. La sintaxis es la de los subcomandos, sin comillas:
+#   add [--parent ID|$] título          (el título es el resto de la línea)
+#   complete [--subtask] [--undo] ID
+#   delete [--subtask] ID
+# 'state' recuerda la última tarea agregada, para '--parent $'.
+def run_command(manager, line, state):
+    command, _, rest = line.strip().partition(' ')
+    if command == 'add':
+        rest = rest.lstrip()
+        parent = None
+        if rest.startswith('--parent'):
+            _, parent_text, rest = (rest.split(None, 2) + ['', ''])[:3]
+            if parent_text == LAST_TASK:
+                parent = state.get('task')
+                if parent is None:
+                    raise CommandError("'$' no se refiere a ninguna tarea: todavía no se agregó ninguna")
+            else:
+                parent = parse_id(parent_text)
+        item = add(manager, rest, parent)
+        if parent is None:
+            state['task'] = item.id
+        return
+
+    words = rest.split()
+    flags = set(words[:-1])
+    if command not in ('complete', 'delete') or not words or flags - {'--subtask', '--undo'} \
+            or command == 'delete' and '--undo' in flags:
+        raise CommandError(f"Comando inválido: {line.strip()!r}")
+    item_id = parse_id(words[-1])
+    if command == 'complete':
+        complete(manager, item_id, '--subtask' in flags, '--undo' in flags)
+    else:
+        delete(manager, item_id, '--subtask' in flags)
+
+
+# Aplica los comandos de 'lines' en una sola escritura. Las líneas vacías y las que empiezan con
+# '#' se ignoran. Devuelve (comandos aplicados, errores). Sin keep_going el primer error se lanza
+# como CommandError y no se guarda nada; con keep_going se informa en 'errors' y se sigue.
+def run_commands(manager, lines, keep_going=False, errors=sys.stderr):
+    applied = failed = 0
+    state = {}
+    with manager.batch():
+        for line_number, line in enumerate(lines, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                run_command(manager, line, state)
+            except CommandError as error:
+                if not keep_going:
+                    raise CommandError(f"línea {line_number}: {error}") from None
+                print(f"línea {line_number}: {error}", file=errors)
+                failed += 1
+            else:
+                applied += 1
+    return applied, failed
+
+
+# Agrega las filas de un CSV con cabecera. Se usan las columnas 'title' (obligatoria), 'completed'
+# y 'task_id' (opcionales): una fila con task_id es una sub-tarea de esa tarea existente. Otras
+# columnas, como el 'id' de un tasks.csv exportado, se ignoran: los ids se asignan al agregar.
+# Devuelve (tareas, sub-tareas) agregadas.
+def import_rows(manager, file):
+    reader = csv.DictReader(file)
+    if 'title' not in (reader.fieldnames or ()):
+        raise CommandError("El archivo debe tener una cabecera con la columna 'title'")
+    counts = [0, 0]
+    with manager.batch():
+        for row in reader:
+            parent = row.get('task_id') or None
+            try:
+                item = add(manager, row['title'] or '', parse_id(parent) if parent else None)
+            except CommandError as error:
+                raise CommandError(f"línea {reader.line_num}: {error}") from None
+            if (row.get('completed') or '').strip().lower() in TRUE_VALUES:
+                complete(manager, item.id, subtask=parent is not None)
+            counts[parent is not None] += 1
+    return tuple(counts)
+
+
+# Devuelve las tareas (y sus sub-tareas si with_subtasks) a mostrar con list: todas, o los
+# resultados de una búsqueda. 'status' filtra por 'pending' o 'done'.
+def select_items(manager, query=None, status=None, with_subtasks=False):
+    wanted = {None: None, 'pending': False, 'done': True}[status]
+    if query:
+        items = []
+        # Los resultados vienen ordenados: cada sub-tarea encontrada se muestra debajo de su tarea.
+        parent_id = None
+        for item in manager.search(query):
+            if not hasattr(item, 'task_id'):
+                parent_id = item.id
+            elif not with_subtasks:
+                continue
+            elif item.task_id != parent_id:
+                parent_id = item.task_id
+                items.append(manager.get_task(parent_id))
+            items.append(item)
+    elif with_subtasks:
+        items = []
+        for task in manager.tasks:
+            items.append(task)
+            items.extend(manager.subtasks_for(task.id))
+    else:
+        items = manager.tasks
+    if wanted is not None:
+        items = [item for item in items if item.completed == wanted]
+    return items
+
+
+# Da formato a las tareas para list: una línea por tarea con su estado, id, título y progreso;
+# las sub-tareas van sangradas debajo.
+def format_items(manager, items):
+    lines = []
+    for item in items:
+        mark = 'x' if item.completed else ' '
+        if hasattr(item, 'task_id'):
+            lines.append(f"    [{mark}] {item.id} {item.title}\n")
+        else:
+            done, total = manager.task_progress(item.id)
+            progress = f" ({done}/{total})" if total else ''
+            lines.append(f"[{mark}] {item.id} {item.title}{progress}\n")
+    return lines
+
+
+# Convierte una tarea o sub-tarea en un diccionario para list --json.
+def item_to_json(item):
+    row = {'id': item.id, 'title': item.title, 'completed': bool(item.completed)}
+    if hasattr(item, 'task_id'):
+        row['task_id'] = item.task_id
+    return row
+
+
+# Convierte las tareas en diccionarios para list --json.
+def items_to_json(items):
+    return [item_to_json(item) for item in items]
+
+
+# Abre un archivo de entrada, o la entrada estándar si el nombre es '-'. La entrada estándar se
+# entrega con nullcontext, para que el bloque 'with' que la usa no la cierre.
+def open_input(path):
+    return nullcontext(sys.stdin) if path == '-' else open(path, mode='r', newline='', encoding='utf-8')
+
+
+# Agrega las opciones que eligen los archivos y el motor de almacenamiento (ver open_manager).
+# También las usa el servicio HTTP (server.py).
+def add_storage_options(parser):
+    parser.add_argument('--tasks', default='tasks.csv', help="archivo CSV de tareas")
+    parser.add_argument('--subtasks', default='subtasks.csv', help="archivo CSV de sub-tareas")
+    parser.add_argument('--journal', action='store_true', help="registrar los cambios en el diario")
+    parser.add_argument('--sqlite', metavar='BASE', help="usar una base SQLite en lugar de los CSV")
+    parser.add_argument('--lazy', action='store_true', help="cargar las sub-tareas solo cuando se necesiten")
+    parser.add_argument('--snapshot', action='store_true',
+                        help="guardar y usar una instantánea binaria de los CSV para cargar más rápido")
+    parser.add_argument('--fsync', choices=FSYNC_POLICIES, default=FSYNC_ALWAYS,
+                        help="cuándo sincronizar con el disco (por defecto: %(default)s)")
+
+
+# Define los argumentos y subcomandos.
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cli',
+                                     description="Administrador de Actividades sin interfaz gráfica.")
+    add_storage_options(parser)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    command = commands.add_parser('add', help="agregar una tarea o sub-tarea")
+    command.add_argument('title')
+    command.add_argument('--parent', type=int, metavar='ID', help="tarea a la que se agrega la sub-tarea")
+
+    command = commands.add_parser('complete', help="marcar una tarea o sub-tarea como completada")
+    command.add_argument('id', type=int)
+    command.add_argument('--subtask', action='store_true', help="el id es de una sub-tarea")
+    command.add_argument('--undo', action='store_true', help="desmarcar en lugar de marcar")
+
+    command = commands.add_parser('delete', help="eliminar una tarea (con sus sub-tareas) o sub-tarea")
+    command.add_argument('id', type=int)
+    command.add_argument('--subtask', action='store_true', help="el id es de una sub-tarea")
+
+    command = commands.add_parser('list', help="mostrar las tareas")
+    command.add_argument('--subtasks', dest='with_subtasks', action='store_true',
+                         help="incluir las sub-tareas")
+    command.add_argument('--search', metavar='TEXTO', help="mostrar solo los resultados de una búsqueda")
+    command.add_argument('--status', choices=('pending', 'done'), help="filtrar por estado")
+    command.add_argument('--json', action='store_true', help="salida en formato JSON")
+
+    command = commands.add_parser('import', help="agregar las filas de un archivo CSV")
+    command.add_argument('file', help="archivo CSV con columnas title[,completed][,task_id] ('-': entrada estándar)")
+
+    command = commands.add_parser('batch', help="aplicar una lista de comandos con una sola escritura")
+    command.add_argument('file', nargs='?', default='-', help="archivo de comandos (por defecto: entrada estándar)")
+    command.add_argument('--keep-going', action='store_true',
+                         help="informar los comandos inválidos y seguir con los demás")
+    return parser
+
+
+# Ejecuta el subcomando indicado. Devuelve el código de salida.
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    manager = open_manager(args)
+    try:
+        for path, line, content in manager.storage.load_errors():
+            print(f"Aviso: {os.path.basename(path)}, línea {line}: fila ilegible omitida", file=sys.stderr)
+
+        if args.command == 'add':
+            print(add(manager, args.title, args.parent).id)
+        elif args.command == 'complete':
+            complete(manager, args.id, args.subtask, args.undo)
+        elif args.command == 'delete':
+            delete(manager, args.id, args.subtask)
+        elif args.command == 'list':
+            items = select_items(manager, args.search, args.status, args.with_subtasks)
+            if args.json:
+                json.dump(items_to_json(items), sys.stdout, ensure_ascii=False)
+                sys.stdout.write('\n')
+            else:
+                sys.stdout.writelines(format_items(manager, items))
+        elif args.command == 'import':
+            with open_input(args.file) as file:
+                task_count, subtask_count = import_rows(manager, file)
+            print(f"Importadas {task_count} tareas y {subtask_count} sub-tareas.")
+        elif args.command == 'batch':
+            with open_input(args.file) as file:
+                applied, failed = run_commands(manager, file, args.keep_going)
+            print(f"Aplicados {applied} comandos" + (f", {failed} con errores." if failed else "."))
+            return 1 if failed else 0
+    except CommandError as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 1
+    finally:
+        manager.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+# Cliente del servicio HTTP (server.py): un TaskManager que trabaja sobre la lista compartida.
+#
+# RemoteTaskManager descarga la lista al iniciar y la guarda en memoria como cualquier TaskManager,
+# así que las lecturas (la lista, el progreso, las búsquedas) no consultan al servicio. Cada
+# modificación se envía al servicio, que asigna los ids y la guarda; su respuesta trae los cambios
+# aplicados, que se aplican sobre la copia local. Los cambios de las demás personas se traen con
+# pull() (la interfaz lo hace cada WATCH_INTERVAL_MS con RemoteWatcher): el servicio devuelve los
+# registros posteriores a la última revisión vista. Aplicar un registro que ya estaba aplicado no
+# cambia nada, por eso los cambios propios pueden volver a llegar sin duplicarse.
+
+# Importa http.client para las conexiones persistentes con el servicio.
+import http.client
+
+# Importa json para los cuerpos de las peticiones y respuestas.
+import json
+
+# Importa threading para que dos hilos no usen la conexión a la vez.
+import threading
+
+# Importa urlsplit para separar la dirección del servicio.
+from urllib.parse import urlsplit
+
+# Importa TaskManager y la interfaz de los motores de almacenamiento.
+from index import TaskManager
+from storage import Storage
+
+# Dirección por defecto del servicio.
+DEFAULT_URL = 'http://127.0.0.1:8765'
+
+# Tiempo máximo de espera de cada petición, en segundos.
+REQUEST_TIMEOUT = 10
+
+# Tareas por página al descargar la lista.
+PAGE_SIZE = 1000
+
+# Veces que se vuelve a descargar la lista si cambió mientras se descargaban las páginas.
+LOAD_ATTEMPTS = 5
+
+
+# Error de comunicación con el servicio. 'status' es el código HTTP de la respuesta, o None si no
+# hubo respuesta (servicio detenido, conexión cortada).
+class RemoteError(OSError):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Define la clase RemoteConnection: una conexión HTTP persistente con el servicio que envía y
+# recibe JSON.
+class RemoteConnection:
+
+    def __init__(self, url=DEFAULT_URL, timeout=REQUEST_TIMEOUT):
+        parts = urlsplit(url)
+        self.host = parts.hostname or '127.0.0.1'
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip('/')
+        self.timeout = timeout
+        self.connection = None
+        self.lock = threading.Lock()
+
+    # Envía una petición y devuelve el cuerpo de la respuesta. Lanza RemoteError si el servicio
+    # responde con un error o no responde. Si la conexión se había cortado, las lecturas se
+    # reintentan una vez con una conexión nueva (las modificaciones no, para no aplicarlas dos veces).
+    def request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload).encode('utf-8')
+        headers = {'Content-Type': 'application/json'} if body is not None else {}
+        with self.lock:
+            for attempt in range(2):
+                if self.connection is None:
+                    self.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+                try:
+                    self.connection.request(method, self.prefix + path, body, headers)
+                    response = self.connection.getresponse()
+                    data = response.read()
+                except (http.client.HTTPException, OSError) as error:
+                    self.close()
+                    if attempt or method != 'GET':
+                        raise RemoteError(None, f"No se pudo conectar con el servicio: {error}") from error
+                    continue
+                if response.will_close:
+                    self.close()
+                break
+
+        try:
+            result = json.loads(data) if data else {}
+        except ValueError:
+            raise RemoteError(response.status, "El servicio envió una respuesta inválida") from None
+        if response.status >= 400:
+            raise RemoteError(response.status, result.get('error') or response.reason)
+        return result
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+# Define la clase RemoteStorage: el motor de almacenamiento de RemoteTaskManager. Solo carga: la
+# lista se descarga del servicio y las modificaciones no pasan por el motor (ver RemoteTaskManager).
+class RemoteStorage(Storage):
+
+    def __init__(self, connection):
+        self.connection = connection
+        # Revisión del servicio que tiene la copia local.
+        self.revision = 0
+        # Sub-tareas descargadas junto con sus tareas, hasta que las pide load_subtasks.
+        self.subtasks = []
+
+    # Descarga la lista por páginas, cada tarea con sus sub-tareas. Si la revisión cambió entre
+    # páginas (alguien modificó la lista mientras tanto), las páginas pueden no encajar y se
+    # vuelve a empezar.
+    def load_tasks(self):
+        for _ in range(LOAD_ATTEMPTS):
+            tasks, revisions = [], set()
+            offset = 0
+            while offset is not None:
+                page = self.connection.request('GET', f'/tasks?subtasks=1&offset={offset}&limit={PAGE_SIZE}')
+                revisions.add(page['revision'])
+                tasks.extend(page['items'])
+                offset = page['next']
+            if len(revisions) == 1:
+                break
+        self.revision = min(revisions)
+        self.subtasks = [(subtask['id'], subtask['task_id'], subtask['title'], subtask['completed'])
+                         for task in tasks for subtask in task['subtasks']]
+        for task in tasks:
+            yield task['id'], task['title'], task['completed']
+
+    def load_subtasks(self):
+        subtasks, self.subtasks = self.subtasks, []
+        yield from subtasks
+
+    # Devuelve los registros (como los del diario) posteriores a la revisión local, o None si el
+    # servicio ya no los tiene y hay que volver a descargar todo.
+    def read_new_changes(self):
+        try:
+            result = self.connection.request('GET', f'/changes?since={self.revision}')
+        except RemoteError as error:
+            if error.status in (400, 410):
+                return None
+            raise
+        self.revision = result['revision']
+        return result['changes']
+
+    def close(self):
+        self.connection.close()
+
+
+# Define la clase RemoteTaskManager: un TaskManager cuya lista está en el servicio. Ofrece las
+# mismas operaciones; las modificaciones devuelven lo mismo que las de TaskManager (una tarea o
+# sub-tarea que ya no existe en el servicio se ignora, y add_subtask devuelve None).
+class RemoteTaskManager(TaskManager):
+
+    def __init__(self, url=DEFAULT_URL, timeout=REQUEST_TIMEOUT, compact=False, instrument=False):
+        self.connection = RemoteConnection(url, timeout)
+        super().__init__(storage=RemoteStorage(self.connection), compact=compact, instrument=instrument)
+
+    # Envía una modificación y aplica sobre la copia local los cambios que informa el servicio.
+    # Con missing_ok=True, que el elemento no exista no es un error: devuelve None.
+    def _send(self, method, path, payload=None, missing_ok=False):
+        try:
+            result = self.connection.request(method, path, payload)
+        except RemoteError as error:
+            if missing_ok and error.status == 404:
+                return None
+            raise
+        with self.lock:
+            self.apply_records(result['changes'])
+        return result
+
+    # Las modificaciones ya quedaron guardadas en el servicio: no hay nada que entregar al motor
+    # (por ejemplo, al salir de un bloque batch()).
+    def _commit(self, changes):
+        pass
+
+    # Trae los cambios de las demás personas y los aplica. Devuelve los cambios aplicados, como
+    # FileWatcher.poll. Si el servicio ya no tiene los cambios desde la revisión local, vuelve a
+    # descargar la lista y suma external_updates (la interfaz vuelve a dibujar la lista).
+    def pull(self):
+        records = self.storage.read_new_changes()
+        if records is None:
+            self.reload()
+            self.external_updates += 1
+            return []
+        with self.lock:
+            return self.apply_records(records)
+
+    def add_task(self, title):
+        result = self._send('POST', '/tasks', {'title': title})
+        return self.get_task(result['task']['id'])
+
+    def add_subtask(self, task_id, title):
+        result = self._send('POST', f'/tasks/{task_id}/subtasks', {'title': title}, missing_ok=True)
+        return None if result is None else self.get_subtask(result['subtask']['id'])
+
+    def mark_task_complete(self, task_id):
+        self._send('POST', f'/tasks/{task_id}/toggle', {'completed': True}, missing_ok=True)
+
+    def unmark_task_complete(self, task_id):
+        self._send('POST', f'/tasks/{task_id}/toggle', {'completed': False}, missing_ok=True)
+
+    def mark_subtask_complete(self, subtask_id):
+        self._send('POST', f'/subtasks/{subtask_id}/toggle', {'completed': True}, missing_ok=True)
+
+    def unmark_subtask_complete(self, subtask_id):
+        self._send('POST', f'/subtasks/{subtask_id}/toggle', {'completed': False}, missing_ok=True)
+
+    def delete_task(self, task_id):
+        self._send('DELETE', f'/tasks/{task_id}', missing_ok=True)
+
+    def delete_subtask(self, subtask_id):
+        self._send('DELETE', f'/subtasks/{subtask_id}', missing_ok=True)
+
+    # Las operaciones de varios elementos se envían en una sola petición /batch.
+    def add_tasks(self, titles):
+        result = self._send('POST', '/batch', {'operations': [{'op': 'add', 'title': title} for title in titles]})
+        return [self.get_task(item['id']) for item in result['results']]
+
+    def add_subtasks(self, task_id, titles):
+        result = self._send('POST', '/batch', {'operations': [
+            {'op': 'add', 'parent': task_id, 'title': title} for title in titles]})
+        return [self.get_subtask(item['id']) for item in result['results']]
+
+    def set_completed(self, ids, value, subtasks=False):
+        self._send('POST', '/batch', {'keep_going': True, 'operations': [
+            {'op': 'complete', 'id': item_id, 'subtask': subtasks, 'undo': not value} for item_id in ids]})
+
+
+# Define la clase RemoteWatcher: el equivalente de FileWatcher para RemoteTaskManager. poll()
+# devuelve los cambios que hicieron las demás personas desde la última consulta.
+class RemoteWatcher:
+
+    def __init__(self, manager):
+        self.manager = manager
+
+    def poll(self):
+        return self.manager.pull()
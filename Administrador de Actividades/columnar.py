@@ -0,0 +1,241 @@
+# Módulo columnar: almacenamiento compacto en columnas para tareas y sub-tareas.
+#
+# En lugar de un objeto por tarea, ColumnTable guarda cada atributo en una columna:
+#   - ids y task_ids en arreglos array('q') (8 bytes por fila),
+#   - el estado completada y las filas borradas en mapas de bits (1 bit por fila),
+#   - los títulos en una lista de cadenas internadas (los títulos repetidos se comparten).
+# La tabla se comporta como el diccionario id -> objeto que usa TaskManager y entrega vistas
+# livianas (TaskView / SubtaskView) con la misma interfaz que Task y Subtask.
+
+# Importa array para las columnas de enteros.
+from array import array
+
+# Importa bisect para buscar un id en la columna ordenada de ids.
+from bisect import bisect_left
+
+# Importa sys para internar los títulos.
+import sys
+
+
+# Define la clase TaskView: una vista de una fila de la tabla con la interfaz de Task.
+class TaskView:
+    __slots__ = ('_table', '_row')
+
+    def __init__(self, table, row):
+        self._table = table
+        self._row = row
+
+    @property
+    def id(self):
+        return self._table.ids[self._row]
+
+    @property
+    def title(self):
+        return self._table.titles[self._row]
+
+    @property
+    def completed(self):
+        return self._table.is_completed(self._row)
+
+    @completed.setter
+    def completed(self, value):
+        self._table.set_completed(self._row, value)
+
+    # Método para marcar la tarea como completada.
+    def mark_complete(self):
+        self.completed = True
+
+    # Método para desmarcar la tarea como completada.
+    def unmark_complete(self):
+        self.completed = False
+
+    def __eq__(self, other):
+        return isinstance(other, TaskView) and other._table is self._table and other._row == self._row
+
+    def __hash__(self):
+        return hash((id(self._table), self._row))
+
+    def __repr__(self):
+        return f"Task({self.id}, '{self.title}', {self.completed})"
+
+
+# Define la clase SubtaskView: como TaskView, pero con el task_id de la tarea principal.
+class SubtaskView(TaskView):
+    __slots__ = ()
+
+    @property
+    def task_id(self):
+        return self._table.task_ids[self._row]
+
+    def __eq__(self, other):
+        return isinstance(other, SubtaskView) and other._table is self._table and other._row == self._row
+
+    __hash__ = TaskView.__hash__
+
+    def __repr__(self):
+        return f"Subtask({self.id}, '{self.title}', {self.completed})"
+
+
+# Define la clase ColumnTable, un diccionario id -> vista respaldado por columnas.
+#
+# Las filas se agregan al final y nunca se mueven, así que una vista sigue siendo válida mientras
+# exista. Los borrados solo marcan la fila, y un id borrado que vuelve a agregarse recupera su
+# fila. Mientras los ids lleguen en orden creciente (el caso
+# normal: archivos ordenados y ids nuevos = máximo + 1) la búsqueda es binaria sobre la columna de
+# ids, sin ningún objeto por fila; los ids que llegan fuera de orden se anotan en un diccionario aparte.
+class ColumnTable:
+
+    def __init__(self, with_task_id=False):
+        self.ids = array('q')
+        self.task_ids = array('q') if with_task_id else None
+        self.titles = []
+        self.completed_bits = bytearray()
+        self.deleted_bits = bytearray()
+        self.view_class = SubtaskView if with_task_id else TaskView
+
+        # Cantidad de filas al principio de la tabla cuyos ids están ordenados.
+        self.sorted_rows = 0
+
+        # Filas con ids fuera de orden: id -> fila.
+        self.unsorted = {}
+
+        # Cantidad de filas no borradas.
+        self.count = 0
+
+    # Crea una tabla a partir de una tabla de la instantánea binaria (ver snapshot.py): las columnas
+    # de enteros y bits se copian de una vez y los títulos se siguen leyendo de la instantánea.
+    @classmethod
+    def from_snapshot(cls, table):
+        columns = cls(table.task_ids is not None)
+        columns.ids.frombytes(table.ids.cast('B'))
+        if table.task_ids is not None:
+            columns.task_ids.frombytes(table.task_ids.cast('B'))
+        columns.titles = table.titles
+        columns.completed_bits = bytearray(table.completed_bits)
+        columns.deleted_bits = bytearray(len(columns.completed_bits))
+        columns.sorted_rows = table.sorted_rows
+        ids = columns.ids
+        columns.unsorted = {ids[row]: row for row in range(table.sorted_rows, table.count)}
+        columns.count = table.count
+        return columns
+
+    # Cantidad de filas completadas (incluidas las borradas; se usa justo después de cargar).
+    def completed_count(self):
+        return int.from_bytes(self.completed_bits, 'little').bit_count()
+
+    # Consulta y modifica los mapas de bits.
+    def is_completed(self, row):
+        return bool(self.completed_bits[row >> 3] & (1 << (row & 7)))
+
+    def set_completed(self, row, value):
+        if value:
+            self.completed_bits[row >> 3] |= 1 << (row & 7)
+        else:
+            self.completed_bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    def _is_deleted(self, row):
+        return bool(self.deleted_bits[row >> 3] & (1 << (row & 7)))
+
+    # Devuelve la fila de un id, o None si no existe o fue borrado.
+    def _find(self, item_id):
+        row = self.unsorted.get(item_id)
+        if row is None:
+            row = bisect_left(self.ids, item_id, 0, self.sorted_rows)
+            if row == self.sorted_rows or self.ids[row] != item_id:
+                return None
+        return None if self._is_deleted(row) else row
+
+    # Devuelve la fila borrada de un id dentro de la parte ordenada, o None.
+    def _deleted_row(self, item_id):
+        row = bisect_left(self.ids, item_id, 0, self.sorted_rows)
+        if row < self.sorted_rows and self.ids[row] == item_id and self._is_deleted(row):
+            return row
+        return None
+
+    # Agrega una fila nueva al final de todas las columnas.
+    def _append(self, item):
+        row = len(self.ids)
+        if row & 7 == 0:
+            self.completed_bits.append(0)
+            self.deleted_bits.append(0)
+
+        self.ids.append(item.id)
+        if self.task_ids is not None:
+            self.task_ids.append(item.task_id)
+        self.titles.append(sys.intern(item.title))
+        self.set_completed(row, item.completed)
+
+        # La fila sigue el orden si su id es mayor que el de la última fila ordenada.
+        if self.sorted_rows == row and (row == 0 or item.id > self.ids[row - 1]):
+            self.sorted_rows += 1
+        else:
+            self.unsorted[item.id] = row
+        self.count += 1
+
+    # Interfaz de diccionario usada por TaskManager.
+    def __setitem__(self, item_id, item):
+        row = self._find(item_id)
+        if row is None:
+            row = self._deleted_row(item_id)
+            if row is None:
+                self._append(item)
+                return
+            # Un id borrado de la parte ordenada (por ejemplo, al deshacer el borrado) vuelve a su
+            # fila, así el orden por id se mantiene.
+            self.deleted_bits[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+            self.count += 1
+        # Un id existente se sobrescribe en su misma fila.
+        if self.task_ids is not None:
+            self.task_ids[row] = item.task_id
+        self.titles[row] = sys.intern(item.title)
+        self.set_completed(row, item.completed)
+
+    def __getitem__(self, item_id):
+        row = self._find(item_id)
+        if row is None:
+            raise KeyError(item_id)
+        return self.view_class(self, row)
+
+    def get(self, item_id, default=None):
+        row = self._find(item_id)
+        return default if row is None else self.view_class(self, row)
+
+    def __contains__(self, item_id):
+        return self._find(item_id) is not None
+
+    def __delitem__(self, item_id):
+        row = self._find(item_id)
+        if row is None:
+            raise KeyError(item_id)
+        self.deleted_bits[row >> 3] |= 1 << (row & 7)
+        self.unsorted.pop(item_id, None)
+        self.count -= 1
+
+    def pop(self, item_id):
+        view = self[item_id]
+        del self[item_id]
+        return view
+
+    def __len__(self):
+        return self.count
+
+    # Recorre las filas no borradas en orden de inserción.
+    def _rows(self):
+        deleted_bits = self.deleted_bits
+        for row in range(len(self.ids)):
+            if not deleted_bits[row >> 3] & (1 << (row & 7)):
+                yield row
+
+    def __iter__(self):
+        ids = self.ids
+        return (ids[row] for row in self._rows())
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        view_class = self.view_class
+        return (view_class(self, row) for row in self._rows())
+
+    def items(self):
+        return ((view.id, view) for view in self.values())
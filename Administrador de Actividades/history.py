@@ -0,0 +1,164 @@
+# Módulo de historial: deshacer y rehacer las modificaciones de TaskManager.
+#
+# En lugar de copiar la lista entera antes de cada acción, cada acción guarda sus cambios como
+# registros del diario (operación, tipo, id, task_id, título, completada): los que la rehacen y
+# los que la deshacen. El borrado de una tarea guarda también las sub-tareas que se borraron con
+# ella. Deshacer o rehacer aplica esos registros, así que cuesta lo que cambió la acción, no el
+# tamaño de la lista.
+#
+# El historial tiene un límite de acciones y otro de registros en total; al pasarse se olvidan las
+# acciones más antiguas. Una acción que sola supera el límite de registros (por ejemplo, importar
+# un archivo enorme) no se guarda, y como las anteriores ya no se podrían deshacer en orden, el
+# historial se vacía.
+
+# Importa contextmanager para pausar el registro mientras se deshace o rehace.
+from contextlib import contextmanager
+
+# Importa deque para descartar en O(1) las acciones más antiguas.
+from collections import deque
+
+# Cantidad máxima de acciones que se pueden deshacer.
+HISTORY_LIMIT = 100
+
+# Cantidad máxima de registros guardados entre todas las acciones (deshacer y rehacer).
+HISTORY_RECORDS = 100_000
+
+
+# Define la clase HistoryEntry: una acción, con los registros que la rehacen ('redo', en orden) y
+# los que la deshacen ('undo', en el orden en que se aplican).
+class HistoryEntry:
+    __slots__ = ('redo', 'undo')
+
+    def __init__(self, redo, undo):
+        self.redo = redo
+        self.undo = undo
+
+    def __len__(self):
+        return len(self.redo) + len(self.undo)
+
+
+# Define la clase History: las acciones que se pueden deshacer y las que se pueden rehacer.
+class History:
+
+    def __init__(self, limit=HISTORY_LIMIT, max_records=HISTORY_RECORDS):
+        self.limit = limit
+        self.max_records = max_records
+        self.undo_entries = deque()
+        self.redo_entries = []
+        # Registros guardados entre las dos pilas.
+        self.records = 0
+        # Acción en construcción dentro de un bloque batch() (ver begin): los registros que rehacen
+        # cada cambio y, por cambio, los que lo deshacen. None fuera de un bloque; 'overflow' indica
+        # que la acción superó el límite de registros y dejó de acumularse.
+        self.group = None
+        self.group_undo = None
+        self.group_size = 0
+        self.overflow = False
+        # True mientras se deshace o rehace: esos cambios no son acciones nuevas.
+        self.paused = False
+
+    # Anota un cambio: 'redo' es el registro que lo aplica y 'undo' la lista de registros que lo
+    # revierten, en el orden en que se aplican. Fuera de un grupo, el cambio es una acción por sí solo.
+    def record(self, redo, undo):
+        if self.paused:
+            return
+        if self.group is None:
+            self._push(HistoryEntry([redo], list(undo)))
+            return
+        if self.overflow:
+            return
+        self.group.append(redo)
+        self.group_undo.append(undo)
+        self.group_size += 1 + len(undo)
+        if self.group_size > self.max_records:
+            # La acción ya no entra: se deja de acumular (ver end).
+            self.overflow = True
+            self.group, self.group_undo = [], []
+
+    # Anota una acción ya armada (por ejemplo, la de un bloque TaskManager.atomic()) como si fuera
+    # un solo cambio.
+    def merge(self, entry):
+        if self.paused:
+            return
+        if self.group is None:
+            self._push(entry)
+            return
+        for redo in entry.redo[:-1]:
+            self.record(redo, [])
+        self.record(entry.redo[-1], entry.undo)
+
+    # Empieza una acción formada por varios cambios (un bloque batch()).
+    def begin(self):
+        if not self.paused:
+            self.group, self.group_undo, self.group_size, self.overflow = [], [], 0, False
+
+    # Termina la acción empezada con begin y la guarda. Los cambios se deshacen en el orden
+    # inverso al que se hicieron.
+    def end(self):
+        redo, undo, overflow = self.group, self.group_undo, self.overflow
+        self.discard()
+        if overflow:
+            self.clear()
+        elif redo:
+            self._push(HistoryEntry(redo, [record for records in reversed(undo) for record in records]))
+
+    # Descarta la acción empezada con begin (el bloque batch() falló y no cambió nada).
+    def discard(self):
+        self.group, self.group_undo, self.group_size, self.overflow = None, None, 0, False
+
+    # Guarda una acción nueva: lo que se podía rehacer deja de tener sentido.
+    def _push(self, entry):
+        if len(entry) > self.max_records:
+            self.clear()
+            return
+        self.records -= sum(len(redone) for redone in self.redo_entries)
+        self.redo_entries = []
+        self.undo_entries.append(entry)
+        self.records += len(entry)
+        self._trim()
+
+    # Olvida las acciones más antiguas hasta respetar los límites.
+    def _trim(self):
+        while self.undo_entries and (len(self.undo_entries) > self.limit or self.records > self.max_records):
+            self.records -= len(self.undo_entries.popleft())
+
+    # Olvida todo el historial (por ejemplo, cuando los ids guardados dejaron de ser válidos).
+    def clear(self):
+        self.undo_entries.clear()
+        self.redo_entries = []
+        self.records = 0
+
+    def can_undo(self):
+        return bool(self.undo_entries)
+
+    def can_redo(self):
+        return bool(self.redo_entries)
+
+    # Saca la última acción para deshacerla; al terminar se pasa a la pila de rehacer (done_undo).
+    def take_undo(self):
+        return self.undo_entries.pop() if self.undo_entries else None
+
+    def done_undo(self, entry):
+        self.redo_entries.append(entry)
+
+    def take_redo(self):
+        return self.redo_entries.pop() if self.redo_entries else None
+
+    def done_redo(self, entry):
+        self.undo_entries.append(entry)
+
+    # Devuelven a su pila una acción sacada con take_undo o take_redo que no se pudo aplicar.
+    def cancel_undo(self, entry):
+        self.undo_entries.append(entry)
+
+    def cancel_redo(self, entry):
+        self.redo_entries.append(entry)
+
+    # Bloque 'with' durante el cual los cambios no se anotan (se están deshaciendo o rehaciendo).
+    @contextmanager
+    def replaying(self):
+        self.paused = True
+        try:
+            yield
+        finally:
+            self.paused = False
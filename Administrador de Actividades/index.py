@@ -1,360 +1,1287 @@
-# Importa el módulo csv, que se utiliza para trabajar con archivos CSV (Comma Separated Values).
-import csv
-
-# Importa el módulo os, que proporciona funciones para interactuar con el sistema operativo.
-import os
-
-# Define la clase Task que se utiliza para representar tareas que pueden estar completas o incompletas.
-class Task:
-    
-    def __init__(self, title, task_id=None, completed=False):
-        # Asigna el valor de task_id al atributo id del objeto (si no se pasa, será None).
-        self.id = task_id
-        
-        # Asigna el valor de title al atributo title del objeto.
-        self.title = title
-        
-        # Asigna el valor de completed al atributo completed del objeto.
-        self.completed = completed
-
-    # Método para marcar la tarea como completada.
-    def mark_complete(self):
-        self.completed = True
-
-    # Método para desmarcar la tarea como completada.
-    def unmark_complete(self):
-        self.completed = False
-
-    # Método especial __repr__ que se utiliza para representar un objeto de la clase Task en forma de cadena de texto.
-    def __repr__(self):
-        return f"Task({self.id}, '{self.title}', {self.completed})"
-
-# Define la clase Subtask. Esta clase representa una sub-tarea, que está asociada a una tarea principal.
-class Subtask:
-    
-    def __init__(self, title, task_id, subtask_id=None, completed=False):
-        # Asigna el valor de subtask_id al atributo id del objeto (si no se pasa, será None).
-        self.id = subtask_id
-        
-        # Asigna el valor de task_id al atributo task_id del objeto (es la tarea principal a la que pertenece esta sub-tarea).
-        self.task_id = task_id
-        
-        # Asigna el valor de title al atributo title del objeto (es el título de la sub-tarea).
-        self.title = title
-        
-        # Asigna el valor de completed al atributo completed del objeto (indica si la sub-tarea está completada o no).
-        self.completed = completed
-
-    # Método para marcar la sub-tarea como completada.
-    def mark_complete(self):
-        self.completed = True
-
-    # Método para desmarcar la sub-tarea como completada.
-    def unmark_complete(self):
-        self.completed = False
-
-    # Método especial __repr__ que se utiliza para representar el objeto de la clase Subtask en forma de cadena de texto.
-    def __repr__(self):
-        return f"Subtask({self.id}, '{self.title}', {self.completed})"
-
-# Define la clase TaskManager. Esta clase es responsable de gestionar las tareas y sub-tareas.
-class TaskManager:
-
-    def __init__(self, task_file='tasks.csv', subtask_file='subtasks.csv'):
-        # Asigna el nombre del archivo CSV para tareas al atributo task_file del objeto.
-        self.task_file = task_file
-        
-        # Asigna el nombre del archivo CSV para sub-tareas al atributo subtask_file del objeto.
-        self.subtask_file = subtask_file
-        
-        # Inicializa la lista de tareas como una lista vacía.
-        self.tasks = []
-        
-        # Inicializa la lista de sub-tareas como una lista vacía.
-        self.subtasks = []
-        
-        # Llama al método load_tasks_from_csv() para cargar las tareas desde el archivo CSV.
-        self.load_tasks_from_csv()
-        
-        # Llama al método load_subtasks_from_csv() para cargar las sub-tareas desde el archivo CSV.
-        self.load_subtasks_from_csv()
-
-    # Define el método add_task que agrega una nueva tarea al sistema.
-    def add_task(self, title):
-        # Calcula el id de la nueva tarea.
-        task_id = len(self.tasks) + 1 if not self.tasks else self.tasks[-1].id + 1
-        
-        # Crea un nuevo objeto de tipo Task con el título recibido y el id calculado.
-        task = Task(title, task_id)
-        
-        # Agrega la nueva tarea a la lista de tareas (self.tasks).
-        self.tasks.append(task)
-        
-        # Llama al método save_tasks_to_csv() para guardar las tareas actuales en el archivo CSV.
-        self.save_tasks_to_csv()
-
-    # Define el método add_subtask que agrega una nueva sub-tarea a una tarea principal específica.
-    def add_subtask(self, task_id, title):
-        # Calcula el id de la nueva sub-tarea.
-        subtask_id = len(self.subtasks) + 1 if not self.subtasks else self.subtasks[-1].id + 1
-        
-        # Crea un nuevo objeto de la clase Subtask utilizando el título recibido (title),
-        # el id de la tarea principal (task_id), y el subtask_id calculado.
-        subtask = Subtask(title, task_id, subtask_id)
-        
-        # Agrega la nueva sub-tarea a la lista de sub-tareas (self.subtasks).
-        self.subtasks.append(subtask)
-        
-        # Llama al método save_subtasks_to_csv() para guardar las sub-tareas actuales en el archivo CSV.
-        self.save_subtasks_to_csv()
-
-    # Define el método mark_task_complete que marca una tarea como completada.
-    def mark_task_complete(self, task_id):
-        # Llama al método get_task() para obtener la tarea correspondiente al task_id proporcionado.
-        task = self.get_task(task_id)
-        
-        # Verifica si la tarea existe.
-        if task:
-            # Si la tarea fue encontrada, se llama al método mark_complete() de la tarea para marcarla como completada.
-            task.mark_complete()
-            
-            # Después de marcar la tarea como completada, se guarda el estado actualizado de las tareas en el archivo CSV.
-            self.save_tasks_to_csv()
-
-    # Define el método unmark_task_complete que desmarca una tarea como incompleta.
-    def unmark_task_complete(self, task_id):
-        # Llama al método get_task() para obtener la tarea correspondiente al task_id proporcionado.
-        task = self.get_task(task_id)
-        
-        # Verifica si la tarea existe.
-        if task:
-            # Si la tarea fue encontrada, se llama al método unmark_complete() de la tarea para desmarcarla como completada.
-            task.unmark_complete()
-            
-            # Después de desmarcar la tarea como incompleta, se guarda el estado actualizado de las tareas en el archivo CSV.
-            self.save_tasks_to_csv()
-
-    # Define el método mark_subtask_complete que marca una sub-tarea como completada.
-    def mark_subtask_complete(self, subtask_id):
-        # Llama al método get_subtask() para obtener la sub-tarea correspondiente al subtask_id proporcionado.
-        subtask = self.get_subtask(subtask_id)
-        
-        # Verifica si la sub-tarea existe.
-        if subtask:
-            # Si la sub-tarea fue encontrada, se llama al método mark_complete() de la sub-tarea para marcarla como completada.
-            subtask.mark_complete()
-            
-            # Después de marcar la sub-tarea como completada, se guarda el estado actualizado de las sub-tareas en el archivo CSV.
-            self.save_subtasks_to_csv()
-
-    # Define el método unmark_subtask_complete que desmarca una sub-tarea como incompleta.
-    def unmark_subtask_complete(self, subtask_id):
-        # Llama al método get_subtask() para obtener la sub-tarea correspondiente al subtask_id proporcionado.
-        subtask = self.get_subtask(subtask_id)
-        
-        # Verifica si la sub-tarea existe (si subtask no es None).
-        if subtask:
-            # Si la sub-tarea fue encontrada, se llama al método unmark_complete() de la sub-tarea para desmarcarla como completada.
-            subtask.unmark_complete()
-            
-            # Después de desmarcar la sub-tarea como incompleta, se guarda el estado actualizado de las sub-tareas en el archivo CSV.
-            self.save_subtasks_to_csv()
-
-    # Define el método delete_task que elimina una tarea y todas las subtareas asociadas a ella.
-    def delete_task(self, task_id):
-        # Llama al método get_task() para obtener la tarea correspondiente al task_id proporcionado.
-        task = self.get_task(task_id)
-        
-        # Verifica si la tarea existe.
-        if task:
-            # Si la tarea fue encontrada, se elimina de la lista de tareas (self.tasks).
-            self.tasks.remove(task)
-
-            # Elimina todas las subtareas que están asociadas a esta tarea eliminada.
-            self.subtasks = [subtask for subtask in self.subtasks if subtask.task_id != task_id]
-
-            # Después de eliminar la tarea y sus subtareas, se guarda el estado actualizado de las tareas en el archivo CSV.
-            self.save_tasks_to_csv()
-
-            # También guarda el estado actualizado de las subtareas en el archivo CSV.
-            self.save_subtasks_to_csv()
-
-    # Define el método delete_subtask que elimina una sub-tarea.
-    def delete_subtask(self, subtask_id):
-        # Llama al método get_subtask() para obtener la sub-tarea correspondiente al subtask_id proporcionado.
-        subtask = self.get_subtask(subtask_id)
-        
-        # Verifica si la sub-tarea existe.
-        if subtask:
-            # Si la sub-tarea fue encontrada, se elimina de la lista de sub-tareas (self.subtasks).
-            self.subtasks.remove(subtask)
-            
-            # Después de eliminar la sub-tarea, se guarda el estado actualizado de las sub-tareas en el archivo CSV.
-            self.save_subtasks_to_csv()
-
-    # Define el método get_task que busca una tarea por su identificador (task_id).
-    def get_task(self, task_id):
-        # Utiliza una expresión generadora para buscar la tarea que tenga el id igual al task_id.
-        return next((task for task in self.tasks if task.id == task_id), None)
-
-    # Define el método get_subtask que busca una sub-tarea por su identificador (subtask_id).
-
-    def get_subtask(self, subtask_id):
-        # Utiliza una expresión generadora para buscar la sub-tarea que tenga el id igual al subtask_id.
-        return next((subtask for subtask in self.subtasks if subtask.id == subtask_id), None)
-
-    # Define el método load_tasks_from_csv que carga las tareas desde el archivo CSV.
-    def load_tasks_from_csv(self):
-        # Verifica si el archivo de tareas (self.task_file) no existe en el sistema.
-        # Si el archivo no existe, lo crea y escribe la cabecera (header) en él.
-        if not os.path.exists(self.task_file):
-            # Abre el archivo en modo escritura (modo 'w').
-            with open(self.task_file, mode='w') as file:
-                writer = csv.writer(file)
-                writer.writerow(["id", "title", "completed"])  # Escribe la cabecera del archivo CSV
-
-        # Abre el archivo en modo lectura (modo 'r') para leer los datos existentes.
-        with open(self.task_file, mode='r') as file:
-            reader = csv.reader(file)
-            # Convierte el objeto 'reader' a una lista de filas (rows).
-            # Cada fila en 'rows' es una lista que representa una línea en el archivo CSV.
-            rows = list(reader)
-
-            # Inicializa una lista vacía para almacenar las tareas cargadas desde el archivo CSV.
-            self.tasks = []
-            
-            # Itera sobre todas las filas del archivo CSV, comenzando desde la segunda fila (rows[1:]),
-            # para ignorar la cabecera (que está en la primera fila).
-            for row in rows[1:]:
-                # Verifica si la fila tiene exactamente 3 columnas: id, title, completed.
-                if len(row) == 3:
-                    try:
-                        # Desempaqueta la fila en 3 variables: task_id, title, completed.
-                        task_id, title, completed = row
-                        
-                        # Convierte el task_id a entero.
-                        task_id = int(task_id)
-                        
-                        # Convierte el valor de completed a un valor booleano.
-                        completed = completed == 'True'
-                        
-                        # Crea un objeto Task con el título, id y estado de completado, y lo agrega a la lista de tareas.
-                        self.tasks.append(Task(title, task_id, completed))
-                    except ValueError:
-                        # Si ocurre un error al convertir task_id o completed, se ignora esa fila y se continúa con la siguiente.
-                        continue
-
-    # Define el método load_subtasks_from_csv que carga las sub-tareas desde el archivo CSV.
-    def load_subtasks_from_csv(self):  
-        # Verifica si el archivo de subtareas (self.subtask_file) no existe en el sistema.
-        # Si el archivo no existe, lo crea y escribe la cabecera (header) en él.
-        if not os.path.exists(self.subtask_file):
-            # Abre el archivo en modo escritura (modo 'w').
-            with open(self.subtask_file, mode='w') as file:
-                writer = csv.writer(file)
-                writer.writerow(["id", "task_id", "title", "completed"])  # Escribe la cabecera del archivo CSV
-
-        # Abre el archivo en modo lectura (modo 'r') para leer los datos existentes.
-        with open(self.subtask_file, mode='r') as file:
-            reader = csv.reader(file)
-            # Convierte el objeto 'reader' a una lista de filas (rows).
-            # Cada fila en 'rows' es una lista que representa una línea en el archivo CSV.
-            rows = list(reader)
-
-            # Inicializa una lista vacía para almacenar las subtareas cargadas desde el archivo CSV.
-            self.subtasks = []
-            
-            # Itera sobre todas las filas del archivo CSV, comenzando desde la segunda fila (rows[1:]),
-            # para ignorar la cabecera (que está en la primera fila).
-            for row in rows[1:]:
-                # Verifica si la fila tiene exactamente 4 columnas: id, task_id, title, completed.
-                if len(row) == 4:
-                    try:
-                        # Desempaqueta la fila en 4 variables: subtask_id, task_id, title, completed.
-                        subtask_id, task_id, title, completed = row
-                        
-                        # Convierte el subtask_id y task_id a enteros.
-                        subtask_id = int(subtask_id)
-                        task_id = int(task_id)
-                        
-                        # Convierte el valor de completed a un valor booleano.
-                        completed = completed == 'True'
-                        
-                        # Crea un objeto Subtask con el título, task_id, subtask_id y estado de completado, y lo agrega a la lista de subtareas.
-                        self.subtasks.append(Subtask(title, task_id, subtask_id, completed))
-                    except ValueError:
-                        # Si ocurre un error al convertir subtask_id, task_id o completed se ignora esa fila y se continúa con la siguiente.
-                        continue
-
-    # Define el método save_tasks_to_csv que guarda las tareas en el archivo CSV.
-    def save_tasks_to_csv(self):
-        # Abre el archivo de tareas (self.task_file) en modo escritura ('w').
-        with open(self.task_file, mode='w', newline='') as file:
-            # Crea un objeto escritor CSV que se utilizará para escribir en el archivo.
-            writer = csv.writer(file)
-            # Escribe la cabecera en el archivo CSV, indicando los nombres de las columnas.
-            writer.writerow(["id", "title", "completed"])  # Cabecera
-
-            # Itera sobre todas las tareas en la lista self.tasks.
-            for task in self.tasks:
-                # Escribe una fila en el archivo CSV para cada tarea.
-                writer.writerow([task.id, task.title, task.completed])
-
-    # Define el método save_subtasks_to_csv que guarda las subtareas en el archivo CSV.
-    def save_subtasks_to_csv(self):
-        """Guardar las subtareas en el archivo CSV"""
-        
-        # Abre el archivo de subtareas (self.subtask_file) en modo escritura ('w').
-        with open(self.subtask_file, mode='w', newline='') as file:
-            # Crea un objeto escritor CSV que se utilizará para escribir en el archivo.
-            writer = csv.writer(file)
-            # Escribe la cabecera en el archivo CSV, indicando los nombres de las columnas.
-            writer.writerow(["id", "task_id", "title", "completed"])  # Cabecera
-
-            # Itera sobre todas las subtareas en la lista self.subtasks.
-            for subtask in self.subtasks:
-                # Escribe una fila en el archivo CSV para cada sub-tarea.
-                writer.writerow([subtask.id, subtask.task_id, subtask.title, subtask.completed])
-
-# Exporta las funciones para interactuar con las tareas.
-task_manager = TaskManager()
-
-# Define la función add_task que agrega una tarea.
-def add_task(title):
-    task_manager.add_task(title)
-
-# Define la función add_subtask que agrega una subtarea a una tarea específica.
-def add_subtask(task_id, title):
-    task_manager.add_subtask(task_id, title) 
-
-# Define la función mark_task_complete que marca una tarea como completada.
-def mark_task_complete(task_id):
-    task_manager.mark_task_complete(task_id) 
-
-# Define la función unmark_task_complete que desmarca una tarea como no completada.
-def unmark_task_complete(task_id):
-    task_manager.unmark_task_complete(task_id) 
-
-# Define la función mark_subtask_complete que marca una subtarea como completada.
-def mark_subtask_complete(subtask_id):
-    task_manager.mark_subtask_complete(subtask_id)
-
-# Define la función unmark_subtask_complete que desmarca una subtarea como no completada.
-def unmark_subtask_complete(subtask_id):
-    task_manager.unmark_subtask_complete(subtask_id)
-
-# Define la función delete_task que elimina una tarea.
-def delete_task(task_id):
-    task_manager.delete_task(task_id)
-
-# Define la función delete_subtask que elimina una subtarea.
-def delete_subtask(subtask_id):
-    task_manager.delete_subtask(subtask_id)
-
-# Define la función list_tasks que devuelve la lista de tareas almacenadas en el objeto 'task_manager'.
-def list_tasks():
-    return task_manager.tasks 
-
-# Define la función list_subtasks que devuelve la lista de subtareas almacenadas en el objeto 'task_manager'.
-def list_subtasks():
-    return task_manager.subtasks 
+# Importa array para guardar listas de ids de forma compacta.
+from array import array
+
+# Importa contextmanager para definir el bloque 'with task_manager.batch():'.
+from contextlib import contextmanager
+
+# Importa wraps para el decorador de los métodos que modifican los datos.
+from functools import wraps
+
+# Importa chain para recorrer tareas y sub-tareas como una sola secuencia.
+from itertools import chain
+
+# Importa threading para proteger el estado cuando se persiste desde otro hilo.
+import threading
+
+# Importa la tabla en columnas que usa el modo compacto de TaskManager.
+from columnar import ColumnTable
+
+# Importa el índice de búsqueda por palabras de los títulos.
+from search import PendingSearchIndex, SearchIndex
+
+# Importa la instrumentación opcional (cantidad de llamadas, tiempos y bytes escritos).
+from instrumentation import Instrumentation
+
+# Importa la persistencia diferida en un hilo aparte.
+from persistence import WRITE_BEHIND_DELAY, WriteBehind
+
+# Importa el historial para deshacer y rehacer.
+from history import HISTORY_LIMIT, HISTORY_RECORDS, History
+
+# Importa los motores de almacenamiento: CSV (con diario opcional) y SQLite.
+from storage import FSYNC_ALWAYS, FSYNC_INTERVAL, JOURNAL_LIMIT, CsvStorage, SqliteStorage
+
+# Métodos de TaskManager y de su almacenamiento que mide la instrumentación (ver enable_instrumentation).
+INSTRUMENTED_METHODS = (
+    'load_tasks', 'load_subtasks', 'replay_journal', 'reload', 'save', 'write_changes',
+    'add_task', 'add_subtask', 'mark_task_complete', 'unmark_task_complete', 'mark_subtask_complete',
+    'unmark_subtask_complete', 'delete_task', 'delete_subtask', 'add_tasks', 'add_subtasks',
+    'set_completed', 'get_task', 'get_subtask', 'subtasks_for', 'load_subtasks_of', 'search',
+    'build_search_index', 'apply_records', 'merge_rows', 'undo', 'redo',
+)
+INSTRUMENTED_STORAGE_METHODS = (
+    'load_tasks', 'load_subtasks', 'scan_subtasks', 'read_subtasks', 'load_changes', 'apply', 'save_all',
+    'load_table', 'write_binary_snapshot',
+)
+
+# Decorador de los métodos que modifican los índices y persisten el cambio: los ejecuta con el lock
+# tomado, para que otro hilo no vuelva a cargar los datos entre la modificación y su registro.
+def _locked(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+# Define la clase Task que se utiliza para representar tareas que pueden estar completas o incompletas.
+class Task:
+    # __slots__ evita el diccionario __dict__ de cada instancia y reduce el tamaño de cada tarea.
+    __slots__ = ('id', 'title', 'completed')
+    
+    def __init__(self, title, task_id=None, completed=False):
+        # Asigna el valor de task_id al atributo id del objeto (si no se pasa, será None).
+        self.id = task_id
+        
+        # Asigna el valor de title al atributo title del objeto.
+        self.title = title
+        
+        # Asigna el valor de completed al atributo completed del objeto.
+        self.completed = completed
+
+    # Método para marcar la tarea como completada.
+    def mark_complete(self):
+        self.completed = True
+
+    # Método para desmarcar la tarea como completada.
+    def unmark_complete(self):
+        self.completed = False
+
+    # Método especial __repr__ que se utiliza para representar un objeto de la clase Task en forma de cadena de texto.
+    def __repr__(self):
+        return f"Task({self.id}, '{self.title}', {self.completed})"
+
+# Define la clase Subtask. Esta clase representa una sub-tarea, que está asociada a una tarea principal.
+class Subtask:
+    # __slots__ evita el diccionario __dict__ de cada instancia y reduce el tamaño de cada sub-tarea.
+    __slots__ = ('id', 'task_id', 'title', 'completed')
+    
+    def __init__(self, title, task_id, subtask_id=None, completed=False):
+        # Asigna el valor de subtask_id al atributo id del objeto (si no se pasa, será None).
+        self.id = subtask_id
+        
+        # Asigna el valor de task_id al atributo task_id del objeto (es la tarea principal a la que pertenece esta sub-tarea).
+        self.task_id = task_id
+        
+        # Asigna el valor de title al atributo title del objeto (es el título de la sub-tarea).
+        self.title = title
+        
+        # Asigna el valor de completed al atributo completed del objeto (indica si la sub-tarea está completada o no).
+        self.completed = completed
+
+    # Método para marcar la sub-tarea como completada.
+    def mark_complete(self):
+        self.completed = True
+
+    # Método para desmarcar la sub-tarea como completada.
+    def unmark_complete(self):
+        self.completed = False
+
+    # Método especial __repr__ que se utiliza para representar el objeto de la clase Subtask en forma de cadena de texto.
+    def __repr__(self):
+        return f"Subtask({self.id}, '{self.title}', {self.completed})"
+
+# Define la clase TaskManager. Esta clase es responsable de gestionar las tareas y sub-tareas.
+class TaskManager:
+
+    def __init__(self, task_file='tasks.csv', subtask_file='subtasks.csv', journal=False,
+                 journal_limit=JOURNAL_LIMIT, storage=None, lazy=False, compact=False,
+                 fsync=FSYNC_ALWAYS, fsync_interval=FSYNC_INTERVAL, instrument=False,
+                 binary_snapshot=False, history_limit=0, history_records=HISTORY_RECORDS):
+        # Asigna el nombre del archivo CSV para tareas al atributo task_file del objeto.
+        self.task_file = task_file
+        
+        # Asigna el nombre del archivo CSV para sub-tareas al atributo subtask_file del objeto.
+        self.subtask_file = subtask_file
+
+        # Motor de almacenamiento. Por defecto se usan los archivos CSV; con journal=True cada
+        # mutación agrega un registro a un diario en lugar de reescribir los CSV. 'fsync' indica cuándo
+        # se sincronizan los archivos con el disco (ver storage.FSYNC_POLICIES). Con binary_snapshot=True
+        # se guarda además una instantánea binaria de los CSV que acelera el arranque (ver snapshot.py).
+        if storage is None:
+            storage = CsvStorage(task_file, subtask_file, journal, journal_limit, fsync, fsync_interval,
+                                 binary_snapshot=binary_snapshot)
+        self.storage = storage
+
+        # Modo compacto: las tareas y sub-tareas se guardan en columnas (ver columnar.py) y se
+        # entregan como vistas livianas, en lugar de un objeto por cada una.
+        self.compact = compact
+        
+        # Diccionario id -> Task. Conserva el orden de inserción y permite búsquedas en O(1).
+        self.task_index = self._new_index(False)
+
+        # Diccionario id -> Subtask. Conserva el orden de inserción y permite búsquedas en O(1).
+        self.subtask_index = self._new_index(True)
+
+        # Índice secundario task_id -> lista de ids de sus sub-tareas, usado en los borrados en cascada.
+        self.subtask_ids_by_task = {}
+
+        # Próximos identificadores libres para tareas y sub-tareas.
+        self.next_task_id = 1
+        self.next_subtask_id = 1
+
+        # Modo perezoso: al iniciar solo se anota dónde están las sub-tareas de cada tarea, y se
+        # cargan la primera vez que se piden. pending_subtasks guarda task_id -> localizador.
+        self.lazy = lazy
+        self.pending_subtasks = {}
+
+        # Cambios acumulados dentro de un bloque batch(); None fuera de un bloque.
+        self.pending_changes = None
+
+        # Persistencia diferida (ver start_write_behind); None si se escribe en el momento.
+        self.writer = None
+
+        # Historial para deshacer y rehacer (ver history.py): como mucho 'history_limit' acciones y
+        # 'history_records' registros en total. Por defecto no se guarda historial (None): solo lo
+        # usa la interfaz gráfica, que lo activa con enable_history.
+        self.history = History(history_limit, history_records) if history_limit else None
+
+        # Contadores de progreso. El total de sub-tareas de una tarea ya lo da subtask_ids_by_task;
+        # completed_by_task cuenta las completadas (solo tareas con alguna), y los otros dos, las
+        # tareas y sub-tareas completadas en total. Se actualizan en O(1) en cada cambio.
+        self.completed_by_task = {}
+        self.completed_tasks = 0
+        self.completed_subtasks = 0
+
+        # Índice de búsqueda de títulos. Se construye la primera vez que se busca (ver search), o de
+        # antemano en otro hilo (ver start_search_index), y desde entonces se mantiene al día en cada
+        # alta y baja. 'background_search' indica que se vuelve a construir en otro hilo tras cada carga.
+        self.search_index = None
+        self.background_search = False
+
+        # Protege los índices mientras el hilo de escritura los copia: las altas, bajas y cargas lo toman.
+        self.lock = threading.RLock()
+
+        # Cuántas veces se volvió a leer el almacenamiento porque otro proceso había guardado antes
+        # (ver _catch_up). La interfaz lo consulta para saber si debe volver a dibujar la lista.
+        self.external_updates = 0
+
+        # Instrumentación opcional; None si está desactivada (ver enable_instrumentation). Con
+        # instrument=True se activa antes de cargar, para medir también la carga inicial.
+        self.instrumentation = None
+        if instrument:
+            self.enable_instrumentation()
+
+        # Carga con el almacenamiento bloqueado, para no leer a medias lo que guarda otro proceso.
+        with self.storage.locked():
+            # Llama al método load_tasks() para cargar las tareas desde el almacenamiento.
+            self.load_tasks()
+
+            # Llama al método load_subtasks() para cargar las sub-tareas desde el almacenamiento.
+            self.load_subtasks()
+
+            # Si los datos se leyeron de los CSV, vuelve a generar la instantánea binaria.
+            self.update_binary_snapshot()
+
+            # Aplica sobre la última instantánea los cambios registrados en el diario.
+            self.replay_journal()
+
+    # Crea un índice vacío: un diccionario o, en modo compacto, una tabla en columnas con la misma interfaz.
+    def _new_index(self, with_task_id):
+        return ColumnTable(with_task_id) if self.compact else {}
+
+    # Propiedad tasks: devuelve la lista de tareas en el orden en que fueron agregadas.
+    @property
+    def tasks(self):
+        return list(self.task_index.values())
+
+    # Propiedad subtasks: devuelve la lista de sub-tareas en el orden en que fueron agregadas.
+    @property
+    def subtasks(self):
+        self._load_all_subtasks()
+        return list(self.subtask_index.values())
+
+    # Define el método subtasks_for que devuelve las sub-tareas de una tarea, en orden, usando el
+    # índice secundario (que se mantiene al día en cada alta y baja). El coste es proporcional a la
+    # cantidad de sub-tareas de esa tarea, no al total.
+    def subtasks_for(self, task_id):
+        self.load_subtasks_of(task_id)
+        subtask_index = self.subtask_index
+        return [subtask_index[subtask_id] for subtask_id in self.subtask_ids_by_task.get(task_id, ())]
+
+    # Define el método task_progress que devuelve (completadas, total) de las sub-tareas de una
+    # tarea, a partir de los contadores y sin recorrer sus sub-tareas.
+    def task_progress(self, task_id):
+        self.load_subtasks_of(task_id)
+        return self.completed_by_task.get(task_id, 0), len(self.subtask_ids_by_task.get(task_id, ()))
+
+    # Define el método summary que devuelve los totales (tareas completadas, tareas, sub-tareas
+    # completadas, sub-tareas). En modo perezoso carga antes las sub-tareas pendientes.
+    def summary(self):
+        self._load_all_subtasks()
+        return (self.completed_tasks, len(self.task_index),
+                self.completed_subtasks, len(self.subtask_index))
+
+    # Define el método load_subtasks_of que carga las sub-tareas pendientes de una tarea
+    # (modo perezoso). Si ya estaban cargadas no hace nada.
+    def load_subtasks_of(self, task_id):
+        with self.lock:
+            locator = self.pending_subtasks.pop(task_id, None)
+            if locator is not None:
+                for subtask_id, parent_id, title, completed in self.storage.read_subtasks(locator):
+                    self._index_subtask(Subtask(title, parent_id, subtask_id, completed))
+
+    # Carga todas las sub-tareas que aún estén pendientes.
+    def _load_all_subtasks(self):
+        for task_id in list(self.pending_subtasks):
+            self.load_subtasks_of(task_id)
+
+    # Recorre todas las sub-tareas. Las pendientes se cargan solo si alguien recorre el resultado,
+    # por ejemplo un motor que reescribe el archivo completo.
+    def _iter_subtasks(self):
+        self._load_all_subtasks()
+        yield from self.subtask_index.values()
+
+    # Registra una tarea en el índice principal y actualiza el próximo id libre.
+    def _index_task(self, task):
+        previous = self.task_index.get(task.id)
+        if previous is not None:
+            self.completed_tasks -= previous.completed
+        self.completed_tasks += task.completed
+        if self.search_index is not None:
+            if previous is not None:
+                self.search_index.remove(task.id << 1, previous.title)
+            self.search_index.add(task.id << 1, task.title)
+        with self.lock:
+            self.task_index[task.id] = task
+        if task.id >= self.next_task_id:
+            self.next_task_id = task.id + 1
+
+    # Registra una sub-tarea en el índice principal y en el índice secundario por tarea.
+    def _index_subtask(self, subtask):
+        previous = self.subtask_index.get(subtask.id)
+        if previous is not None:
+            # Un id repetido reemplaza a la sub-tarea anterior, que deja de estar asociada a su tarea.
+            self.subtask_ids_by_task[previous.task_id].remove(subtask.id)
+            self._count_subtask(previous, -1)
+            if self.search_index is not None:
+                self.search_index.remove(subtask.id << 1 | 1, previous.title)
+        self._count_subtask(subtask, 1)
+        if self.search_index is not None:
+            self.search_index.add(subtask.id << 1 | 1, subtask.title)
+        with self.lock:
+            self.subtask_index[subtask.id] = subtask
+            sibling_ids = self.subtask_ids_by_task.get(subtask.task_id)
+            if sibling_ids is None:
+                # En modo compacto los ids se guardan en un array('q'), sin un objeto int por sub-tarea.
+                sibling_ids = self.subtask_ids_by_task[subtask.task_id] = array('q') if self.compact else []
+            sibling_ids.append(subtask.id)
+        if subtask.id >= self.next_subtask_id:
+            self.next_subtask_id = subtask.id + 1
+
+    # Elimina una sub-tarea de ambos índices. El coste es proporcional al número de sub-tareas hermanas.
+    def _unindex_subtask(self, subtask):
+        self._count_subtask(subtask, -1)
+        if self.search_index is not None:
+            self.search_index.remove(subtask.id << 1 | 1, subtask.title)
+        with self.lock:
+            del self.subtask_index[subtask.id]
+            sibling_ids = self.subtask_ids_by_task.get(subtask.task_id)
+            if sibling_ids is not None:
+                sibling_ids.remove(subtask.id)
+                if not sibling_ids:
+                    del self.subtask_ids_by_task[subtask.task_id]
+
+    # Suma (sign=1) o resta (sign=-1) una sub-tarea completada a los contadores de progreso.
+    def _count_subtask(self, subtask, sign):
+        if subtask.completed:
+            completed = self.completed_by_task.get(subtask.task_id, 0) + sign
+            if completed:
+                self.completed_by_task[subtask.task_id] = completed
+            else:
+                del self.completed_by_task[subtask.task_id]
+            self.completed_subtasks += sign
+
+    # Cambia el estado completada de una tarea o sub-tarea manteniendo los contadores de progreso.
+    def _set_item_completed(self, kind, item, value):
+        if item.completed == value:
+            return
+        if kind == 'subtask':
+            self._count_subtask(item, -1)
+            item.completed = value
+            self._count_subtask(item, 1)
+        else:
+            self.completed_tasks += 1 if value else -1
+            item.completed = value
+
+    # Define el método add_task que agrega una nueva tarea al sistema.
+    @_locked
+    def add_task(self, title):
+        # Crea un nuevo objeto de tipo Task con el título recibido y el próximo id libre.
+        task = Task(title, self.next_task_id)
+        
+        # Agrega la nueva tarea al índice de tareas.
+        self._index_task(task)
+        
+        # Persiste la nueva tarea y la anota en el historial (deshacerla es borrarla).
+        self._persist('add', 'task', task)
+        self._remember(self._record_of('add', 'task', task), [self._record_of('del', 'task', task)])
+
+        # Devuelve la tarea tal como quedó guardada (en modo compacto, su vista), para que quien
+        # la agregó conozca su id.
+        return self.task_index[task.id]
+
+    # Define el método add_subtask que agrega una nueva sub-tarea a una tarea principal específica.
+    @_locked
+    def add_subtask(self, task_id, title):
+        # Carga primero las sub-tareas pendientes de esa tarea para conservar su orden.
+        self.load_subtasks_of(task_id)
+
+        # Crea un nuevo objeto de la clase Subtask utilizando el título recibido (title),
+        # el id de la tarea principal (task_id), y el próximo id libre de sub-tarea.
+        subtask = Subtask(title, task_id, self.next_subtask_id)
+        
+        # Agrega la nueva sub-tarea a los índices de sub-tareas.
+        self._index_subtask(subtask)
+        
+        # Persiste la nueva sub-tarea y la anota en el historial (deshacerla es borrarla).
+        self._persist('add', 'subtask', subtask)
+        self._remember(self._record_of('add', 'subtask', subtask), [self._record_of('del', 'subtask', subtask)])
+
+        # Devuelve la sub-tarea tal como quedó guardada (en modo compacto, su vista), para que quien
+        # la agregó conozca su id. Devuelve None si otro proceso había borrado la tarea principal.
+        return self.subtask_index.get(subtask.id)
+
+    # Define el método mark_task_complete que marca una tarea como completada.
+    @_locked
+    def mark_task_complete(self, task_id):
+        # Llama al método get_task() para obtener la tarea correspondiente al task_id proporcionado.
+        task = self.get_task(task_id)
+        
+        # Verifica si la tarea existe.
+        if task:
+            # Estado anterior, para poder deshacer el cambio.
+            previous = task.completed
+
+            # Si la tarea fue encontrada, se marca como completada (actualizando los contadores de progreso).
+            self._set_item_completed('task', task, True)
+            
+            # Después de marcar la tarea como completada, se persiste el nuevo estado.
+            self._persist('set', 'task', task)
+            self._remember_set('task', task, previous)
+
+    # Define el método unmark_task_complete que desmarca una tarea como incompleta.
+    @_locked
+    def unmark_task_complete(self, task_id):
+        # Llama al método get_task() para obtener la tarea correspondiente al task_id proporcionado.
+        task = self.get_task(task_id)
+        
+        # Verifica si la tarea existe.
+        if task:
+            # Estado anterior, para poder deshacer el cambio.
+            previous = task.completed
+
+            # Si la tarea fue encontrada, se desmarca como completada (actualizando los contadores de progreso).
+            self._set_item_completed('task', task, False)
+            
+            # Después de desmarcar la tarea como incompleta, se persiste el nuevo estado.
+            self._persist('set', 'task', task)
+            self._remember_set('task', task, previous)
+
+    # Define el método mark_subtask_complete que marca una sub-tarea como completada.
+    @_locked
+    def mark_subtask_complete(self, subtask_id):
+        # Llama al método get_subtask() para obtener la sub-tarea correspondiente al subtask_id proporcionado.
+        subtask = self.get_subtask(subtask_id)
+        
+        # Verifica si la sub-tarea existe.
+        if subtask:
+            # Estado anterior, para poder deshacer el cambio.
+            previous = subtask.completed
+
+            # Si la sub-tarea fue encontrada, se marca como completada (actualizando los contadores de progreso).
+            self._set_item_completed('subtask', subtask, True)
+            
+            # Después de marcar la sub-tarea como completada, se persiste el nuevo estado.
+            self._persist('set', 'subtask', subtask)
+            self._remember_set('subtask', subtask, previous)
+
+    # Define el método unmark_subtask_complete que desmarca una sub-tarea como incompleta.
+    @_locked
+    def unmark_subtask_complete(self, subtask_id):
+        # Llama al método get_subtask() para obtener la sub-tarea correspondiente al subtask_id proporcionado.
+        subtask = self.get_subtask(subtask_id)
+        
+        # Verifica si la sub-tarea existe (si subtask no es None).
+        if subtask:
+            # Estado anterior, para poder deshacer el cambio.
+            previous = subtask.completed
+
+            # Si la sub-tarea fue encontrada, se desmarca como completada (actualizando los contadores de progreso).
+            self._set_item_completed('subtask', subtask, False)
+            
+            # Después de desmarcar la sub-tarea como incompleta, se persiste el nuevo estado.
+            self._persist('set', 'subtask', subtask)
+            self._remember_set('subtask', subtask, previous)
+
+    # Define el método delete_task que elimina una tarea y todas las subtareas asociadas a ella.
+    @_locked
+    def delete_task(self, task_id):
+        # Llama al método get_task() para obtener la tarea correspondiente al task_id proporcionado.
+        task = self.get_task(task_id)
+        
+        # Verifica si la tarea existe.
+        if task:
+            # Con historial, se cargan antes las sub-tareas pendientes para poder restaurarlas al deshacer.
+            if self.history is not None:
+                self.load_subtasks_of(task_id)
+
+            # La tarea se anota antes de quitarla (en modo compacto, después ya no se puede leer).
+            forward, restore = self._record_of('del', 'task', task), self._record_of('add', 'task', task)
+
+            # Si la tarea fue encontrada, se elimina del índice de tareas junto con todas sus subtareas,
+            # usando el índice secundario para no recorrer todas las subtareas.
+            removed = self._remove_task(task_id)
+
+            # Después de eliminar la tarea y sus subtareas, se persiste el borrado. Deshacerlo vuelve
+            # a agregar la tarea y, después, sus sub-tareas en el mismo orden.
+            self._persist('del', 'task', task)
+            if self.history is not None:
+                self._remember(forward, [restore] + [self._record_of('add', 'subtask', subtask) for subtask in removed])
+
+    # Define el método delete_subtask que elimina una sub-tarea.
+    @_locked
+    def delete_subtask(self, subtask_id):
+        # Llama al método get_subtask() para obtener la sub-tarea correspondiente al subtask_id proporcionado.
+        subtask = self.get_subtask(subtask_id)
+        
+        # Verifica si la sub-tarea existe.
+        if subtask:
+            # Se anota antes de quitarla, para poder deshacer el borrado.
+            forward, restore = self._record_of('del', 'subtask', subtask), self._record_of('add', 'subtask', subtask)
+
+            # Si la sub-tarea fue encontrada, se elimina de los índices de sub-tareas.
+            self._unindex_subtask(subtask)
+            
+            # Después de eliminar la sub-tarea, se persiste el borrado.
+            self._persist('del', 'subtask', subtask)
+            self._remember(forward, [restore])
+
+    # Devuelve el registro (operación, tipo, id, task_id, título, completada) de un cambio, como los
+    # del diario. Se lee en el momento, porque en modo compacto el objeto es una vista de la fila.
+    @staticmethod
+    def _record_of(op, kind, item):
+        task_id = item.task_id if kind == 'subtask' else None
+        return op, kind, item.id, task_id, item.title, item.completed
+
+    # Anota en el historial un cambio: el registro que lo rehace y los que lo deshacen.
+    def _remember(self, redo, undo):
+        if self.history is not None:
+            self.history.record(redo, undo)
+
+    # Anota un cambio de estado; si el estado ya era ese, no hay nada que deshacer.
+    def _remember_set(self, kind, item, previous):
+        if self.history is not None and item.completed != previous:
+            redo = self._record_of('set', kind, item)
+            self.history.record(redo, [redo[:5] + (previous,)])
+
+    # Persiste una mutación a través del motor de almacenamiento. El motor decide cuánto escribir:
+    # un registro en el diario, una fila en SQLite o el archivo CSV completo.
+    # Dentro de un bloque batch() el cambio solo se acumula y se persiste al salir del bloque.
+    def _persist(self, op, kind, item):
+        if self.pending_changes is not None:
+            self.pending_changes.append((op, kind, item))
+            return
+        self._commit([(op, kind, item)])
+
+    # Entrega cambios al almacenamiento: en el momento o, con persistencia diferida, al hilo de escritura.
+    def _commit(self, changes):
+        if self.writer is not None:
+            self.writer.submit(changes)
+        else:
+            self.write_changes(changes, snapshot=False)
+
+    # Define el método write_changes que escribe cambios con el almacenamiento bloqueado frente a
+    # otros procesos. Si otro proceso guardó desde la última lectura, primero se pone al día
+    # (_catch_up); 'changes' se actualiza en el lugar con los cambios que realmente se escriben.
+    # Desde el hilo de escritura (snapshot=True), si el motor va a recorrer el estado completo se
+    # copia antes, bajo el lock, para no leerlo mientras cambia.
+    def write_changes(self, changes, snapshot=True):
+        with self.storage.locked():
+            with self.lock:
+                if self.storage.is_stale():
+                    self._catch_up(changes)
+                if snapshot and self.storage.needs_snapshot():
+                    tasks, subtasks = list(self.task_index.values()), list(self._iter_subtasks())
+                else:
+                    tasks, subtasks = self.task_index.values(), self._iter_subtasks()
+            self.storage.apply(changes, tasks, subtasks)
+
+    # Define el método _catch_up que incorpora lo que otro proceso guardó antes de escribir los
+    # cambios propios. Si solo creció el diario y sus registros no chocan con los cambios propios
+    # (altas con el mismo id, o sub-tareas nuevas de una tarea borrada), se aplican esos registros;
+    # si no, se vuelve a cargar todo y se rehacen encima los cambios propios (ver _rebase).
+    # Los cambios que todavía esperan en la cola del hilo de escritura se escriben junto con estos.
+    def _catch_up(self, changes):
+        if self.writer is not None:
+            changes.extend(self.writer.take())
+        own = changes + (self.pending_changes or [])
+        records = self.storage.read_new_changes()
+        if records is None or self._conflicts(records, own):
+            self._rebase(changes)
+        else:
+            self.apply_records(records)
+        self.external_updates += 1
+
+    # Indica si registros de otro proceso chocan con cambios propios todavía sin guardar.
+    @staticmethod
+    def _conflicts(records, changes):
+        added = {(kind, item.id) for op, kind, item in changes if op == 'add'}
+        parents = {item.task_id for op, kind, item in changes if op == 'add' and kind == 'subtask'}
+        return any(op == 'add' and (kind, item_id) in added or
+                   op == 'del' and kind == 'task' and item_id in parents
+                   for op, kind, item_id, _, _, _ in records)
+
+    # Define el método _rebase que vuelve a cargar el almacenamiento y rehace encima los cambios
+    # propios: los de 'changes' (que se actualiza en el lugar) y los de un bloque batch() en curso.
+    # Una alta cuyo id ya usó otro proceso recibe el próximo id libre (el objeto agregado se
+    # actualiza, así que quien lo tenga ve el id nuevo); los cambios sobre tareas o sub-tareas que
+    # otro proceso borró se descartan.
+    def _rebase(self, changes):
+        pending = self.pending_changes
+        self.reload()
+        new_ids = {}
+        changes[:] = self._redo(changes, new_ids)
+        if pending is not None:
+            self.pending_changes = self._redo(pending, new_ids)
+        # Si alguna alta cambió de id, los registros del historial ya no la identifican.
+        if new_ids and self.history is not None:
+            self.history.clear()
+
+    # Rehace una lista de cambios sobre los índices recién cargados. Devuelve los cambios rehechos.
+    def _redo(self, changes, new_ids):
+        redone = []
+        for op, kind, item in changes:
+            index = self.task_index if kind == 'task' else self.subtask_index
+            if op == 'add':
+                if kind == 'subtask':
+                    item.task_id = new_ids.get(('task', item.task_id), item.task_id)
+                    if item.task_id not in self.task_index:
+                        continue
+                    self.load_subtasks_of(item.task_id)
+                if item.id in index:
+                    new_id = self.next_task_id if kind == 'task' else self.next_subtask_id
+                    new_ids[kind, item.id] = new_id
+                    item.id = new_id
+                if kind == 'task':
+                    self._index_task(item)
+                else:
+                    self._index_subtask(item)
+                redone.append((op, kind, index[item.id]))
+                continue
+
+            item_id = new_ids.get((kind, item.id), item.id)
+            current = self.get_task(item_id) if kind == 'task' else self.get_subtask(item_id)
+            if current is None:
+                continue
+            if op == 'set':
+                self._set_item_completed(kind, current, item.completed)
+            elif kind == 'task':
+                self._remove_task(item_id)
+            else:
+                self._unindex_subtask(current)
+            redone.append((op, kind, current))
+        return redone
+
+    # Define el método start_write_behind que activa la persistencia diferida: las mutaciones
+    # vuelven enseguida y un hilo escribe los cambios agrupados tras 'delay' segundos.
+    # 'on_error' se llama desde ese hilo con cada error de escritura.
+    def start_write_behind(self, delay=WRITE_BEHIND_DELAY, on_error=None):
+        if self.writer is None:
+            self.writer = WriteBehind(self, delay, on_error)
+        return self.writer
+
+    # Define el método enable_history que empieza a guardar el historial para deshacer y rehacer
+    # (ver undo): como mucho 'limit' acciones y 'max_records' registros en total.
+    def enable_history(self, limit=HISTORY_LIMIT, max_records=HISTORY_RECORDS):
+        with self.lock:
+            if self.history is None:
+                self.history = History(limit, max_records)
+        return self.history
+
+    # Define el método enable_instrumentation que empieza a medir las operaciones de TaskManager y
+    # de su almacenamiento. Devuelve el objeto Instrumentation, que también se puede usar para medir
+    # otros objetos (por ejemplo, la interfaz). Desactivada, no agrega nada a las llamadas.
+    def enable_instrumentation(self):
+        if self.instrumentation is None:
+            instrumentation = Instrumentation()
+            instrumentation.attach(self, INSTRUMENTED_METHODS)
+            instrumentation.attach(self.storage, INSTRUMENTED_STORAGE_METHODS, prefix='storage.')
+            self.storage.on_write = instrumentation.add_bytes
+            self.instrumentation = instrumentation
+        return self.instrumentation
+
+    # Define el método disable_instrumentation que deja de medir y descarta las mediciones.
+    def disable_instrumentation(self):
+        if self.instrumentation is not None:
+            self.instrumentation.detach()
+            self.storage.on_write = None
+            self.instrumentation = None
+
+    # Define el método stats que devuelve las mediciones de la instrumentación: cantidad de
+    # llamadas, tiempos e histograma de cada operación y bytes escritos en cada archivo.
+    def stats(self):
+        if self.instrumentation is None:
+            return {'enabled': False, 'operations': {}, 'bytes_written': {}}
+        return dict(self.instrumentation.stats(), enabled=True)
+
+    # Define el método profile_next que ejecuta dentro de un perfilador la próxima llamada a una
+    # operación (por ejemplo 'save' o 'storage.load_tasks'). Por defecto usa cProfile e imprime el
+    # resultado; ver Instrumentation.profile_next. Activa la instrumentación si hacía falta.
+    def profile_next(self, operation, profiler=None):
+        self.enable_instrumentation().profile_next(operation, profiler)
+
+    # Define el método flush que escribe ya los cambios pendientes de la persistencia diferida.
+    def flush(self):
+        if self.writer is not None:
+            self.writer.flush()
+
+    # Define el método close que detiene la persistencia diferida (escribiendo lo pendiente) y
+    # libera el almacenamiento.
+    def close(self):
+        if self.writer is not None:
+            writer, self.writer = self.writer, None
+            writer.close()
+        # Si en esta sesión se reescribieron los CSV, la instantánea binaria se pone al día para
+        # que el próximo arranque la use.
+        if self.pending_changes is None:
+            with self.storage.locked(), self.lock:
+                self.update_binary_snapshot()
+        self.storage.close()
+
+    # Define el método update_binary_snapshot que vuelve a generar la instantánea binaria del
+    # almacenamiento si está desactualizada. Se llama cuando lo que hay en memoria es lo mismo que
+    # tienen los archivos: recién cargados (antes de aplicar el diario) o al cerrar. En modo perezoso
+    # no se genera, porque habría que cargar todas las sub-tareas.
+    def update_binary_snapshot(self):
+        if not self.lazy and self.storage.binary_snapshot_outdated():
+            self.storage.write_binary_snapshot(self.task_index.values(), self.subtask_index.values())
+
+    # Elimina una tarea y sus sub-tareas de los índices. Devuelve las sub-tareas eliminadas.
+    def _remove_task(self, task_id):
+        with self.lock:
+            task = self.task_index.pop(task_id)
+            self.pending_subtasks.pop(task_id, None)
+            removed = [self.subtask_index.pop(subtask_id)
+                       for subtask_id in self.subtask_ids_by_task.pop(task_id, [])]
+        self.completed_tasks -= task.completed
+        self.completed_subtasks -= self.completed_by_task.pop(task_id, 0)
+        if self.search_index is not None:
+            self.search_index.remove(task_id << 1, task.title)
+            for subtask in removed:
+                self.search_index.remove(subtask.id << 1 | 1, subtask.title)
+        return removed
+
+    # Define el método batch, un bloque 'with' que agrupa varias mutaciones en una sola escritura.
+    # Dentro del bloque los cambios se aplican en memoria y se acumulan; al salir se persisten
+    # todos juntos. Si ocurre una excepción no se escribe nada y se vuelve al estado guardado.
+    # Los bloques anidados forman parte del bloque exterior.
+    @contextmanager
+    def batch(self):
+        if self.pending_changes is not None:
+            yield self
+            return
+
+        self.pending_changes = []
+        # Todo el bloque es una sola acción para deshacer.
+        if self.history is not None:
+            self.history.begin()
+        try:
+            yield self
+        except BaseException:
+            self.pending_changes = None
+            if self.history is not None:
+                self.history.discard()
+            # Lo anterior al bloque debe quedar escrito antes de volver al estado guardado.
+            self.flush()
+            self.reload()
+            raise
+        changes, self.pending_changes = self.pending_changes, None
+        if self.history is not None:
+            self.history.end()
+        self._commit(changes)
+
+    # Define el método atomic, un bloque 'with' dentro de un bloque batch() en curso. Si ocurre una
+    # excepción, solo los cambios del bloque se deshacen en memoria (con sus registros inversos, como
+    # undo) y se quitan de los pendientes; el resto del batch() sigue. Cuesta lo que cambió el bloque,
+    # sin volver a cargar todo como hace batch().
+    @contextmanager
+    def atomic(self):
+        if self.pending_changes is None:
+            raise RuntimeError("atomic() se usa dentro de un bloque batch()")
+        changes, start = self.pending_changes, len(self.pending_changes)
+        outer, self.history = self.history, History(1, float('inf'))
+        self.history.begin()
+        try:
+            yield self
+        except BaseException:
+            inner, self.history = self.history, outer
+            # Si mientras tanto se volvió a cargar todo (ver _rebase), los registros ya no sirven:
+            # la excepción sigue hasta batch(), que vuelve a lo guardado.
+            if self.pending_changes is changes:
+                inner.end()
+                entry = inner.take_undo()
+                with self.lock:
+                    for record in entry.undo if entry is not None else ():
+                        self._apply_record(*record)
+                    del changes[start:]
+            raise
+        inner, self.history = self.history, outer
+        inner.end()
+        entry = inner.take_undo()
+        if entry is not None and outer is not None:
+            outer.merge(entry)
+
+    # Define el método add_tasks que agrega varias tareas con una sola escritura. Devuelve las tareas creadas.
+    def add_tasks(self, titles):
+        with self.batch():
+            return [self.add_task(title) for title in titles]
+
+    # Define el método add_subtasks que agrega varias sub-tareas a una tarea con una sola escritura.
+    def add_subtasks(self, task_id, titles):
+        with self.batch():
+            return [self.add_subtask(task_id, title) for title in titles]
+
+    # Define el método set_completed que marca (value=True) o desmarca (value=False) varias tareas,
+    # o varias sub-tareas si subtasks=True, con una sola escritura.
+    def set_completed(self, ids, value, subtasks=False):
+        if subtasks:
+            update = self.mark_subtask_complete if value else self.unmark_subtask_complete
+        else:
+            update = self.mark_task_complete if value else self.unmark_task_complete
+        with self.batch():
+            for item_id in ids:
+                update(item_id)
+
+    # Define el método undo que deshace la última acción (una modificación o un bloque batch()) con
+    # una sola escritura. Devuelve los cambios aplicados, como apply_records, o una lista vacía si no
+    # hay nada que deshacer. El coste es proporcional a lo que cambió la acción.
+    # Como los demás métodos que modifican, el lock se toma solo mientras se cambian los índices:
+    # la escritura (y, si falla, la recarga de batch()) toma antes el lock del almacenamiento.
+    def undo(self):
+        with self.lock:
+            entry = self.history.take_undo() if self.history is not None else None
+        if entry is None:
+            return []
+        try:
+            changes = self._replay(entry.undo)
+        except BaseException:
+            # batch() volvió a lo guardado: la acción sigue sin deshacer y vuelve a su pila.
+            with self.lock:
+                self.history.cancel_undo(entry)
+            raise
+        with self.lock:
+            self.history.done_undo(entry)
+        return changes
+
+    # Define el método redo que vuelve a hacer la última acción deshecha. Devuelve los cambios aplicados.
+    def redo(self):
+        with self.lock:
+            entry = self.history.take_redo() if self.history is not None else None
+        if entry is None:
+            return []
+        try:
+            changes = self._replay(entry.redo)
+        except BaseException:
+            with self.lock:
+                self.history.cancel_redo(entry)
+            raise
+        with self.lock:
+            self.history.done_redo(entry)
+        return changes
+
+    # Define el método can_undo que indica si hay alguna acción para deshacer.
+    def can_undo(self):
+        return self.history is not None and self.history.can_undo()
+
+    # Define el método can_redo que indica si hay alguna acción deshecha para volver a hacer.
+    def can_redo(self):
+        return self.history is not None and self.history.can_redo()
+
+    # Aplica y persiste registros del historial sin anotarlos como una acción nueva. Si otro proceso
+    # cambió la lista mientras tanto, los registros que ya no tienen sentido se saltan: un alta
+    # cuyo id ya existe o una sub-tarea cuya tarea ya no está.
+    def _replay(self, records):
+        changes = []
+        with self.history.replaying(), self.batch():
+            for record in records:
+                with self.lock:
+                    op, kind, item_id, task_id = record[:4]
+                    if op == 'add' and kind == 'subtask':
+                        if task_id not in self.task_index:
+                            continue
+                        self.load_subtasks_of(task_id)
+                    if op == 'add' and item_id in (self.task_index if kind == 'task' else self.subtask_index):
+                        continue
+                    change = self._apply_record(*record)
+                    if change is not None:
+                        self._persist(*change)
+                        changes.append(change)
+            with self.lock:
+                self._restore_order([change for change in changes if change[0] == 'add'])
+        return changes
+
+    # Devuelve a su lugar según el id las tareas y sub-tareas que volvieron a agregarse (por ejemplo,
+    # al deshacer un borrado): 'restored' son sus cambios ('add', tipo, objeto). El alta las deja al
+    # final de los índices, y la lista y los archivos se mantienen ordenados por id. En modo compacto
+    # ya vuelven a su fila (ver ColumnTable); si no, se mueven detrás de ellas los elementos con id
+    # mayor, así que el coste es proporcional a esos elementos y no al total.
+    def _restore_order(self, restored):
+        for kind, index in (('task', self.task_index), ('subtask', self.subtask_index)):
+            ids = [item.id for _, item_kind, item in restored if item_kind == kind]
+            if not ids or self.compact:
+                continue
+            first, later = min(ids), []
+            for item_id in reversed(index):
+                if item_id < first:
+                    break
+                later.append(item_id)
+            later.sort()
+            for item_id in later:
+                index[item_id] = index.pop(item_id)
+
+        # Las sub-tareas restauradas quedaron últimas entre las de su tarea.
+        for task_id in {item.task_id for _, kind, item in restored if kind == 'subtask'}:
+            sibling_ids = self.subtask_ids_by_task.get(task_id)
+            if sibling_ids is None or all(a < b for a, b in zip(sibling_ids, sibling_ids[1:])):
+                continue
+            ordered = sorted(sibling_ids)
+            self.subtask_ids_by_task[task_id] = array('q', ordered) if self.compact else ordered
+
+    # Define el método reload que descarta el estado en memoria y vuelve a cargarlo del almacenamiento.
+    def reload(self):
+        with self.storage.locked(), self.lock:
+            self.load_tasks()
+            self.load_subtasks()
+            self.update_binary_snapshot()
+            self.replay_journal()
+        if self.background_search:
+            self.start_search_index()
+
+    # Define el método replay_journal que aplica los cambios pendientes del motor (el diario) sobre
+    # lo cargado. Aplicar el diario es idempotente, por lo que una compactación interrumpida no duplica cambios.
+    def replay_journal(self):
+        self.apply_records(self.storage.load_changes())
+
+        # Si el diario creció demasiado, se integra en una instantánea completa.
+        if self.storage.needs_compaction():
+            self.save()
+
+    # Define el método apply_records que aplica sobre los índices, sin persistirlos, registros
+    # (operación, tipo, id, task_id, título, completada) como los del diario. Devuelve los cambios
+    # que hicieron algo, como (operación, tipo, objeto); en un borrado, el objeto es el que se quitó.
+    # Un alta de un id menor que otros (un borrado que se deshizo) vuelve a su lugar (ver _restore_order).
+    def apply_records(self, records):
+        applied, restored = [], []
+        for record in records:
+            op, kind, item_id = record[:3]
+            new = op == 'add' and item_id not in (self.task_index if kind == 'task' else self.subtask_index)
+            change = self._apply_record(*record)
+            if change is not None:
+                applied.append(change)
+                if new:
+                    restored.append(change)
+        self._restore_order(restored)
+        return applied
+
+    # Aplica un registro. Un 'add' de un id existente reemplaza al elemento anterior; los registros
+    # que no cambian nada devuelven None.
+    def _apply_record(self, op, kind, item_id, task_id, title, completed):
+        if kind == 'task':
+            task = self.task_index.get(item_id)
+            if op == 'add':
+                if task is not None and task.title == title and task.completed == completed:
+                    return None
+                self._index_task(Task(title, item_id, completed))
+                return op, kind, self.task_index[item_id]
+            if task is None or op == 'set' and task.completed == completed:
+                return None
+            if op == 'set':
+                self._set_item_completed(kind, task, completed)
+            elif op == 'del':
+                self._remove_task(item_id)
+            return op, kind, task
+
+        if kind == 'subtask':
+            # En modo perezoso se cargan antes las sub-tareas afectadas. Los registros antiguos
+            # no tienen task_id en 'set' y 'del', así que obligan a cargarlas todas.
+            if task_id is not None:
+                self.load_subtasks_of(task_id)
+            else:
+                self._load_all_subtasks()
+            subtask = self.subtask_index.get(item_id)
+            if op == 'add' and task_id is not None:
+                if (subtask is not None and subtask.task_id == task_id and subtask.title == title
+                        and subtask.completed == completed):
+                    return None
+                self._index_subtask(Subtask(title, task_id, item_id, completed))
+                return op, kind, self.subtask_index[item_id]
+            if subtask is None or op == 'set' and subtask.completed == completed:
+                return None
+            if op == 'set':
+                self._set_item_completed(kind, subtask, completed)
+            elif op == 'del':
+                self._unindex_subtask(subtask)
+            return op, kind, subtask
+        return None
+
+    # Define el método merge_rows que compara filas leídas de tasks.csv (kind='task') o de
+    # subtasks.csv con los índices y aplica las diferencias, sin persistirlas. 'ranges' son los
+    # rangos de ids (low, high), sin incluir los extremos (high=None es sin límite), que cubren las
+    # filas leídas: el archivo está ordenado por id, así que los ids de esos rangos que no aparecen
+    # en las filas se borraron. El coste es proporcional a las filas y rangos, no al total.
+    # Devuelve los cambios aplicados (ver apply_records).
+    def merge_rows(self, kind, rows, ranges=((0, None),)):
+        with self.lock:
+            if kind == 'task':
+                index, next_id = self.task_index, self.next_task_id
+                rows = [(item_id, None, title, completed) for item_id, title, completed in rows]
+            else:
+                index, next_id = self.subtask_index, self.next_subtask_id
+
+            records = []
+            found = set()
+            for item_id, task_id, title, completed in rows:
+                found.add(item_id)
+                current = index.get(item_id)
+                # En modo perezoso, las sub-tareas de una tarea pendiente se leerán del archivo nuevo.
+                if task_id in self.pending_subtasks:
+                    if current is not None:
+                        records.append(('del', kind, item_id, current.task_id, '', False))
+                    continue
+                if current is not None and kind == 'subtask' and current.task_id != task_id:
+                    # La sub-tarea pasó a otra tarea: se quita de la anterior y se agrega a la nueva.
+                    records.append(('del', kind, item_id, current.task_id, '', False))
+                    current = None
+                if current is None or current.title != title:
+                    records.append(('add', kind, item_id, task_id, title, completed))
+                elif current.completed != completed:
+                    records.append(('set', kind, item_id, task_id, '', completed))
+
+            # Ids de los rangos que ya no están en el archivo. Si un rango es mucho más grande que
+            # las filas (por ejemplo, al comparar el archivo completo) se recorre el índice.
+            for low, high in ranges:
+                if high is None or high > next_id:
+                    high = next_id
+                if high - low <= 2 * len(rows) + 1024:
+                    candidates = range(low + 1, high)
+                else:
+                    candidates = [item_id for item_id in index if low < item_id < high]
+                for item_id in candidates:
+                    if item_id not in found:
+                        current = index.get(item_id)
+                        if current is not None:
+                            records.append(('del', kind, item_id, getattr(current, 'task_id', None), '', False))
+
+            changes = self.apply_records(records)
+
+            # Los localizadores de las sub-tareas pendientes apuntan al archivo anterior.
+            if kind == 'subtask' and self.pending_subtasks:
+                locators, max_id = self.storage.scan_subtasks()
+                self.pending_subtasks = {task_id: locators[task_id]
+                                         for task_id in self.pending_subtasks if task_id in locators}
+                self.next_subtask_id = max(self.next_subtask_id, max_id + 1)
+        return changes
+
+    # Define el método save que escribe una instantánea completa en el almacenamiento.
+    # En modo diario equivale a compactar: los CSV quedan al día y el diario vacío.
+    def save(self):
+        self.storage.save_all(self.task_index.values(), self._iter_subtasks())
+
+    # Nombres anteriores de save, que ahora guarda siempre tareas y sub-tareas.
+    compact_journal = save_tasks_to_csv = save_subtasks_to_csv = save
+
+    # Define el método get_task que busca una tarea por su identificador (task_id).
+    def get_task(self, task_id):
+        # Consulta el índice de tareas en O(1).
+        return self.task_index.get(task_id)
+
+    # Define el método get_subtask que busca una sub-tarea por su identificador (subtask_id).
+    def get_subtask(self, subtask_id):
+        # Consulta el índice de sub-tareas en O(1). En modo perezoso, un id desconocido obliga a
+        # cargar las sub-tareas pendientes, porque no se sabe a qué tarea pertenece.
+        subtask = self.subtask_index.get(subtask_id)
+        if subtask is None and self.pending_subtasks:
+            self._load_all_subtasks()
+            subtask = self.subtask_index.get(subtask_id)
+        return subtask
+
+    # Define el método search que busca tareas y sub-tareas por las palabras de su título. Cada
+    # palabra de la consulta debe ser el comienzo de alguna palabra del título, sin distinguir
+    # mayúsculas ni acentos ("revi" encuentra "Revisión"). Devuelve hasta 'limit' resultados
+    # (todos si es None), cada sub-tarea a continuación de su tarea principal.
+    def search(self, query, limit=None):
+        with self.lock:
+            # Si el hilo de start_search_index ya terminó el índice, se instala; si todavía lo está
+            # construyendo, no se lo espera (quien busca puede tener el lock que el hilo necesita) y
+            # se construye aquí.
+            index = self.search_index
+            if isinstance(index, PendingSearchIndex):
+                index = self._install_search_index(index)
+            if index is None:
+                index = self.build_search_index()
+        order = []
+        for key in index.search(query, self._title_of, limit):
+            item = self._item_of(key)
+            order.append(((item.task_id, 1, item.id) if key & 1 else (item.id, 0, 0), item))
+        order.sort(key=lambda pair: pair[0])
+        return [item for _, item in order]
+
+    # Define el método build_search_index que construye el índice de búsqueda con todos los títulos.
+    # En modo perezoso carga antes las sub-tareas pendientes.
+    def build_search_index(self):
+        self._load_all_subtasks()
+        tasks = ((task.id << 1, task.title) for task in self.task_index.values())
+        subtasks = ((subtask.id << 1 | 1, subtask.title) for subtask in self.subtask_index.values())
+        self.search_index = SearchIndex.build(chain(tasks, subtasks))
+        return self.search_index
+
+    # Define el método start_search_index que construye el índice de búsqueda en un hilo aparte, para
+    # que la primera búsqueda no tenga que esperarlo (la interfaz lo llama al abrir la ventana). Los
+    # títulos se copian con el lock tomado; el índice se arma sin él, y las altas y bajas que ocurren
+    # mientras tanto se aplican antes de instalarlo. Se repite después de cada carga (ver reload).
+    def start_search_index(self):
+        self.background_search = True
+        with self.lock:
+            if self.search_index is not None:
+                return
+            pending = self.search_index = PendingSearchIndex()
+        threading.Thread(target=self._build_search_index_in_background, args=(pending,),
+                         name='search-index', daemon=True).start()
+
+    def _build_search_index_in_background(self, pending):
+        with self.lock:
+            if self.search_index is not pending:
+                return
+            self._load_all_subtasks()
+            items = [(task.id << 1, task.title) for task in self.task_index.values()]
+            items.extend((subtask.id << 1 | 1, subtask.title) for subtask in self.subtask_index.values())
+        pending.index = SearchIndex.build(items)
+        with self.lock:
+            self._install_search_index(pending)
+
+    # Instala el índice que terminó el hilo de start_search_index, con las altas y bajas anotadas
+    # mientras tanto. Devuelve el índice, o None si todavía no está terminado o ya no sirve (se
+    # volvió a cargar todo o alguien construyó otro).
+    def _install_search_index(self, pending):
+        if self.search_index is not pending or pending.index is None:
+            return None
+        self.search_index = pending.finish()
+        return self.search_index
+
+    # Convierten una clave del índice de búsqueda (id << 1, más 1 si es sub-tarea) en su elemento o título.
+    def _item_of(self, key):
+        return self.subtask_index[key >> 1] if key & 1 else self.task_index[key >> 1]
+
+    def _title_of(self, key):
+        return self._item_of(key).title
+
+    # Define el método load_tasks que carga las tareas desde el almacenamiento.
+    def load_tasks(self):
+        # El índice de búsqueda se vuelve a construir cuando se necesite.
+        self.search_index = None
+
+        # Reinicia el índice de tareas (y su contador de completadas) antes de cargarlas.
+        self.task_index = self._new_index(False)
+        self.completed_tasks = 0
+        self.next_task_id = 1
+
+        # En modo compacto, una instantánea binaria al día se usa directamente como tabla: no se
+        # recorre ninguna fila y los títulos se decodifican al pedirlos.
+        table = self.storage.load_table('task') if self.compact else None
+        if table is not None:
+            self.task_index = ColumnTable.from_snapshot(table)
+            self.completed_tasks = self.task_index.completed_count()
+            self.next_task_id = max(table.ids, default=0) + 1
+            return
+
+        # Crea un objeto Task por cada fila y lo agrega al índice de tareas.
+        for task_id, title, completed in self.storage.load_tasks():
+            self._index_task(Task(title, task_id, completed))
+
+    # Define el método load_subtasks que carga las sub-tareas desde el almacenamiento.
+    def load_subtasks(self):
+        self.search_index = None
+
+        # Reinicia los índices de subtareas (y sus contadores de completadas) antes de cargarlas.
+        self.subtask_index = self._new_index(True)
+        self.subtask_ids_by_task = {}
+        self.completed_by_task = {}
+        self.completed_subtasks = 0
+        self.next_subtask_id = 1
+        self.pending_subtasks = {}
+
+        # En modo perezoso solo se recorre el almacenamiento para saber dónde está cada sub-tarea.
+        if self.lazy:
+            self.pending_subtasks, max_id = self.storage.scan_subtasks()
+            self.next_subtask_id = max_id + 1
+            return
+
+        # En modo compacto, una instantánea binaria al día se usa directamente como tabla; solo se
+        # recorren los ids para armar el índice por tarea y los contadores de progreso.
+        table = self.storage.load_table('subtask') if self.compact else None
+        if table is not None:
+            self._index_snapshot_subtasks(table)
+            return
+
+        # Crea un objeto Subtask por cada fila y lo agrega a los índices de subtareas.
+        for subtask_id, task_id, title, completed in self.storage.load_subtasks():
+            self._index_subtask(Subtask(title, task_id, subtask_id, completed))
+
+    # Carga las sub-tareas desde una tabla de la instantánea binaria (modo compacto).
+    def _index_snapshot_subtasks(self, table):
+        self.subtask_index = ColumnTable.from_snapshot(table)
+        subtask_ids_by_task = self.subtask_ids_by_task
+        for subtask_id, task_id in zip(table.ids, table.task_ids):
+            sibling_ids = subtask_ids_by_task.get(task_id)
+            if sibling_ids is None:
+                sibling_ids = subtask_ids_by_task[task_id] = array('q')
+            sibling_ids.append(subtask_id)
+
+        # Solo se miran las filas de los bytes del mapa de bits que tienen alguna completada.
+        completed_by_task = self.completed_by_task
+        task_ids = table.task_ids
+        for position, byte in enumerate(table.completed_bits):
+            while byte:
+                bit = byte & -byte
+                task_id = task_ids[position * 8 + bit.bit_length() - 1]
+                completed_by_task[task_id] = completed_by_task.get(task_id, 0) + 1
+                byte ^= bit
+        self.completed_subtasks = self.subtask_index.completed_count()
+        self.next_subtask_id = max(table.ids, default=0) + 1
+
+    # Nombres anteriores de los métodos de carga, cuando solo existía el almacenamiento CSV.
+    load_tasks_from_csv = load_tasks
+    load_subtasks_from_csv = load_subtasks
+
+# Exporta las funciones para interactuar con las tareas.
+# Instancia de TaskManager compartida por las funciones del módulo y por la interfaz gráfica.
+# No se crea al importar el módulo: se crea la primera vez que se necesita (get_task_manager)
+# o se inyecta desde afuera (set_task_manager), por ejemplo con otros archivos o motor.
+task_manager = None
+
+# Define la función get_task_manager que devuelve la instancia compartida, creándola si hace falta.
+def get_task_manager():
+    global task_manager
+    if task_manager is None:
+        task_manager = TaskManager()
+    return task_manager
+
+# Define la función set_task_manager que reemplaza la instancia compartida y la devuelve.
+def set_task_manager(manager):
+    global task_manager
+    task_manager = manager
+    return manager
+
+# Define la función add_task que agrega una tarea.
+def add_task(title):
+    return get_task_manager().add_task(title)
+
+# Define la función add_subtask que agrega una subtarea a una tarea específica.
+def add_subtask(task_id, title):
+    return get_task_manager().add_subtask(task_id, title)
+
+# Define la función mark_task_complete que marca una tarea como completada.
+def mark_task_complete(task_id):
+    get_task_manager().mark_task_complete(task_id) 
+
+# Define la función unmark_task_complete que desmarca una tarea como no completada.
+def unmark_task_complete(task_id):
+    get_task_manager().unmark_task_complete(task_id) 
+
+# Define la función mark_subtask_complete que marca una subtarea como completada.
+def mark_subtask_complete(subtask_id):
+    get_task_manager().mark_subtask_complete(subtask_id)
+
+# Define la función unmark_subtask_complete que desmarca una subtarea como no completada.
+def unmark_subtask_complete(subtask_id):
+    get_task_manager().unmark_subtask_complete(subtask_id)
+
+# Define la función delete_task que elimina una tarea.
+def delete_task(task_id):
+    get_task_manager().delete_task(task_id)
+
+# Define la función delete_subtask que elimina una subtarea.
+def delete_subtask(subtask_id):
+    get_task_manager().delete_subtask(subtask_id)
+
+# Define la función add_tasks que agrega varias tareas con una sola escritura.
+def add_tasks(titles):
+    return get_task_manager().add_tasks(titles)
+
+# Define la función add_subtasks que agrega varias subtareas a una tarea con una sola escritura.
+def add_subtasks(task_id, titles):
+    return get_task_manager().add_subtasks(task_id, titles)
+
+# Define la función set_completed que marca o desmarca varias tareas (o subtareas) con una sola escritura.
+def set_completed(ids, value, subtasks=False):
+    get_task_manager().set_completed(ids, value, subtasks)
+
+# Define la función batch que agrupa varias operaciones del módulo en una sola escritura.
+def batch():
+    return get_task_manager().batch()
+
+# Define la función undo que deshace la última acción del TaskManager compartido.
+def undo():
+    return get_task_manager().undo()
+
+# Define la función redo que vuelve a hacer la última acción deshecha.
+def redo():
+    return get_task_manager().redo()
+
+# Define la función list_tasks que devuelve la lista de tareas almacenadas en el TaskManager compartido.
+def list_tasks():
+    return get_task_manager().tasks 
+
+# Define la función list_subtasks_for que devuelve las subtareas de una tarea específica.
+def list_subtasks_for(task_id):
+    return get_task_manager().subtasks_for(task_id)
+
+# Define la función search que busca tareas y subtareas por título en el TaskManager compartido.
+def search(query, limit=None):
+    return get_task_manager().search(query, limit)
+
+# Define la función task_progress que devuelve (completadas, total) de las subtareas de una tarea.
+def task_progress(task_id):
+    return get_task_manager().task_progress(task_id)
+
+# Define la función summary que devuelve los totales de tareas y subtareas, y cuántas están completadas.
+def summary():
+    return get_task_manager().summary()
+
+# Define la función stats que devuelve las mediciones de la instrumentación del TaskManager compartido.
+def stats():
+    return get_task_manager().stats()
+
+# Define la función list_subtasks que devuelve la lista de subtareas almacenadas en el TaskManager compartido.
+def list_subtasks():
+    return get_task_manager().subtasks 
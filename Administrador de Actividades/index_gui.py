@@ -1,206 +1,722 @@
-# Importa el módulo tkinter para crear interfaces gráficas de usuario (GUI) en Python.
-import tkinter as tk
-
-# Importa el módulo messagebox de tkinter para mostrar cuadros de mensajes emergentes.
-from tkinter import messagebox
-
-# Importa el módulo simpledialog de tkinter para mostrar cuadros de diálogo simples que permiten ingresar texto de manera rápida .
-from tkinter import simpledialog
-
-# Importa el widget Checkbutton de tkinter. Este widget permite crear casillas de verificación
-from tkinter import Checkbutton
-
-# Importa funciones y clases definidas en el archivo 'index.py' que gestionan las tareas y subtareas.
-from index import (
-    Task,                          # La clase Task que representa una tarea individual.
-    TaskManager,                   # La clase TaskManager que gestiona la lista de tareas y subtareas.
-    add_task,                      # Función para agregar una nueva tarea.
-    add_subtask,                   # Función para agregar una subtarea a una tarea específica.
-    mark_task_complete,            # Función para marcar una tarea como completada.
-    unmark_task_complete,          # Función para desmarcar una tarea como no completada.
-    delete_task,                   # Función para eliminar una tarea.
-    list_tasks,                    # Función para listar todas las tareas.
-    list_subtasks,                 # Función para listar todas las subtareas.
-    mark_subtask_complete,         # Función para marcar una subtarea como completada.
-    unmark_subtask_complete,       # Función para desmarcar una subtarea como no completada.
-    delete_subtask                 # Función para eliminar una subtarea.
-)
-
-
-# Definición de la clase TaskApp, que es la aplicación de gestión de tareas.
-class TaskApp:
-
-    def __init__(self, root):
-        self.root = root  # Guarda el objeto 'root' (la ventana principal) como un atributo de la clase.
-        self.root.title("Administrador de Actividades")  # Establece el título de la ventana principal.
-
-        # Crea una instancia de TaskManager, que gestiona las tareas y subtareas.
-        self.task_manager = TaskManager()
-
-        # Crea un frame (un contenedor) dentro de la ventana principal donde se mostrarán las tareas.
-        self.task_frame = tk.Frame(self.root)
-        self.task_frame.pack(pady=10)  # Empaqueta el frame y añade un margen de 10 píxeles en la dirección vertical (pady).
-
-        # Crea un botón que, cuando se presiona, agrega una nueva tarea.
-        self.add_button = tk.Button(self.root, text="Agregar Actividad", width=20, command=self.add_task)
-        self.add_button.pack(pady=5)  # Empaqueta el botón en la ventana y añade un margen vertical de 5 píxeles (pady).
-
-        # Llama al método 'refresh_task_list' para mostrar las tareas actuales en la interfaz gráfica.
-        self.refresh_task_list()
-
-    # Método que actualiza la lista de tareas en la interfaz gráfica.
-    # Este método genera dinámicamente los Checkbuttons (casillas de verificación) y botones de borrar
-    # para cada tarea en la lista de tareas, mostrando su estado (completada o pendiente) y permitiendo
-    # agregar subtareas o borrar tareas.
-    def refresh_task_list(self):
-        for widget in self.task_frame.winfo_children():
-            widget.destroy()  # Elimina cada widget de la interfaz (tareas y botones anteriores)
-
-        task_row = 0  # Inicializamos un contador de filas para organizar las tareas y sus elementos en la interfaz.
-
-        # Iteramos sobre todas las tareas obtenidas de la función 'list_tasks()'.
-        # Esta función devuelve la lista de todas las tareas almacenadas en 'TaskManager'.
-        for task in list_tasks():
-            # Determina el estado de la tarea.
-            task_status = "Completada" if task.completed else "Pendiente"
-            
-            # Creamos una variable de tipo BooleanVar que guardará el estado de la tarea (completada o pendiente).
-            var = tk.BooleanVar(value=task.completed)
-
-            # Creamos un Checkbutton para cada tarea. El texto del Checkbutton muestra el título de la tarea
-            check = Checkbutton(self.task_frame, text=f"{task.title} - {task_status}",
-                                variable=var, onvalue=True, offvalue=False, 
-                                command=lambda t=task, v=var: self.toggle_task(t, v))
-
-            # Usamos grid para colocar el Checkbutton en la interfaz gráfica. La tarea actual se coloca en la fila 
-            # 'task_row' y en la primera columna. 'sticky="w"' alinea el texto a la izquierda, 'padx' y 'pady'
-            # controlan los márgenes.
-            check.grid(row=task_row, column=0, sticky="w", padx=10, pady=5)
-
-            # Creamos un botón para eliminar la tarea.
-            delete_button = tk.Button(self.task_frame, text="Borrar", width=10, 
-                                    command=lambda t=task: self.delete_task(t))
-            
-            # Colocamos el botón de borrar en la interfaz en la misma fila de la tarea actual, en la segunda columna.
-            delete_button.grid(row=task_row, column=1, padx=5, pady=5)
-
-            # Creamos un botón para agregar una subtarea a la tarea actual.
-            add_subtask_button = tk.Button(self.task_frame, text="Agregar Subactividad", width=20,
-                                        command=lambda t=task: self.add_subtask(t))  # Pasamos la tarea actual al comando
-            
-            # Colocamos el botón para agregar subtareas en la misma fila de la tarea, en la tercera columna.
-            add_subtask_button.grid(row=task_row, column=2, padx=5, pady=5)
-
-            # Llamamos al método 'refresh_subtasks_for_task' para mostrar las subtareas asociadas con la tarea actual.
-            # Este método generará los widgets correspondientes para cada subtarea y los colocará en la interfaz.
-            # 'task_row' se pasa como argumento para que las subtareas se coloquen justo debajo de la tarea.
-            subtask_row = self.refresh_subtasks_for_task(task, task_row)
-
-            # Incrementamos el contador 'task_row' con el valor de 'subtask_row'.
-            # Esto asegura que la siguiente tarea o conjunto de subtareas se coloque en una fila nueva
-            # de la interfaz gráfica, debajo de las subtareas de la tarea anterior.
-            task_row = subtask_row 
-
-    # Método que actualiza la lista de subtareas debajo de una tarea principal.
-    def refresh_subtasks_for_task(self, task, task_row):
-        """Actualizar las subtareas debajo de la tarea principal, manteniendo la relación de jerarquía"""
-
-        # Inicializamos la fila donde se mostrarán las subtareas. 
-        # Esto asegura que las subtareas se muestren justo debajo de la tarea principal en la interfaz.
-        subtask_row = task_row + 1 
-
-        # Iteramos sobre todas las subtareas obtenidas mediante la función 'list_subtasks()'.
-        for subtask in list_subtasks():
-            # Comprobamos si la subtarea está asociada a la tarea actual (la tarea principal).
-            if subtask.task_id == task.id:
-
-                # Determinamos el estado de la subtarea.
-                subtask_status = "Completada" if subtask.completed else "Pendiente"
-                
-                # Creamos una variable booleana para representar el estado de la subtarea en la interfaz.
-                var = tk.BooleanVar(value=subtask.completed)
-
-                # Creamos un Checkbutton para mostrar la subtarea en la interfaz gráfica.
-                check_subtask = Checkbutton(self.task_frame, text=f"  {subtask.title} - {subtask_status}",
-                                            variable=var, onvalue=True, offvalue=False,
-                                            command=lambda s=subtask, v=var: self.toggle_subtask(s, v))
-
-                # Colocamos el Checkbutton en la interfaz gráfica utilizando el método 'grid'.
-                # Las subtareas se colocan en la fila 'subtask_row' y la primera columna.
-                # El texto se alineará a la izquierda con 'sticky="w"', y 'padx' y 'pady' agregan márgenes.
-                check_subtask.grid(row=subtask_row, column=0, sticky="w", padx=20, pady=5)
-
-                # Creamos un botón para eliminar la subtarea.
-                delete_subtask_button = tk.Button(self.task_frame, text="Borrar", width=10,
-                                                command=lambda s=subtask: self.delete_subtask(s))
-                
-                # Colocamos el botón de eliminar subtarea en la interfaz gráfica utilizando 'grid'.
-                # Se coloca en la misma fila de la subtarea, pero en la segunda columna.
-                delete_subtask_button.grid(row=subtask_row, column=1, padx=5, pady=5)
-
-                # Incrementamos 'subtask_row' para asegurar que la siguiente subtarea (si la hay) se muestre en la fila siguiente.
-                subtask_row += 1
-
-        # Al finalizar, devolvemos el valor actualizado de 'subtask_row'.
-        return subtask_row
-
-    # Método para marcar o desmarcar una tarea como completada o pendiente.
-    def toggle_task(self, task, var):
-        # Verificamos el estado de la variable 'var', que está vinculada al Checkbutton de la tarea.
-        if var.get():
-            mark_task_complete(task.id)  # Marcar como completada
-        else:
-            unmark_task_complete(task.id)  # Desmarcar tarea
-        self.refresh_task_list()  # Actualizar la interfaz
-
-    # Método para marcar o desmarcar una subtarea como completada o pendiente.
-    def toggle_subtask(self, subtask, var):
-        # Al igual que con las tareas, verificamos el estado de la variable 'var', que está vinculada al Checkbutton de la subtarea.
-        if var.get():
-            mark_subtask_complete(subtask.id)  # Marcar como completada
-        else:
-            unmark_subtask_complete(subtask.id)  # Desmarcar subtarea
-        self.refresh_task_list()  # Actualizar la interfaz
-
-    # Método para eliminar una tarea.
-    def delete_task(self, task):
-        # Llamamos a la función 'delete_task' pasando el ID de la tarea que se desea eliminar.
-        # Esta función se encarga de eliminar la tarea tanto de la lista de tareas como del archivo CSV.
-        delete_task(task.id)
-        self.refresh_task_list()  # Actualizar la interfaz
-
-    # Método para eliminar una subtarea.
-    def delete_subtask(self, subtask):
-        # Llamamos a la función 'delete_subtask' pasando el ID de la subtarea que se desea eliminar.
-        # Esta función se encarga de eliminar la subtarea tanto de la lista de subtareas como del archivo CSV.
-        delete_subtask(subtask.id)
-        self.refresh_task_list()  # Actualizar la interfaz
-
-    # Método para agregar una nueva tarea.
-    def add_task(self):
-        # Abrimos un cuadro de diálogo para que el usuario ingrese el nombre de la nueva tarea.
-        # La función 'simpledialog.askstring' muestra una ventana emergente donde el usuario puede escribir texto.
-        task_title = simpledialog.askstring("Nueva Actividad", "Ingresa el nombre de la Actividad:")
-        if task_title:
-            # Llamamos a la función 'add_task', pasando el título de la tarea ingresada por el usuario.
-            # Esta función agrega la tarea a la lista y la guarda en el archivo CSV.
-            add_task(task_title)
-            self.refresh_task_list()  # Actualizar la interfaz
-
-    # Método para agregar una subtarea a una tarea existente.
-    def add_subtask(self, task):
-        # Abrimos un cuadro de diálogo para que el usuario ingrese el nombre de la nueva subtarea.
-        subtask_title = simpledialog.askstring("Nueva Subactividad", "Ingresa el nombre de la Subactividad:")
-        if subtask_title:
-            # Llamamos a la función 'add_subtask', pasando el ID de la tarea a la que se agregará la subtarea
-            # y el título de la nueva subtarea ingresada por el usuario.
-            # Esta función agrega la subtarea a la lista y la guarda en el archivo CSV.
-            add_subtask(task.id, subtask_title)
-            self.refresh_task_list()  # Actualizar la interfaz
-
-# Crear la ventana principal
-if __name__ == "__main__": 
-    root = tk.Tk()  # Crea una nueva instancia de la ventana principal de la aplicación
-    app = TaskApp(root)  # Crea la instancia de la clase 'TaskApp', que inicializa la interfaz gráfica
-    root.mainloop()  # Inicia el bucle principal de la interfaz gráfica, que espera y responde a los eventos del usuario
-
+# Importa el módulo tkinter para crear interfaces gráficas de usuario (GUI) en Python.
+import tkinter as tk
+
+# Importa el módulo messagebox de tkinter para mostrar cuadros de mensajes emergentes.
+from tkinter import messagebox
+
+# Importa el módulo simpledialog de tkinter para mostrar cuadros de diálogo simples que permiten ingresar texto de manera rápida .
+from tkinter import simpledialog
+
+# Importa el widget Checkbutton de tkinter. Este widget permite crear casillas de verificación
+from tkinter import Checkbutton
+
+# Importa bisect para buscar en la lista de filas, que está ordenada por id de tarea.
+from bisect import bisect_left, bisect_right
+
+# Importa io para mostrar en el panel de depuración el resultado de un perfil.
+import io
+
+# Importa os para mostrar solo el nombre de los archivos en los mensajes.
+import os
+
+# Importa queue para leer sin esperar los errores del hilo de escritura.
+import queue
+
+# Importa sys para las opciones --debug y --server de la línea de comandos.
+import sys
+
+# Importa funciones y clases definidas en el archivo 'index.py' que gestionan las tareas y subtareas.
+from index import (
+    Task,                          # La clase Task que representa una tarea individual.
+    TaskManager,                   # La clase TaskManager que gestiona la lista de tareas y subtareas.
+    get_task_manager,              # Función que devuelve el TaskManager compartido.
+    set_task_manager,              # Función que reemplaza el TaskManager compartido.
+    add_task,                      # Función para agregar una nueva tarea.
+    add_subtask,                   # Función para agregar una subtarea a una tarea específica.
+    mark_task_complete,            # Función para marcar una tarea como completada.
+    unmark_task_complete,          # Función para desmarcar una tarea como no completada.
+    delete_task,                   # Función para eliminar una tarea.
+    list_tasks,                    # Función para listar todas las tareas.
+    list_subtasks,                 # Función para listar todas las subtareas.
+    list_subtasks_for,             # Función para listar las subtareas de una tarea.
+    search,                        # Función para buscar tareas y subtareas por título.
+    task_progress,                 # Función que devuelve (completadas, total) de las subtareas de una tarea.
+    summary,                       # Función que devuelve los totales de tareas y subtareas completadas.
+    mark_subtask_complete,         # Función para marcar una subtarea como completada.
+    unmark_subtask_complete,       # Función para desmarcar una subtarea como no completada.
+    delete_subtask,                # Función para eliminar una subtarea.
+    undo,                          # Función para deshacer la última acción.
+    redo                           # Función para volver a hacer la última acción deshecha.
+)
+
+# Importa el cliente del servicio compartido (server.py), para usar la aplicación como cliente.
+from client import RemoteError, RemoteTaskManager, RemoteWatcher
+
+# Importa el perfilador por defecto de la instrumentación, para el panel de depuración.
+from instrumentation import cprofile
+
+# Importa CsvStorage para saber si los archivos del TaskManager se pueden vigilar.
+from storage import CsvStorage
+
+# Importa FileWatcher, que trae los cambios que otro programa hace en los archivos CSV.
+from watcher import WATCH_INTERVAL_MS, FileWatcher
+
+
+# Alto en píxeles de cada fila de la lista de tareas.
+ROW_HEIGHT = 36
+
+# Cantidad de filas adicionales que se preparan por encima y por debajo de la parte visible,
+# para que el desplazamiento no muestre huecos.
+ROW_BUFFER = 5
+
+# Cantidad máxima de resultados que muestra el cuadro de búsqueda.
+SEARCH_LIMIT = 500
+
+# Cada cuántos milisegundos se revisa si el hilo de escritura informó algún error.
+ERROR_POLL_MS = 500
+
+# Con más cambios externos que estos en una consulta de los archivos, se reconstruye la lista en
+# lugar de actualizar fila por fila (un cambio de otro programa puede dejar filas fuera de orden, y
+# entonces cada actualización recorre la lista). Deshacer y rehacer actualizan siempre fila por fila.
+EXTERNAL_REFRESH_LIMIT = 50
+
+# Cada cuántos milisegundos se actualiza el panel de depuración mientras está abierto.
+DEBUG_REFRESH_MS = 1000
+
+# Métodos de TaskApp que mide la instrumentación con debug=True.
+INSTRUMENTED_GUI_METHODS = ('refresh_task_list', 'render_visible', 'show_external_changes')
+
+
+# Clave de orden de una fila de la lista: el id de la tarea, o el de la tarea principal de una subtarea.
+def row_task_id(row):
+    kind, item = row
+    return item.id if kind == "task" else item.task_id
+
+
+# Definición de la clase RowWidgets: los widgets de una fila de la lista, que se reutilizan.
+# Una misma fila muestra distintas tareas o subtareas a medida que el usuario se desplaza; 'kind'
+# e 'item' indican qué está mostrando en cada momento.
+class RowWidgets:
+
+    def __init__(self, app, canvas):
+        self.kind = None  # 'task' o 'subtask'
+        self.item = None  # La tarea o subtarea que muestra la fila.
+
+        # Frame que contiene los widgets de la fila.
+        self.frame = tk.Frame(canvas)
+
+        # Variable de tipo BooleanVar que guarda el estado (completada o pendiente) que muestra la fila.
+        self.var = tk.BooleanVar()
+
+        # Checkbutton con el título y el estado. Los comandos se crean una sola vez y consultan
+        # qué muestra la fila al ejecutarse, así reutilizar la fila no registra comandos nuevos.
+        self.check = Checkbutton(self.frame, variable=self.var, onvalue=True, offvalue=False,
+                                 command=lambda: app.toggle_row(self))
+        self.check.pack(side="left", padx=10, pady=5)
+
+        # Botón para eliminar la tarea o subtarea (siempre a la derecha).
+        self.delete_button = tk.Button(self.frame, text="Borrar", width=10,
+                                       command=lambda: app.delete_row(self))
+        self.delete_button.pack(side="right", padx=5, pady=5)
+
+        # Botón para agregar una subtarea. Solo se muestra en las filas de tareas.
+        self.add_subtask_button = tk.Button(self.frame, text="Agregar Subactividad", width=20,
+                                            command=lambda: app.add_subtask(self.item))
+
+        # Ventana del Canvas donde se dibuja la fila. Empieza oculta.
+        self.window = canvas.create_window(0, 0, anchor="nw", window=self.frame, state="hidden")
+
+    # Hace que la fila muestre una tarea o subtarea.
+    def show(self, kind, item, text):
+        if kind != self.kind:
+            # Las subtareas llevan sangría y no tienen botón para agregar subtareas.
+            if kind == "task":
+                self.check.pack_configure(padx=10)
+                self.add_subtask_button.pack(side="right", padx=5, pady=5)
+            else:
+                self.check.pack_configure(padx=20)
+                self.add_subtask_button.pack_forget()
+        self.kind = kind
+        self.item = item
+        self.var.set(item.completed)
+        self.check.config(text=text)
+
+
+# Definición de la clase TaskApp, que es la aplicación de gestión de tareas.
+#
+# La lista es virtual: 'rows' guarda en orden las tareas y subtareas que se muestran, pero solo
+# existen widgets para las filas visibles (más un pequeño margen). Al desplazarse, las mismas
+# filas de widgets se reutilizan para mostrar otras tareas, así que abrir un archivo con 100.000
+# actividades crea tantos widgets como abrir uno con 100.
+class TaskApp:
+
+    def __init__(self, root, task_manager=None, write_behind=True, watch=True, debug=False, server=None):
+        self.root = root  # Guarda el objeto 'root' (la ventana principal) como un atributo de la clase.
+        self.root.title("Administrador de Actividades")  # Establece el título de la ventana principal.
+
+        # Con server='http://host:puerto' la aplicación es cliente del servicio compartido (server.py)
+        # en lugar de abrir los CSV: cada cambio se envía al servicio, que ya agrupa las escrituras,
+        # y los cambios de las demás personas se traen cada WATCH_INTERVAL_MS.
+        if server is not None and task_manager is None:
+            task_manager = RemoteTaskManager(server, instrument=debug)
+
+        # Usa el TaskManager recibido o, si no se indica ninguno, el compartido del módulo 'index'.
+        # Es la misma instancia sobre la que trabajan las funciones del módulo, así que los archivos
+        # se leen una sola vez.
+        if task_manager is not None:
+            set_task_manager(task_manager)
+        self.task_manager = get_task_manager()
+        self.remote = isinstance(self.task_manager, RemoteTaskManager)
+        if self.remote:
+            write_behind = False
+            # Los errores de comunicación con el servicio se muestran en lugar de solo imprimirse.
+            self.root.report_callback_exception = self.report_callback_error
+
+        # Con write_behind=True los cambios se escriben en un hilo aparte, así que los clics no esperan
+        # al disco. Los errores de escritura se muestran desde el hilo de la interfaz (check_write_errors)
+        # y al cerrar la ventana se escribe todo lo pendiente (on_close).
+        self.writer = self.task_manager.start_write_behind() if write_behind else None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        if self.writer is not None:
+            self.root.after(ERROR_POLL_MS, self.check_write_errors)
+
+        # Ctrl+Z y Ctrl+Y usan el historial de TaskManager, que solo se guarda si se activa. Como
+        # cliente no hay historial: deshacer tendría que enviar los cambios inversos al servicio,
+        # donde otras personas pueden haber modificado lo mismo.
+        if not self.remote:
+            self.task_manager.enable_history()
+
+        # Con watch=True se vigilan los archivos CSV: lo que cambie otro programa se aplica sobre los
+        # datos y se muestra sin recargar todo (check_external_changes).
+        self.watcher = None
+        if watch and self.remote:
+            self.watcher = RemoteWatcher(self.task_manager)
+        elif watch and isinstance(self.task_manager.storage, CsvStorage):
+            self.watcher = FileWatcher(self.task_manager)
+
+        # Cantidad de veces que TaskManager se puso al día con lo que guardó otro proceso antes de
+        # guardar; cuando cambia, la lista se vuelve a dibujar.
+        self.external_updates = self.task_manager.external_updates
+        self.root.after(WATCH_INTERVAL_MS, self.check_external_changes)
+
+        # Cuadro de búsqueda: al escribir, la lista muestra solo las tareas y subtareas cuyo título
+        # contiene palabras que empiezan con lo escrito (sin distinguir mayúsculas ni acentos).
+        self.search_var = tk.StringVar()
+        self.search_entry = tk.Entry(self.root, textvariable=self.search_var, width=40)
+        self.search_entry.pack(pady=(10, 0))
+        self.search_var.trace_add("write", lambda *args: self.refresh_task_list())
+
+        # El índice de búsqueda se construye en otro hilo desde ya, para que la primera letra que se
+        # escriba no tenga que esperarlo.
+        self.task_manager.start_search_index()
+
+        # Crea un frame (un contenedor) dentro de la ventana principal donde se mostrarán las tareas.
+        self.task_frame = tk.Frame(self.root)
+        self.task_frame.pack(pady=10, fill="both", expand=True)  # Empaqueta el frame y añade un margen vertical de 10 píxeles.
+
+        # Canvas desplazable donde se dibujan las filas, con su barra de desplazamiento vertical.
+        self.canvas = tk.Canvas(self.task_frame, width=640, height=480, highlightthickness=0,
+                                yscrollincrement=ROW_HEIGHT)
+        self.scrollbar = tk.Scrollbar(self.task_frame, orient="vertical", command=self.on_scroll)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        # Al cambiar el tamaño de la ventana o usar la rueda del ratón se vuelven a dibujar las filas visibles.
+        self.canvas.bind("<Configure>", lambda event: self.render_visible())
+        self.canvas.bind_all("<MouseWheel>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-4>", self.on_mousewheel)
+        self.canvas.bind_all("<Button-5>", self.on_mousewheel)
+
+        # Lista ordenada de filas (tipo, tarea o subtarea) que muestra la interfaz.
+        self.rows = []
+
+        # Filas de widgets reutilizables.
+        self.row_pool = []
+
+        # Filas visibles: (tipo, id) -> RowWidgets que la muestra.
+        self.visible_rows = {}
+
+        # Crea un botón que, cuando se presiona, agrega una nueva tarea.
+        self.add_button = tk.Button(self.root, text="Agregar Actividad", width=20, command=self.add_task)
+        self.add_button.pack(pady=5)  # Empaqueta el botón en la ventana y añade un margen vertical de 5 píxeles (pady).
+
+        # Etiqueta con el resumen global de tareas y subtareas completadas.
+        self.summary_label = tk.Label(self.root)
+        self.summary_label.pack(pady=(0, 5))
+
+        # Ctrl+Z deshace la última acción (también un borrado, con sus subtareas) y Ctrl+Y la vuelve a hacer.
+        for sequence in ("<Control-z>", "<Control-Z>"):
+            self.root.bind_all(sequence, lambda event: self.undo())
+        for sequence in ("<Control-y>", "<Control-Y>"):
+            self.root.bind_all(sequence, lambda event: self.redo())
+
+        # Con debug=True se activa la instrumentación de TaskManager, se miden también los métodos
+        # que dibujan la lista y F12 abre un panel con las mediciones (toggle_debug_panel).
+        self.debug_window = None
+        self.debug_after = None
+        self.profile_report = None
+        if debug:
+            self.task_manager.enable_instrumentation().attach(self, INSTRUMENTED_GUI_METHODS, prefix='gui.')
+            self.root.bind_all("<F12>", lambda event: self.toggle_debug_panel())
+
+        # Llama al método 'refresh_task_list' para mostrar las tareas actuales en la interfaz gráfica.
+        self.refresh_task_list()
+
+        # Avisa si algún archivo tenía filas que no se pudieron leer, en lugar de omitirlas en silencio.
+        self.report_load_errors()
+
+    # Método que muestra los errores que informó el hilo de escritura. Tk solo puede usarse desde
+    # el hilo de la interfaz, por eso los errores se consultan periódicamente con root.after.
+    def check_write_errors(self):
+        try:
+            error = self.writer.errors.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            messagebox.showerror("Error al guardar",
+                                 f"No se pudieron guardar los cambios; se reintentará.\n\n{error}")
+        self.root.after(ERROR_POLL_MS, self.check_write_errors)
+
+    # Método que consulta si otro programa cambió los archivos y muestra solo las filas afectadas.
+    # Si TaskManager volvió a cargar los datos al guardar (otro proceso había guardado antes), las
+    # filas muestran objetos anteriores y se reconstruye la lista.
+    def check_external_changes(self):
+        if self.task_manager.external_updates != self.external_updates:
+            self.external_updates = self.task_manager.external_updates
+            self.refresh_task_list()
+        elif self.watcher is not None:
+            try:
+                changes = self.watcher.poll()
+            except (OSError, ValueError):
+                changes = []
+            if changes:
+                self.apply_update(self.show_external_changes, changes)
+        self.root.after(WATCH_INTERVAL_MS, self.check_external_changes)
+
+    # Método que muestra los cambios externos o los de deshacer y rehacer. Con más de 'limit' cambios
+    # (limit=None: sin límite), o con una búsqueda escrita (los cambios pueden hacer aparecer o
+    # desaparecer resultados), se reconstruye la lista. Las filas se dibujan una sola vez al final.
+    def show_external_changes(self, changes, limit=EXTERNAL_REFRESH_LIMIT):
+        if (limit is not None and len(changes) > limit) or self.search_var.get().strip():
+            self.refresh_task_list()
+            return
+        for op, kind, item in changes:
+            if op == "del":
+                if kind == "task":
+                    self.remove_task_row(item.id, render=False)
+                else:
+                    self.remove_subtask_row(item, render=False)
+            elif op == "set":
+                if kind == "task":
+                    self.update_task_row(item)
+                else:
+                    self.update_subtask_row(item)
+            elif kind == "task":
+                # Un 'add' de un id que ya está en la lista es un cambio de título.
+                try:
+                    self.replace_row(self.task_position(item.id), "task", item)
+                except KeyError:
+                    self.insert_task_row(item, see=False, render=False)
+            else:
+                try:
+                    self.replace_row(self.subtask_position(item), "subtask", item)
+                except KeyError:
+                    self.insert_subtask_row(item, see=False, render=False)
+        self.render_visible()
+
+    # Método que muestra los errores de comunicación con el servicio (modo cliente). La acción no se
+    # aplicó; la lista se vuelve a dibujar con lo que se sabe del servicio. Los demás errores siguen
+    # el camino normal de Tk.
+    def report_callback_error(self, exc_type, error, traceback):
+        if not isinstance(error, RemoteError):
+            tk.Tk.report_callback_exception(self.root, exc_type, error, traceback)
+            return
+        messagebox.showerror("Error del servicio", f"No se pudo completar la acción.\n\n{error}")
+        self.refresh_task_list()
+
+    # Método que muestra las filas ilegibles encontradas al cargar los archivos (como mucho 10).
+    def report_load_errors(self):
+        errors = self.task_manager.storage.load_errors()
+        if not errors:
+            return
+        lines = [f"{os.path.basename(path)}, línea {line}: {content}" for path, line, content in errors[:10]]
+        if len(errors) > 10:
+            lines.append(f"... y {len(errors) - 10} más")
+        messagebox.showwarning(
+            "Filas dañadas",
+            f"Se omitieron {len(errors)} filas que no se pudieron leer. Antes de guardar se hará "
+            "una copia .bak del archivo original.\n\n" + "\n".join(lines))
+
+    # Método que abre o cierra el panel de depuración: las mediciones de la instrumentación, que se
+    # actualizan cada DEBUG_REFRESH_MS, y botones para reiniciarlas o perfilar una sola operación.
+    def toggle_debug_panel(self):
+        if self.debug_window is not None:
+            self.root.after_cancel(self.debug_after)
+            self.debug_window.destroy()
+            self.debug_window = None
+            return
+
+        instrumentation = self.task_manager.instrumentation
+        self.debug_window = tk.Toplevel(self.root)
+        self.debug_window.title("Depuración")
+        self.debug_window.protocol("WM_DELETE_WINDOW", self.toggle_debug_panel)
+        buttons = tk.Frame(self.debug_window)
+        buttons.pack(fill="x")
+        tk.Button(buttons, text="Reiniciar", command=instrumentation.reset).pack(side="left", padx=5, pady=5)
+        for text, operation in (("Perfilar próximo dibujo", 'gui.refresh_task_list'),
+                                ("Perfilar próximo guardado", 'write_changes')):
+            tk.Button(buttons, text=text, command=lambda operation=operation: instrumentation.profile_next(
+                operation, cprofile(self.store_profile))).pack(side="left", padx=5, pady=5)
+        self.debug_text = tk.Text(self.debug_window, width=110, height=30, font=("Courier", 9))
+        self.debug_text.pack(fill="both", expand=True)
+        self.update_debug_panel()
+
+    # Método que muestra las mediciones actuales (y el último perfil) en el panel de depuración.
+    def update_debug_panel(self):
+        text = self.task_manager.instrumentation.report()
+        if self.profile_report:
+            text += "\n\n" + self.profile_report
+        self.debug_text.delete("1.0", "end")
+        self.debug_text.insert("1.0", text)
+        self.debug_after = self.root.after(DEBUG_REFRESH_MS, self.update_debug_panel)
+
+    # Método que guarda el resultado de un perfil para mostrarlo en el panel. Puede llamarse desde el
+    # hilo de escritura, así que solo guarda el texto; update_debug_panel lo muestra.
+    def store_profile(self, stats):
+        stats.stream = io.StringIO()
+        stats.sort_stats("cumulative").print_stats(25)
+        self.profile_report = stats.stream.getvalue()
+
+    # Método que se ejecuta al cerrar la ventana: escribe los cambios pendientes antes de salir.
+    def on_close(self):
+        if self.writer is not None:
+            self.task_manager.flush()
+            # Si la escritura final falla, los cambios siguen en la cola: se avisa y se deja
+            # decidir si salir igualmente.
+            if self.writer.changes and not messagebox.askyesno(
+                    "Error al guardar", "No se pudieron guardar los últimos cambios. ¿Salir de todos modos?"):
+                return
+        self.root.destroy()
+
+    # Método que reconstruye por completo la lista de filas a partir de las tareas y subtareas.
+    # Las acciones del usuario no lo usan: modifican solo las filas afectadas, y este método queda
+    # como alternativa cuando la actualización incremental no es posible.
+    def refresh_task_list(self):
+        # El hilo de escritura puede estar poniendo los datos al día; se leen con el lock tomado.
+        with self.task_manager.lock:
+            self.build_rows()
+        self.render_visible()
+        self.update_summary()
+
+    # Método que arma la lista de filas: las tareas con sus subtareas, o los resultados de la búsqueda.
+    def build_rows(self):
+        self.rows = []
+
+        # Con una búsqueda escrita se muestran solo los resultados.
+        query = self.search_var.get().strip()
+        if query:
+            self.show_search_results(query)
+            self.canvas.yview_moveto(0)
+            return
+
+        # Iteramos sobre todas las tareas obtenidas de la función 'list_tasks()'.
+        # Esta función devuelve la lista de todas las tareas almacenadas en 'TaskManager'.
+        for task in list_tasks():
+            self.rows.append(("task", task))
+
+            # Llamamos al método 'refresh_subtasks_for_task' para agregar las subtareas de la tarea actual.
+            self.refresh_subtasks_for_task(task)
+
+    # Método que arma las filas de los resultados de una búsqueda. Una tarea encontrada se muestra
+    # con todas sus subtareas; una subtarea encontrada, debajo de su tarea principal.
+    def show_search_results(self, query):
+        # Tareas ya mostradas con todas sus subtareas, y tarea principal de la última subtarea agregada.
+        expanded = set()
+        parent_id = None
+
+        # Los resultados vienen ordenados: cada subtarea llega después de su tarea principal.
+        for item in search(query, SEARCH_LIMIT):
+            if not hasattr(item, "task_id"):
+                self.rows.append(("task", item))
+                self.refresh_subtasks_for_task(item)
+                expanded.add(item.id)
+            elif item.task_id not in expanded:
+                if item.task_id != parent_id:
+                    self.rows.append(("task", self.task_manager.get_task(item.task_id)))
+                    parent_id = item.task_id
+                self.rows.append(("subtask", item))
+
+    # Método que agrega las filas de las subtareas debajo de una tarea principal.
+    def refresh_subtasks_for_task(self, task):
+        """Actualizar las subtareas debajo de la tarea principal, manteniendo la relación de jerarquía"""
+
+        # Iteramos solo sobre las subtareas de esta tarea, que TaskManager ya tiene agrupadas por tarea,
+        # en lugar de recorrer todas las subtareas una vez por cada tarea.
+        self.rows.extend(("subtask", subtask) for subtask in list_subtasks_for(task.id))
+
+    # Método que dibuja las filas visibles reutilizando los widgets existentes.
+    def render_visible(self):
+        total = len(self.rows)
+        width = self.canvas.winfo_width()
+        self.canvas.configure(scrollregion=(0, 0, width, total * ROW_HEIGHT))
+
+        # Calcula qué filas se ven, más un margen por encima y por debajo.
+        top = self.canvas.canvasy(0)
+        first = max(0, int(top // ROW_HEIGHT) - ROW_BUFFER)
+        last = min(total, int((top + self.canvas.winfo_height()) // ROW_HEIGHT) + 1 + ROW_BUFFER)
+
+        # Crea filas de widgets solo si faltan para cubrir la parte visible.
+        while len(self.row_pool) < last - first:
+            self.row_pool.append(RowWidgets(self, self.canvas))
+
+        self.visible_rows = {}
+        for row_widgets, position in zip(self.row_pool, range(first, last)):
+            kind, item = self.rows[position]
+            row_widgets.show(kind, item, self.row_text(kind, item))
+            self.canvas.coords(row_widgets.window, 0, position * ROW_HEIGHT)
+            self.canvas.itemconfigure(row_widgets.window, state="normal", width=width, height=ROW_HEIGHT)
+            self.visible_rows[(kind, item.id)] = row_widgets
+
+        # Oculta las filas de widgets que sobran.
+        for row_widgets in self.row_pool[max(0, last - first):]:
+            self.canvas.itemconfigure(row_widgets.window, state="hidden")
+            row_widgets.item = None
+
+    # Método que responde a la barra de desplazamiento.
+    def on_scroll(self, *args):
+        self.canvas.yview(*args)
+        self.render_visible()
+
+    # Método que responde a la rueda del ratón (Windows y macOS usan 'delta'; Linux, los botones 4 y 5).
+    def on_mousewheel(self, event):
+        step = -1 if event.num == 4 or event.delta > 0 else 1
+        self.canvas.yview_scroll(step * 3, "units")
+        self.render_visible()
+
+    # Método que desplaza la lista para que la fila indicada quede a la vista.
+    def see_row(self, position):
+        total_height = max(len(self.rows) * ROW_HEIGHT, 1)
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), total_height))
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        if not top <= position * ROW_HEIGHT < bottom - ROW_HEIGHT:
+            self.canvas.yview_moveto(position * ROW_HEIGHT / total_height)
+
+    # Devuelve el texto que se muestra en el Checkbutton de una tarea o subtarea. Las tareas con
+    # subtareas muestran además su progreso, que TaskManager lleva contado (no se recorren las subtareas).
+    def row_text(self, kind, item):
+        # Determina el estado de la tarea o subtarea.
+        status = "Completada" if item.completed else "Pendiente"
+        if kind == "subtask":
+            return f"  {item.title} - {status}"
+        completed, total = task_progress(item.id)
+        progress = f" ({completed}/{total} subtareas)" if total else ""
+        return f"{item.title} - {status}{progress}"
+
+    # Método que actualiza la etiqueta con el resumen global.
+    def update_summary(self):
+        completed_tasks, tasks, completed_subtasks, subtasks = summary()
+        self.summary_label.configure(
+            text=f"Actividades completadas: {completed_tasks}/{tasks}   "
+                 f"Subactividades completadas: {completed_subtasks}/{subtasks}")
+
+    # Devuelve la posición en 'rows' de una tarea. Lanza KeyError si no está en la lista.
+    # Las filas siguen el orden por id de los datos, así que se busca en O(log n); si un cambio
+    # externo dejó una tarea fuera de orden, se recorre la lista.
+    def task_position(self, task_id):
+        position = bisect_left(self.rows, task_id, key=row_task_id)
+        if position < len(self.rows) and self.rows[position][0] == "task" and self.rows[position][1].id == task_id:
+            return position
+        for position, (kind, item) in enumerate(self.rows):
+            if kind == "task" and item.id == task_id:
+                return position
+        raise KeyError(task_id)
+
+    # Devuelve la posición siguiente a la última subtarea de la tarea que está en 'position'.
+    def end_of_task(self, position):
+        position += 1
+        while position < len(self.rows) and self.rows[position][0] == "subtask":
+            position += 1
+        return position
+
+    # Devuelve la posición en 'rows' de una subtarea, entre las de su tarea. Lanza KeyError si no está.
+    def subtask_position(self, subtask):
+        position = self.task_position(subtask.task_id) + 1
+        end = self.end_of_task(position - 1)
+        while position < end and self.rows[position][1].id != subtask.id:
+            position += 1
+        if position == end:
+            raise KeyError(subtask.id)
+        return position
+
+    # Método que agrega la fila de una tarea en su lugar según el id: al final si es nueva, o donde
+    # estaba si se deshizo su borrado. Con see=True desplaza la lista hasta la fila nueva; con
+    # render=False no se dibuja (quien llama dibuja después de varios cambios).
+    def insert_task_row(self, task, see=True, render=True):
+        position = bisect_right(self.rows, task.id, key=row_task_id)
+        self.rows.insert(position, ("task", task))
+        if see:
+            self.see_row(position)
+        if render:
+            self.render_visible()
+
+    # Método que agrega la fila de una subtarea entre las de su tarea, en su lugar según el id.
+    def insert_subtask_row(self, subtask, see=True, render=True):
+        start = self.task_position(subtask.task_id) + 1
+        end = self.end_of_task(start - 1)
+        position = bisect_right(self.rows, subtask.id, start, end, key=lambda row: row[1].id)
+        self.rows.insert(position, ("subtask", subtask))
+        if see:
+            self.see_row(position)
+        if render:
+            self.render_visible()
+        self.update_parent_row(subtask.task_id)
+
+    # Método que reemplaza el objeto que muestra una fila (por ejemplo, tras un cambio de título).
+    def replace_row(self, position, kind, item):
+        self.rows[position] = (kind, item)
+        if kind == "task":
+            self.update_task_row(item)
+        else:
+            self.update_subtask_row(item)
+
+    # Método que actualiza el texto y la variable de la fila de una tarea, si está a la vista.
+    def update_task_row(self, task):
+        row_widgets = self.visible_rows.get(("task", task.id))
+        if row_widgets is not None:
+            row_widgets.show("task", task, self.row_text("task", task))
+
+    # Método que actualiza el texto y la variable de la fila de una subtarea, si está a la vista,
+    # y el progreso que muestra su tarea principal.
+    def update_subtask_row(self, subtask):
+        row_widgets = self.visible_rows.get(("subtask", subtask.id))
+        if row_widgets is not None:
+            row_widgets.show("subtask", subtask, self.row_text("subtask", subtask))
+        self.update_parent_row(subtask.task_id)
+
+    # Método que actualiza el progreso que muestra una tarea después de un cambio en sus subtareas.
+    def update_parent_row(self, task_id):
+        task = self.task_manager.get_task(task_id)
+        if task is not None:
+            self.update_task_row(task)
+
+    # Método que quita la fila de una tarea junto con las filas de sus subtareas.
+    def remove_task_row(self, task_id, render=True):
+        position = self.task_position(task_id)
+        del self.rows[position:self.end_of_task(position)]
+        if render:
+            self.render_visible()
+
+    # Método que quita la fila de una subtarea.
+    def remove_subtask_row(self, subtask, render=True):
+        del self.rows[self.subtask_position(subtask)]
+        if render:
+            self.render_visible()
+        self.update_parent_row(subtask.task_id)
+
+    # Aplica una actualización incremental de la interfaz. Si la fila esperada no existe (la interfaz
+    # quedó desfasada respecto de los datos), reconstruye la lista completa.
+    def apply_update(self, update, *args):
+        try:
+            update(*args)
+        except (KeyError, ValueError):
+            self.refresh_task_list()
+        self.update_summary()
+
+    # Método que responde al Checkbutton de una fila.
+    def toggle_row(self, row_widgets):
+        if row_widgets.kind == "task":
+            self.toggle_task(row_widgets.item, row_widgets.var)
+        elif row_widgets.kind == "subtask":
+            self.toggle_subtask(row_widgets.item, row_widgets.var)
+
+    # Método que responde al botón "Borrar" de una fila.
+    def delete_row(self, row_widgets):
+        if row_widgets.kind == "task":
+            self.delete_task(row_widgets.item)
+        elif row_widgets.kind == "subtask":
+            self.delete_subtask(row_widgets.item)
+
+    # Método para marcar o desmarcar una tarea como completada o pendiente.
+    def toggle_task(self, task, var):
+        # Verificamos el estado de la variable 'var', que está vinculada al Checkbutton de la tarea.
+        if var.get():
+            mark_task_complete(task.id)  # Marcar como completada
+        else:
+            unmark_task_complete(task.id)  # Desmarcar tarea
+        self.apply_update(self.update_task_row, task)  # Actualizar solo la fila de la tarea
+
+    # Método para marcar o desmarcar una subtarea como completada o pendiente.
+    def toggle_subtask(self, subtask, var):
+        # Al igual que con las tareas, verificamos el estado de la variable 'var', que está vinculada al Checkbutton de la subtarea.
+        if var.get():
+            mark_subtask_complete(subtask.id)  # Marcar como completada
+        else:
+            unmark_subtask_complete(subtask.id)  # Desmarcar subtarea
+        self.apply_update(self.update_subtask_row, subtask)  # Actualizar solo la fila de la subtarea
+
+    # Método para eliminar una tarea.
+    def delete_task(self, task):
+        # Llamamos a la función 'delete_task' pasando el ID de la tarea que se desea eliminar.
+        # Esta función se encarga de eliminar la tarea y sus subtareas, tanto de memoria como del archivo CSV.
+        delete_task(task.id)
+        self.apply_update(self.remove_task_row, task.id)  # Quitar la fila de la tarea y sus subtareas
+
+    # Método para eliminar una subtarea.
+    def delete_subtask(self, subtask):
+        # Llamamos a la función 'delete_subtask' pasando el ID de la subtarea que se desea eliminar.
+        # Esta función se encarga de eliminar la subtarea tanto de la lista de subtareas como del archivo CSV.
+        delete_subtask(subtask.id)
+        self.apply_update(self.remove_subtask_row, subtask)  # Quitar la fila de la subtarea
+
+    # Método que deshace la última acción y muestra solo las filas afectadas, sin importar cuántas sean.
+    def undo(self):
+        changes = undo()
+        if changes:
+            self.apply_update(self.show_external_changes, changes, None)
+
+    # Método que vuelve a hacer la última acción deshecha.
+    def redo(self):
+        changes = redo()
+        if changes:
+            self.apply_update(self.show_external_changes, changes, None)
+
+    # Método para agregar una nueva tarea.
+    def add_task(self):
+        # Abrimos un cuadro de diálogo para que el usuario ingrese el nombre de la nueva tarea.
+        # La función 'simpledialog.askstring' muestra una ventana emergente donde el usuario puede escribir texto.
+        task_title = simpledialog.askstring("Nueva Actividad", "Ingresa el nombre de la Actividad:")
+        if task_title:
+            # Llamamos a la función 'add_task', pasando el título de la tarea ingresada por el usuario.
+            # Esta función agrega la tarea a la lista, la guarda en el archivo CSV y la devuelve.
+            task = add_task(task_title)
+            self.apply_update(self.insert_task_row, task)  # Agregar solo la fila de la nueva tarea
+
+    # Método para agregar una subtarea a una tarea existente.
+    def add_subtask(self, task):
+        # Abrimos un cuadro de diálogo para que el usuario ingrese el nombre de la nueva subtarea.
+        subtask_title = simpledialog.askstring("Nueva Subactividad", "Ingresa el nombre de la Subactividad:")
+        if subtask_title:
+            # Llamamos a la función 'add_subtask', pasando el ID de la tarea a la que se agregará la subtarea
+            # y el título de la nueva subtarea ingresada por el usuario.
+            # Esta función agrega la subtarea a la lista, la guarda en el archivo CSV y la devuelve.
+            subtask = add_subtask(task.id, subtask_title)
+            if subtask is None:
+                # Otro proceso borró la tarea mientras tanto: se muestra la lista al día.
+                self.refresh_task_list()
+                return
+            self.apply_update(self.insert_subtask_row, subtask)  # Agregar solo la fila de la nueva subtarea
+
+# Crear la ventana principal
+if __name__ == "__main__": 
+    # Con --debug se miden las operaciones desde la carga inicial y F12 abre el panel de depuración.
+    # Con --server URL la aplicación es cliente del servicio compartido (python -m server).
+    debug = "--debug" in sys.argv
+    server = sys.argv[sys.argv.index("--server") + 1] if "--server" in sys.argv[:-1] else None
+    if debug and server is None:
+        set_task_manager(TaskManager(instrument=True))
+    root = tk.Tk()  # Crea una nueva instancia de la ventana principal de la aplicación
+    app = TaskApp(root, debug=debug, server=server)  # Crea la instancia de la clase 'TaskApp', que inicializa la interfaz gráfica
+    root.mainloop()  # Inicia el bucle principal de la interfaz gráfica, que espera y responde a los eventos del usuario
+
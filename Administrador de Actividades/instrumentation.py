@@ -0,0 +1,226 @@
+# Módulo de instrumentación: mide cuántas veces se llama a cada operación de TaskManager (carga,
+# guardado, mutaciones y búsquedas), cuánto tarda y cuántos bytes se escriben, para saber adónde
+# se va el tiempo cuando la aplicación se pone lenta.
+#
+# Es opcional. Instrumentation.attach(objeto, nombres) reemplaza los métodos indicados de esa
+# instancia por versiones que miden; los de la clase no se tocan. Sin instrumentación no queda
+# nada en el camino de las llamadas, así que no cuesta nada; con ella, cada llamada suma un par
+# de lecturas del reloj y la actualización de un histograma.
+#
+# Además permite perfilar una sola ejecución de una operación (profile_next) con cProfile u otro
+# perfilador: se indica qué operación y, la próxima vez que se ejecute, corre dentro del perfilador.
+
+# Importa cProfile y pstats para el perfilador por defecto de profile_next.
+import cProfile
+import io
+import pstats
+
+# Importa contextmanager para definir los perfiladores como bloques 'with'.
+from contextlib import contextmanager
+
+# Importa wraps para que los métodos medidos conserven su nombre.
+from functools import wraps
+
+# Importa isgeneratorfunction para medir los generadores mientras se recorren.
+from inspect import isgeneratorfunction
+
+# Importa threading: el hilo de escritura también registra mediciones.
+import threading
+
+# Importa perf_counter, el reloj de las mediciones.
+from time import perf_counter
+
+# Cantidad de intervalos del histograma. El intervalo i cuenta las llamadas que tardaron menos de
+# 2**i microsegundos (y al menos 2**(i-1)); el último acumula todas las más lentas (más de ~1 minuto).
+HISTOGRAM_BUCKETS = 27
+
+
+# Define la clase OperationStats: las mediciones de una operación.
+class OperationStats:
+
+    __slots__ = ('count', 'total', 'maximum', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+
+    # Registra una llamada que tardó 'elapsed' segundos.
+    def record(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.maximum:
+            self.maximum = elapsed
+        self.histogram[min(int(elapsed * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    # Devuelve el percentil 'fraction' (entre 0 y 1) estimado con el histograma: el límite superior
+    # del intervalo en que cae, en microsegundos.
+    def percentile(self, fraction):
+        wanted = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= wanted:
+                return min(float(1 << bucket), self.maximum * 1e6)
+        return self.maximum * 1e6
+
+    # Devuelve las mediciones como diccionario (tiempos en microsegundos).
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1e3,
+            'mean_us': self.total * 1e6 / self.count if self.count else 0.0,
+            'p50_us': self.percentile(0.5),
+            'p95_us': self.percentile(0.95),
+            'p99_us': self.percentile(0.99),
+            'max_us': self.maximum * 1e6,
+            # Límite superior de cada intervalo (en microsegundos) -> cantidad de llamadas.
+            'histogram': {1 << bucket: count for bucket, count in enumerate(self.histogram) if count},
+        }
+
+
+# Define la clase Instrumentation: las mediciones de todas las operaciones de un TaskManager (y de
+# los objetos asociados, como su almacenamiento o la interfaz).
+class Instrumentation:
+
+    def __init__(self):
+        # Nombre de la operación -> OperationStats.
+        self.operations = {}
+        # Archivo -> bytes escritos.
+        self.bytes_written = {}
+        # Nombre de la operación -> perfilador para su próxima ejecución (ver profile_next).
+        self.profilers = {}
+        # Métodos reemplazados: (objeto, nombre), para poder quitarlos (detach).
+        self.attached = []
+        self.lock = threading.Lock()
+
+    # Reemplaza los métodos 'names' de 'target' por versiones que miden. Cada operación se registra
+    # como 'prefix' + nombre del método.
+    def attach(self, target, names, prefix=''):
+        for name in names:
+            setattr(target, name, self.timed(prefix + name, getattr(target, name)))
+            self.attached.append((target, name))
+
+    # Quita todas las mediciones: los objetos vuelven a usar los métodos de su clase.
+    def detach(self):
+        for target, name in reversed(self.attached):
+            target.__dict__.pop(name, None)
+        self.attached = []
+
+    # Devuelve una versión de 'function' que registra su duración como la operación 'operation'.
+    # Los generadores (como la lectura de filas de un CSV) se miden mientras se recorren: se suma
+    # solo el tiempo que pasa dentro del generador, no el de quien procesa cada fila.
+    def timed(self, operation, function):
+        if isgeneratorfunction(function):
+            return self._timed_generator(operation, function)
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if self.profilers:
+                profiler = self._take_profiler(operation)
+                if profiler is not None:
+                    with profiler(operation):
+                        return self._call(operation, function, args, kwargs)
+            return self._call(operation, function, args, kwargs)
+        return wrapper
+
+    def _timed_generator(self, operation, function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            generator = function(*args, **kwargs)
+            elapsed = 0.0
+            try:
+                while True:
+                    start = perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        elapsed += perf_counter() - start
+                        return
+                    elapsed += perf_counter() - start
+                    yield item
+            finally:
+                generator.close()
+                self.record(operation, elapsed)
+        return wrapper
+
+    def _call(self, operation, function, args, kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.record(operation, perf_counter() - start)
+
+    # Registra una llamada a 'operation' que tardó 'elapsed' segundos.
+    def record(self, operation, elapsed):
+        with self.lock:
+            stats = self.operations.get(operation)
+            if stats is None:
+                stats = self.operations[operation] = OperationStats()
+            stats.record(elapsed)
+
+    # Suma 'count' bytes escritos en 'path'.
+    def add_bytes(self, path, count):
+        with self.lock:
+            self.bytes_written[path] = self.bytes_written.get(path, 0) + count
+
+    # Perfila la próxima ejecución de 'operation'. 'profiler' es una función que recibe el nombre de
+    # la operación y devuelve un bloque 'with' que la envuelve (por ejemplo, uno que inicie y detenga
+    # un perfilador por muestreo); por defecto se usa cProfile (ver cprofile). Las operaciones que
+    # son generadores (como 'storage.load_tasks') no se pueden perfilar: se perfila quien las recorre.
+    def profile_next(self, operation, profiler=None):
+        with self.lock:
+            self.profilers[operation] = profiler or cprofile()
+
+    def _take_profiler(self, operation):
+        with self.lock:
+            return self.profilers.pop(operation, None)
+
+    # Devuelve las mediciones: {'operations': {nombre: {...}}, 'bytes_written': {archivo: bytes}}.
+    def stats(self):
+        with self.lock:
+            return {
+                'operations': {name: stats.as_dict() for name, stats in sorted(self.operations.items())},
+                'bytes_written': dict(self.bytes_written),
+            }
+
+    # Borra las mediciones acumuladas.
+    def reset(self):
+        with self.lock:
+            self.operations = {}
+            self.bytes_written = {}
+
+    # Devuelve las mediciones como texto, una línea por operación (para la consola o la interfaz).
+    def report(self):
+        stats = self.stats()
+        lines = [f"{'operación':<32} {'llamadas':>9} {'total ms':>10} {'media us':>10} "
+                 f"{'p95 us':>9} {'máx us':>10}"]
+        for name, values in stats['operations'].items():
+            lines.append(f"{name:<32} {values['count']:>9} {values['total_ms']:>10.1f} "
+                         f"{values['mean_us']:>10.1f} {values['p95_us']:>9.0f} {values['max_us']:>10.0f}")
+        for path, count in sorted(stats['bytes_written'].items()):
+            lines.append(f"escrito en {path}: {count / 1024:.1f} KB")
+        return "\n".join(lines)
+
+
+# Devuelve un perfilador para profile_next que ejecuta la operación dentro de cProfile y, al
+# terminar, llama a 'callback' con el pstats.Stats resultante (por defecto imprime las 20
+# funciones con más tiempo acumulado).
+def cprofile(callback=None):
+    @contextmanager
+    def profiler(operation):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            stream = io.StringIO()
+            result = pstats.Stats(profile, stream=stream)
+            if callback is not None:
+                callback(result)
+            else:
+                result.sort_stats('cumulative').print_stats(20)
+                print(f"Perfil de {operation}:\n{stream.getvalue()}")
+    return profiler
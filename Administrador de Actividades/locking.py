@@ -0,0 +1,86 @@
+# Módulo de bloqueo entre procesos: un candado de archivo (advisory lock) para que varios procesos
+# que usan los mismos CSV no lean, modifiquen y guarden a la vez.
+#
+# En Linux y macOS se usa fcntl.flock sobre un archivo .lock junto a los datos; en Windows, donde
+# no existe fcntl, msvcrt.locking sobre el primer byte del mismo archivo. Dentro de un proceso el
+# candado es reentrante y también excluye a los demás hilos (por ejemplo, el hilo de escritura).
+
+# Importa os para el descriptor del archivo de bloqueo.
+import os
+
+# Importa threading para que dos hilos del mismo proceso no tomen el candado a la vez.
+import threading
+
+# fcntl solo existe en sistemas tipo Unix; en Windows se usa msvcrt.
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+# Define la clase FileLock, un candado exclusivo entre procesos basado en un archivo.
+class FileLock:
+
+    def __init__(self, path):
+        self.path = path
+        self.thread_lock = threading.RLock()
+        # Cuántas veces lo tomó el hilo que lo tiene; el archivo se desbloquea al llegar a cero.
+        self.depth = 0
+        # Archivo de bloqueo, abierto la primera vez que se toma el candado.
+        self.file = None
+
+    # Toma el candado, esperando si otro proceso o hilo lo tiene.
+    def acquire(self):
+        self.thread_lock.acquire()
+        if self.depth == 0:
+            try:
+                if self.file is None:
+                    self.file = open(self.path, mode='a+b')
+                self._lock_file()
+            except BaseException:
+                self.thread_lock.release()
+                raise
+        self.depth += 1
+
+    # Suelta el candado.
+    def release(self):
+        self.depth -= 1
+        if self.depth == 0:
+            self._unlock_file()
+        self.thread_lock.release()
+
+    def _lock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            return
+        # msvcrt.locking con LK_LOCK reintenta durante unos 10 segundos y luego falla; se sigue
+        # esperando mientras otro proceso tenga el candado.
+        os.lseek(self.file.fileno(), 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue
+
+    def _unlock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+        else:
+            os.lseek(self.file.fileno(), 0, os.SEEK_SET)
+            msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    # Cierra el archivo de bloqueo (si nadie tiene el candado).
+    def close(self):
+        with self.thread_lock:
+            if self.depth == 0 and self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,104 @@
+# Módulo de persistencia diferida: escribe los cambios de TaskManager desde un hilo aparte.
+#
+# Con WriteBehind las mutaciones actualizan la memoria y vuelven enseguida; los cambios se
+# acumulan y un hilo de trabajo los escribe todos juntos después de una breve espera, así que
+# varios clics seguidos se traducen en una sola escritura y la interfaz no espera al disco.
+
+# Importa atexit para escribir los cambios pendientes al terminar el programa.
+import atexit
+
+# Importa queue para entregar los errores de escritura al hilo de la interfaz.
+import queue
+
+# Importa threading para el hilo de trabajo.
+import threading
+
+# Tiempo de espera por defecto (en segundos) antes de escribir, para agrupar cambios.
+WRITE_BEHIND_DELAY = 0.25
+
+
+# Define la clase WriteBehind, que persiste en segundo plano los cambios de un TaskManager.
+class WriteBehind:
+
+    def __init__(self, manager, delay=WRITE_BEHIND_DELAY, on_error=None):
+        self.manager = manager
+        self.delay = delay
+
+        # Función opcional que se llama (desde el hilo de trabajo) con cada error de escritura.
+        self.on_error = on_error
+
+        # Errores de escritura pendientes de mostrar. La interfaz los consulta con root.after.
+        self.errors = queue.Queue()
+
+        # Cambios (operación, tipo, objeto) pendientes de escribir.
+        self.changes = []
+
+        # 'condition' protege 'changes' y avisa al hilo; 'io_lock' evita dos escrituras a la vez.
+        self.condition = threading.Condition()
+        self.io_lock = threading.Lock()
+
+        # 'dirty' indica que llegaron cambios nuevos desde la última escritura.
+        self.dirty = False
+        self.closed = False
+
+        self.thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self.thread.start()
+        atexit.register(self.close)
+
+    # Agrega cambios a la cola de escritura y despierta al hilo.
+    def submit(self, changes):
+        with self.condition:
+            self.changes.extend(changes)
+            self.dirty = True
+            self.condition.notify()
+
+    # Saca de la cola los cambios que esperan, para escribirlos junto con los que se están escribiendo.
+    def take(self):
+        with self.condition:
+            changes, self.changes = self.changes, []
+        return changes
+
+    # Indica si hay cambios sin escribir o una escritura en curso.
+    def pending(self):
+        with self.condition:
+            return bool(self.changes) or self.io_lock.locked()
+
+    # Bucle del hilo de trabajo: espera cambios, deja pasar 'delay' segundos para agrupar los que
+    # lleguen enseguida y los escribe.
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.dirty or self.closed)
+                if self.closed:
+                    return
+                self.condition.wait_for(lambda: self.closed, timeout=self.delay)
+                self.dirty = False
+            self.flush()
+
+    # Escribe ahora todos los cambios pendientes. Si la escritura falla, los cambios vuelven a la
+    # cola (se reintentan con el próximo cambio o al cerrar) y el error se informa.
+    def flush(self):
+        with self.io_lock:
+            with self.condition:
+                changes, self.changes = self.changes, []
+            if not changes:
+                return
+            try:
+                self.manager.write_changes(changes)
+            except Exception as error:
+                with self.condition:
+                    self.changes[:0] = changes
+                self.errors.put(error)
+                if self.on_error is not None:
+                    self.on_error(error)
+
+    # Detiene el hilo y escribe lo que quede pendiente.
+    def close(self):
+        with self.condition:
+            if self.closed:
+                return
+            self.closed = True
+            self.condition.notify()
+        atexit.unregister(self.close)
+        self.thread.join()
+        self.flush()
@@ -0,0 +1,279 @@
+# Módulo de búsqueda: índice invertido de las palabras de los títulos de tareas y sub-tareas.
+#
+# Cada título se normaliza (minúsculas y sin acentos: "Revisión" y "revision" son la misma palabra)
+# y se divide en palabras. El índice guarda, para cada palabra, las claves de los elementos cuyo
+# título la contiene, y además una lista ordenada de todas las palabras: las que empiezan con un
+# prefijo forman un tramo contiguo de esa lista y se encuentran con una búsqueda binaria.
+#
+# Para ocupar poca memoria con muchos títulos, las claves de una palabra se guardan en una tupla
+# si es una sola (el caso de los números y las palabras raras) o en un array('q') ordenado si son
+# varias. Las dos son secuencias ordenadas: se recorren, cuentan y cruzan con funciones en C.
+
+# Importa array para guardar las claves de cada palabra de forma compacta.
+from array import array
+
+# Importa bisect para buscar prefijos en la lista ordenada de palabras y claves en cada array.
+from bisect import bisect_left, insort
+
+# Importa lru_cache para no volver a quitar los acentos de las palabras que se repiten.
+from functools import lru_cache
+
+# Importa chain para recorrer como una sola secuencia las claves de varias palabras.
+from itertools import chain
+
+# Importa re para dividir los títulos en palabras.
+import re
+
+# Importa unicodedata para quitar los acentos.
+import unicodedata
+
+# Expresión que reconoce una palabra (letras, dígitos y guion bajo, en cualquier idioma).
+WORD = re.compile(r'\w+')
+
+# Carácter mayor que cualquier otro: prefijo + TOP es el final del tramo de palabras con ese prefijo.
+TOP = '\U0010ffff'
+
+# Las palabras nuevas se agregan a una lista ordenada pequeña, que se une a la principal cuando
+# supera este tamaño; así agregar una palabra no desplaza toda la lista principal.
+RECENT_LIMIT = 1024
+
+# Al cruzar los candidatos con otra palabra de la consulta que tiene más de CHECK_RATIO veces sus
+# claves, conviene confirmar cada candidato con su título en lugar de recorrer todas esas claves.
+CHECK_RATIO = 50
+
+# Una palabra de la consulta que es el comienzo de más de BROAD_PREFIX palabras del índice (por
+# ejemplo un solo dígito, que empieza miles de números) es amplia: juntar todas sus claves costaría
+# decenas de milisegundos. Si es la única palabra, sus claves se recorren de a poco hasta llegar al
+# límite de resultados; si no, se decide con la cantidad de palabras si conviene cruzarla o
+# confirmarla con el título de los candidatos de las demás.
+BROAD_PREFIX = 1000
+
+
+# Quita los acentos y otras marcas diacríticas de una palabra ya en minúsculas.
+@lru_cache(maxsize=65536)
+def _fold(word):
+    decomposed = unicodedata.normalize('NFKD', word)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+# Devuelve las palabras normalizadas de un texto, sin repetir.
+def tokenize(text):
+    text = text.casefold()
+    if text.isascii():
+        return set(WORD.findall(text))
+    return {word if word.isascii() else _fold(word) for word in WORD.findall(text)}
+
+
+# Indica si un título tiene, para cada prefijo, alguna palabra que empieza con él.
+def _title_matches(title, prefixes):
+    words = tokenize(title)
+    return all(any(word.startswith(prefix) for word in words) for prefix in prefixes)
+
+
+# Indica si una clave está en una secuencia ordenada de claves.
+def _contains(keys, key):
+    position = bisect_left(keys, key)
+    return position < len(keys) and keys[position] == key
+
+
+# Define la clase SearchIndex, el índice invertido palabra -> claves.
+#
+# Las claves son enteros que elige quien usa el índice (TaskManager codifica el tipo y el id).
+# El índice no guarda los títulos: search() recibe una función que devuelve el título de una
+# clave para confirmar los candidatos cuando la consulta tiene varias palabras muy generales.
+class SearchIndex:
+
+    def __init__(self):
+        # Palabra -> tupla con su única clave o array('q') ordenado de claves.
+        self.postings = {}
+
+        # Palabras del índice, ordenadas: la lista principal y la de palabras agregadas hace poco.
+        # Las palabras que se quedan sin claves siguen en las listas hasta la próxima reorganización
+        # (stale cuenta cuántas hay) y se saltan al buscar.
+        self.tokens = []
+        self.recent = []
+        self.stale = 0
+
+    # Construye el índice de una vez a partir de pares (clave, título).
+    @classmethod
+    def build(cls, items):
+        index = cls()
+        postings = index.postings
+        for key, title in items:
+            for token in tokenize(title):
+                keys = postings.get(token)
+                if keys is None:
+                    postings[token] = [key]
+                else:
+                    keys.append(key)
+        for token, keys in postings.items():
+            keys.sort()
+            postings[token] = (keys[0],) if len(keys) == 1 else array('q', keys)
+        index._reorganize()
+        return index
+
+    # Agrega un título al índice.
+    def add(self, key, title):
+        postings = self.postings
+        for token in tokenize(title):
+            keys = postings.get(token)
+            if keys is None:
+                postings[token] = (key,)
+                if _contains(self.tokens, token) or _contains(self.recent, token):
+                    self.stale -= 1
+                else:
+                    insort(self.recent, token)
+                    if len(self.recent) > RECENT_LIMIT:
+                        self._reorganize()
+            elif _contains(keys, key):
+                continue
+            elif isinstance(keys, tuple):
+                postings[token] = array('q', sorted(keys + (key,)))
+            else:
+                keys.insert(bisect_left(keys, key), key)
+
+    # Quita un título del índice. Las palabras que quedan sin claves se eliminan.
+    def remove(self, key, title):
+        postings = self.postings
+        for token in tokenize(title):
+            keys = postings.get(token)
+            if keys is None or not _contains(keys, key):
+                continue
+            if len(keys) == 1:
+                del postings[token]
+                self.stale += 1
+                if self.stale > RECENT_LIMIT and self.stale > len(postings):
+                    self._reorganize()
+            else:
+                del keys[bisect_left(keys, key)]
+                if len(keys) == 1:
+                    postings[token] = (keys[0],)
+
+    # Vuelve a armar la lista principal con todas las palabras que tienen claves.
+    def _reorganize(self):
+        self.tokens = sorted(self.postings)
+        self.recent = []
+        self.stale = 0
+
+    def __len__(self):
+        return len(self.postings)
+
+    # Devuelve las secuencias de claves de las palabras que empiezan con 'prefix'.
+    def _postings(self, prefix):
+        found = []
+        for tokens in (self.tokens, self.recent):
+            start, end = bisect_left(tokens, prefix), bisect_left(tokens, prefix + TOP)
+            found.extend(filter(None, map(self.postings.get, tokens[start:end])))
+        return found
+
+    # Como _postings, pero entrega las secuencias a medida que se piden.
+    def _iter_postings(self, prefix):
+        for tokens in (self.tokens, self.recent):
+            start, end = bisect_left(tokens, prefix), bisect_left(tokens, prefix + TOP)
+            for position in range(start, end):
+                keys = self.postings.get(tokens[position])
+                if keys:
+                    yield keys
+
+    # Cantidad de palabras del índice que empiezan con 'prefix' (sin contar las que quedaron sin claves).
+    def _token_count(self, prefix):
+        return sum(bisect_left(tokens, prefix + TOP) - bisect_left(tokens, prefix)
+                   for tokens in (self.tokens, self.recent))
+
+    # Devuelve hasta 'limit' claves (todas si limit es None) cuyos títulos tienen, para cada palabra
+    # de la consulta, alguna palabra que empieza con ella.
+    def search(self, query, title_of, limit=None):
+        prefixes = list(tokenize(query))
+        if not prefixes or limit == 0:
+            return []
+
+        # Una sola palabra amplia (ver BROAD_PREFIX) no se expande: se recorren sus claves de a poco
+        # hasta juntar 'limit'.
+        counts = {prefix: self._token_count(prefix) for prefix in prefixes}
+        if len(prefixes) == 1 and counts[prefixes[0]] > BROAD_PREFIX:
+            return self._collect(self._iter_postings(prefixes[0]), limit)
+
+        # Claves de cada palabra de la consulta, de la que tiene menos a la que tiene más. Las
+        # palabras amplias se dejan para después, salvo que todas lo sean.
+        broad = sorted((prefix for prefix in prefixes if counts[prefix] > BROAD_PREFIX), key=counts.get)
+        if len(broad) == len(prefixes):
+            broad = broad[1:]
+        matches = []
+        for prefix in prefixes:
+            if prefix in broad:
+                continue
+            postings = self._postings(prefix)
+            if not postings:
+                return []
+            matches.append((sum(map(len, postings)), prefix, postings))
+        matches.sort(key=lambda match: match[0])
+
+        # Con una sola palabra basta recorrer sus claves hasta juntar 'limit'.
+        if len(matches) == 1 and not broad:
+            return self._collect(matches[0][2], limit)
+
+        # Con varias, se parte de la palabra con menos claves y se cruza con las demás. Las que tienen
+        # muchas más claves que los candidatos se confirman al final con el título de cada candidato.
+        # Las amplias tienen al menos tantas claves como palabras, así que se decide sin expandirlas.
+        candidates = set(chain.from_iterable(matches[0][2]))
+        pending = []
+        for prefix in broad:
+            if counts[prefix] > CHECK_RATIO * len(candidates):
+                pending.append(prefix)
+            else:
+                matches.append((counts[prefix], prefix, self._postings(prefix)))
+        for count, prefix, postings in matches[1:]:
+            if count > CHECK_RATIO * len(candidates):
+                pending.append(prefix)
+            else:
+                candidates = candidates.intersection(chain.from_iterable(postings))
+
+        results = []
+        for key in sorted(candidates):
+            if pending and not _title_matches(title_of(key), pending):
+                continue
+            results.append(key)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    # Devuelve hasta 'limit' claves distintas de varias secuencias, en orden.
+    @staticmethod
+    def _collect(postings, limit):
+        results = []
+        seen = set()
+        for key in chain.from_iterable(postings):
+            if key not in seen:
+                seen.add(key)
+                results.append(key)
+                if limit is not None and len(results) >= limit:
+                    break
+        return results
+
+
+# Define la clase PendingSearchIndex, que ocupa el lugar del índice mientras se construye en otro
+# hilo (ver TaskManager.start_search_index). Anota las altas y bajas que llegan mientras tanto, para
+# aplicarlas al índice terminado antes de usarlo.
+class PendingSearchIndex:
+
+    def __init__(self):
+        self.changes = []
+        # Índice terminado por el hilo, todavía sin las altas y bajas anotadas; None mientras se construye.
+        self.index = None
+
+    def add(self, key, title):
+        self.changes.append((True, key, title))
+
+    def remove(self, key, title):
+        self.changes.append((False, key, title))
+
+    # Aplica al índice terminado las altas y bajas anotadas y lo devuelve.
+    def finish(self):
+        index = self.index
+        for added, key, title in self.changes:
+            if added:
+                index.add(key, title)
+            else:
+                index.remove(key, title)
+        self.changes = []
+        return index
@@ -0,0 +1,587 @@
+# Servicio HTTP local: comparte una misma lista de actividades entre varias personas. Un solo
+# proceso tiene el TaskManager y lo ofrece como una API JSON; la interfaz gráfica puede usarlo
+# como cliente (ver client.py e index_gui.py --server) en lugar de abrir su propia copia de los CSV.
+#
+# Uso (desde la carpeta de la aplicación):
+#   python -m server [--host 127.0.0.1] [--port 8765] [--instrument] [opciones de almacenamiento de cli]
+#
+# Rutas:
+#   GET    /tasks?offset=0&limit=100     página de tareas; con subtasks=1 incluye sus sub-tareas,
+#                                        con search=texto y status=pending|done las filtra
+#   GET    /tasks/ID                     una tarea con sus sub-tareas y su progreso
+#   GET    /changes?since=REVISIÓN       cambios posteriores a una revisión (410 si ya no se guardan)
+#   GET    /stats                        mediciones de la instrumentación (con --instrument)
+#   POST   /tasks                        {"title": ...} agrega una tarea
+#   POST   /tasks/ID/subtasks            {"title": ...} agrega una sub-tarea
+#   POST   /tasks/ID/toggle              {"completed": true|false} marca o desmarca; sin cuerpo,
+#   POST   /subtasks/ID/toggle           invierte el estado
+#   DELETE /tasks/ID, /subtasks/ID       elimina (una tarea, con sus sub-tareas)
+#   POST   /batch                        {"operations": [...], "keep_going": false}, ver run_operation
+#
+# Las lecturas se responden desde el bucle de eventos. Las mutaciones pasan por una cola que
+# atiende un único escritor: toma todas las que esperan, las aplica en memoria dentro de un bloque
+# batch() y las entrega juntas al hilo de escritura de TaskManager, que las guarda con una sola
+# escritura. Mientras se escribe, las que llegan forman el grupo siguiente. Cada respuesta se envía
+# cuando su grupo quedó guardado.
+#
+# Cada grupo aplicado suma una revisión. Las respuestas de lectura llevan la revisión en su ETag:
+# con If-None-Match igual se responde 304 sin recorrer nada. Los cambios de las últimas revisiones
+# se guardan como registros del diario (ver TaskManager.apply_records), así los clientes se ponen
+# al día con GET /changes sin volver a descargar la lista.
+
+# Importa argparse para las opciones de la línea de comandos.
+import argparse
+
+# Importa asyncio para el servidor y la cola de escritura.
+import asyncio
+
+# Importa deque para el registro de cambios recientes.
+from collections import deque
+
+# Importa HTTPStatus para el texto de los códigos de respuesta.
+from http import HTTPStatus
+
+# Importa islice para paginar sin copiar la lista de tareas.
+from itertools import islice
+
+# Importa json para los cuerpos de las peticiones y respuestas.
+import json
+
+# Importa queue para leer los errores del hilo de escritura.
+import queue
+
+# Importa re para las rutas.
+import re
+
+# Importa time para la revisión inicial.
+import time
+
+# Importa las funciones de urllib.parse para la ruta y los parámetros de la URL.
+from urllib.parse import parse_qs, urlsplit
+
+# Importa las operaciones de la línea de comandos, que validan igual que en el modo batch.
+from cli import (LAST_TASK, CommandError, add, add_storage_options, complete, delete, item_to_json,
+                 items_to_json, open_manager, select_items)
+
+# Importa CsvStorage y FileWatcher para aplicar los cambios que otro programa haga en los CSV.
+from storage import CsvStorage
+from watcher import WATCH_INTERVAL_MS, FileWatcher
+
+# Puerto por defecto.
+DEFAULT_PORT = 8765
+
+# Tamaño de página por defecto y máximo de GET /tasks.
+PAGE_LIMIT = 100
+MAX_PAGE_LIMIT = 1000
+
+# Cantidad de revisiones cuyos cambios se guardan para GET /changes.
+CHANGE_LOG_LIMIT = 10_000
+
+# Cantidad máxima de peticiones que se aplican en un mismo grupo.
+GROUP_LIMIT = 1000
+
+# Tamaño máximo de las cabeceras y del cuerpo de una petición, en bytes.
+MAX_HEADER_SIZE = 64 * 1024
+MAX_BODY_SIZE = 16 * 1024 * 1024
+
+
+# Error que se responde al cliente con un código HTTP y un mensaje.
+class HttpError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# Una petición de modificación que espera en la cola del escritor. Una operación que falla no
+# cambia nada (valida antes de modificar), salvo las de /batch, que pueden fallar a mitad
+# ('atomic' pide deshacer entonces los cambios que alcanzó a hacer, ver TaskService.apply_group).
+class Mutation:
+
+    def __init__(self, function, args, atomic=False):
+        self.function = function
+        self.args = args
+        self.atomic = atomic
+        self.future = asyncio.get_running_loop().create_future()
+        self.result = None
+        self.records = []
+
+
+# Convierte un cambio (operación, tipo, objeto) en un registro como los del diario:
+# [operación, tipo, id, task_id, título, completada].
+def change_record(op, kind, item):
+    task_id = item.task_id if kind == 'subtask' else None
+    if op == 'del':
+        return [op, kind, item.id, task_id, None, None]
+    return [op, kind, item.id, task_id, item.title if op == 'add' else None, bool(item.completed)]
+
+
+# Convierte una tarea en un diccionario con su progreso y, si se pide, sus sub-tareas.
+def task_to_json(manager, task, with_subtasks=False):
+    row = item_to_json(task)
+    row['progress'] = list(manager.task_progress(task.id))
+    if with_subtasks:
+        row['subtasks'] = items_to_json(manager.subtasks_for(task.id))
+    return row
+
+
+# Devuelve un parámetro entero de la URL, o 'default' si no está.
+def int_param(query, name, default, minimum=0):
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[0])
+    except ValueError:
+        raise HttpError(400, f"Parámetro inválido: {name}={values[0]!r}") from None
+    if value < minimum:
+        raise HttpError(400, f"Parámetro inválido: {name}={value}")
+    return value
+
+
+# Devuelve el título de un cuerpo {"title": ...}.
+def title_of(data):
+    title = data.get('title')
+    if not isinstance(title, str):
+        raise HttpError(400, "Falta el título")
+    return title
+
+
+# Busca una tarea o sub-tarea y responde 404 si no existe.
+def find(manager, item_id, subtask=False):
+    item = manager.get_subtask(item_id) if subtask else manager.get_task(item_id)
+    if item is None:
+        raise HttpError(404, f"No existe la {'sub-tarea' if subtask else 'tarea'} {item_id}")
+    return item
+
+
+# Aplica una operación de /batch. Los campos son los de los comandos del modo batch de cli.py:
+#   {"op": "add", "title": ..., "parent": ID | "$"}   ('$': la última tarea agregada en el lote)
+#   {"op": "complete", "id": ID, "subtask": false, "undo": false}
+#   {"op": "delete", "id": ID, "subtask": false}
+# Devuelve el elemento agregado, o None.
+def run_operation(manager, operation, state):
+    if not isinstance(operation, dict):
+        raise CommandError("Cada operación debe ser un objeto")
+    op = operation.get('op')
+    if op == 'add':
+        parent = operation.get('parent')
+        if parent == LAST_TASK:
+            parent = state.get('task')
+            if parent is None:
+                raise CommandError("'$' no se refiere a ninguna tarea: todavía no se agregó ninguna")
+        elif parent is not None and not isinstance(parent, int):
+            raise CommandError(f"Id inválido: {parent!r}")
+        title = operation.get('title')
+        item = add(manager, title if isinstance(title, str) else '', parent)
+        if parent is None:
+            state['task'] = item.id
+        return item
+    item_id = operation.get('id')
+    if op not in ('complete', 'delete') or not isinstance(item_id, int):
+        raise CommandError(f"Operación inválida: {operation!r}")
+    if op == 'complete':
+        complete(manager, item_id, bool(operation.get('subtask')), bool(operation.get('undo')))
+    else:
+        delete(manager, item_id, bool(operation.get('subtask')))
+    return None
+
+
+# Define la clase TaskService: el TaskManager compartido, su escritor y el registro de cambios.
+class TaskService:
+
+    def __init__(self, manager):
+        self.manager = manager
+
+        # Las escrituras se hacen en el hilo de escritura de TaskManager; el escritor de la cola
+        # las fuerza con flush() al terminar cada grupo.
+        self.writer = manager.start_write_behind()
+
+        # Revisión actual y cambios de las últimas revisiones: (revisión, registros). Los cambios
+        # posteriores a 'log_start' están todos en 'log'. La primera revisión sale del reloj (en
+        # milisegundos): después de reiniciar el servicio, las revisiones y ETags que tengan los
+        # clientes no coinciden con las nuevas.
+        self.revision = self.log_start = int(time.time() * 1000)
+        self.log = deque()
+
+        # Veces que TaskManager se puso al día con lo que guardó otro proceso (ver _catch_up): si
+        # cambia, los clientes deben volver a cargar todo.
+        self.external_updates = manager.external_updates
+
+        self.watcher = FileWatcher(manager) if isinstance(manager.storage, CsvStorage) else None
+        self.queue = None
+        self.tasks = []
+
+        # Rutas: (método, expresión, función).
+        self.routes = [
+            ('GET', re.compile(r'/tasks'), self.list_tasks),
+            ('GET', re.compile(r'/tasks/(\d+)'), self.get_task),
+            ('GET', re.compile(r'/changes'), self.get_changes),
+            ('GET', re.compile(r'/stats'), self.get_stats),
+            ('POST', re.compile(r'/tasks'), self.post_task),
+            ('POST', re.compile(r'/tasks/(\d+)/subtasks'), self.post_subtask),
+            ('POST', re.compile(r'/(tasks|subtasks)/(\d+)/toggle'), self.post_toggle),
+            ('DELETE', re.compile(r'/(tasks|subtasks)/(\d+)'), self.delete_item),
+            ('POST', re.compile(r'/batch'), self.post_batch),
+        ]
+
+    # Empieza a escuchar. Devuelve el asyncio.Server.
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        self.queue = asyncio.Queue()
+        self.tasks = [asyncio.create_task(self.write_loop())]
+        if self.watcher is not None:
+            self.tasks.append(asyncio.create_task(self.watch_loop()))
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_SIZE)
+
+    # Detiene el escritor y la vigilancia de los archivos.
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+
+    # ---- Conexiones HTTP ----
+
+    # Atiende una conexión: lee peticiones una tras otra (HTTP/1.1 las mantiene abiertas).
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    writer.write(self.response(431, {'error': "Cabeceras demasiado grandes"}, close=True))
+                    break
+                try:
+                    method, target, version, headers = self.parse_head(head)
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    writer.write(self.response(400, {'error': "Petición inválida"}, close=True))
+                    break
+                if not 0 <= length <= MAX_BODY_SIZE:
+                    writer.write(self.response(413, {'error': "Cuerpo demasiado grande"}, close=True))
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+                status, payload, extra = await self.dispatch(method, target, headers, body)
+                writer.write(self.response(status, payload, extra, close=not keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    # Separa la línea de petición y las cabeceras (con el nombre en minúsculas).
+    @staticmethod
+    def parse_head(head):
+        request_line, *lines = head.decode('latin-1').split('\r\n')
+        method, target, version = request_line.split(' ')
+        headers = {}
+        for line in lines:
+            if line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        return method, target, version, headers
+
+    # Arma una respuesta HTTP con un cuerpo JSON (o sin cuerpo, si 'payload' es None).
+    @staticmethod
+    def response(status, payload, extra=None, close=False):
+        body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        lines = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}"]
+        if payload is not None:
+            lines.append("Content-Type: application/json; charset=utf-8")
+        lines.append(f"Content-Length: {len(body)}")
+        for name, value in (extra or {}).items():
+            lines.append(f"{name}: {value}")
+        if close:
+            lines.append("Connection: close")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + body
+
+    # Busca la ruta y llama a su función. Devuelve (código, cuerpo, cabeceras adicionales).
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        allowed = []
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(url.path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed.append(route_method)
+                continue
+            try:
+                data = json.loads(body) if body else {}
+                if not isinstance(data, dict):
+                    raise HttpError(400, "El cuerpo debe ser un objeto JSON")
+                return await handler(match, parse_qs(url.query), headers, data)
+            except HttpError as error:
+                return error.status, {'error': str(error)}, None
+            except CommandError as error:
+                return 400, {'error': str(error)}, None
+            except ValueError:
+                return 400, {'error': "El cuerpo no es JSON válido"}, None
+        if allowed:
+            return 405, {'error': "Método no permitido"}, {'Allow': ', '.join(allowed)}
+        return 404, {'error': f"Ruta desconocida: {url.path}"}, None
+
+    # Devuelve la ETag de las lecturas: cambia con cada revisión.
+    def etag(self):
+        return f'"{self.revision}"'
+
+    # Responde 304 si el cliente ya tiene la revisión actual. Si no, devuelve la respuesta de 'read'.
+    def conditional(self, headers, read):
+        etag = self.etag()
+        if headers.get('if-none-match') == etag:
+            return 304, None, {'ETag': etag}
+        with self.manager.lock:
+            payload = read()
+        payload['revision'] = self.revision
+        return 200, payload, {'ETag': etag}
+
+    # ---- Lecturas ----
+
+    async def list_tasks(self, match, query, headers, data):
+        offset = int_param(query, 'offset', 0)
+        limit = min(int_param(query, 'limit', PAGE_LIMIT, minimum=1), MAX_PAGE_LIMIT)
+        with_subtasks = query.get('subtasks', ['0'])[0] not in ('', '0', 'false')
+        search = query.get('search', [''])[0].strip()
+        status = query.get('status', [None])[0]
+        if status not in (None, 'pending', 'done'):
+            raise HttpError(400, f"Parámetro inválido: status={status!r}")
+        manager = self.manager
+
+        def read():
+            if search or status:
+                tasks = select_items(manager, search or None, status)
+                total, page = len(tasks), tasks[offset:offset + limit]
+            else:
+                total = len(manager.task_index)
+                page = list(islice(manager.task_index.values(), offset, offset + limit))
+            return {
+                'items': [task_to_json(manager, task, with_subtasks) for task in page],
+                'offset': offset,
+                'limit': limit,
+                'total': total,
+                'next': offset + limit if offset + limit < total else None,
+            }
+        return self.conditional(headers, read)
+
+    async def get_task(self, match, query, headers, data):
+        task_id = int(match.group(1))
+        return self.conditional(headers, lambda: {'task': task_to_json(
+            self.manager, find(self.manager, task_id), with_subtasks=True)})
+
+    async def get_changes(self, match, query, headers, data):
+        since = int_param(query, 'since', 0)
+        if since > self.revision:
+            raise HttpError(400, f"La revisión {since} todavía no existe")
+        if since < self.log_start:
+            raise HttpError(410, "Esos cambios ya no se guardan: hay que volver a cargar la lista")
+        changes = [record for revision, records in self.log if revision > since for record in records]
+        return 200, {'revision': self.revision, 'changes': changes}, None
+
+    async def get_stats(self, match, query, headers, data):
+        return 200, self.manager.stats(), None
+
+    # ---- Modificaciones ----
+
+    async def post_task(self, match, query, headers, data):
+        return await self.submit(self._add_task, title_of(data))
+
+    async def post_subtask(self, match, query, headers, data):
+        return await self.submit(self._add_subtask, int(match.group(1)), title_of(data))
+
+    async def post_toggle(self, match, query, headers, data):
+        completed = data.get('completed')
+        if completed is not None and not isinstance(completed, bool):
+            raise HttpError(400, "'completed' debe ser true o false")
+        return await self.submit(self._toggle, match.group(1) == 'subtasks', int(match.group(2)), completed)
+
+    async def delete_item(self, match, query, headers, data):
+        return await self.submit(self._delete, match.group(1) == 'subtasks', int(match.group(2)))
+
+    async def post_batch(self, match, query, headers, data):
+        operations = data.get('operations')
+        if not isinstance(operations, list):
+            raise HttpError(400, "Falta la lista 'operations'")
+        keep_going = bool(data.get('keep_going'))
+        return await self.submit(self._batch, operations, keep_going, atomic=not keep_going)
+
+    # Las funciones de las modificaciones se ejecutan en el escritor, dentro del bloque batch() del
+    # grupo. Devuelven (código, cuerpo).
+    def _add_task(self, manager, title):
+        return 201, {'task': task_to_json(manager, add(manager, title))}
+
+    def _add_subtask(self, manager, task_id, title):
+        find(manager, task_id)
+        return 201, {'subtask': item_to_json(add(manager, title, task_id))}
+
+    def _toggle(self, manager, subtask, item_id, completed):
+        item = find(manager, item_id, subtask)
+        if completed is None:
+            completed = not item.completed
+        complete(manager, item_id, subtask, undo=not completed)
+        item = find(manager, item_id, subtask)
+        return 200, {'subtask' if subtask else 'task': item_to_json(item)}
+
+    def _delete(self, manager, subtask, item_id):
+        find(manager, item_id, subtask)
+        delete(manager, item_id, subtask)
+        return 200, {}
+
+    def _batch(self, manager, operations, keep_going):
+        results, errors = [], []
+        state = {}
+        for number, operation in enumerate(operations):
+            try:
+                item = run_operation(manager, operation, state)
+            except CommandError as error:
+                if not keep_going:
+                    raise CommandError(f"operación {number}: {error}") from None
+                errors.append({'index': number, 'error': str(error)})
+                results.append(None)
+            else:
+                results.append(item_to_json(item) if item is not None else None)
+        return 200, {'results': results, 'errors': errors}
+
+    # Encola una modificación y espera a que quede guardada.
+    async def submit(self, function, *args, atomic=False):
+        mutation = Mutation(function, args, atomic)
+        await self.queue.put(mutation)
+        status, payload = await mutation.future
+        payload['revision'] = self.revision
+        payload['changes'] = mutation.records
+        return status, payload, None
+
+    # El escritor: toma los grupos de la cola, los aplica y los guarda.
+    async def write_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            group = [await self.queue.get()]
+            while len(group) < GROUP_LIMIT and not self.queue.empty():
+                group.append(self.queue.get_nowait())
+
+            self.apply_group(group)
+            # Se escribe en un hilo: mientras tanto el bucle sigue respondiendo lecturas y
+            # encolando las modificaciones que formarán el grupo siguiente.
+            error = await loop.run_in_executor(None, self.flush)
+            self.check_external_updates()
+            for mutation in group:
+                if mutation.future.done():
+                    continue
+                if error is not None:
+                    mutation.future.set_exception(HttpError(
+                        503, f"No se pudieron guardar los cambios; se reintentará: {error}"))
+                else:
+                    mutation.future.set_result(mutation.result)
+
+    # Aplica en memoria las modificaciones de un grupo, en un solo bloque batch(). Un lote atómico
+    # se aplica dentro de TaskManager.atomic(): si una operación falla a mitad, se deshacen en
+    # memoria solo los cambios de ese lote, en proporción a lo que cambió, y el resto del grupo sigue.
+    # Así un lote inválido no bloquea el bucle de eventos volviendo a cargar todo.
+    def apply_group(self, group):
+        manager = self.manager
+        try:
+            with manager.batch():
+                for mutation in group:
+                    start = len(manager.pending_changes)
+                    try:
+                        if mutation.atomic:
+                            with manager.atomic():
+                                mutation.result = mutation.function(manager, *mutation.args)
+                        else:
+                            mutation.result = mutation.function(manager, *mutation.args)
+                    except (HttpError, CommandError) as error:
+                        mutation.future.set_exception(error)
+                        continue
+                    mutation.records = [change_record(*change) for change in manager.pending_changes[start:]]
+        except Exception as error:
+            # Un error inesperado deja el grupo sin aplicar (batch() ya volvió a lo guardado).
+            for mutation in group:
+                if not mutation.future.done():
+                    mutation.future.set_exception(error)
+            return
+
+        records = [record for mutation in group if not mutation.future.done() for record in mutation.records]
+        if records:
+            self.add_revision(records)
+
+    # Escribe lo pendiente. Devuelve el error si no se pudo (los cambios siguen en la cola del hilo
+    # de escritura y se reintentan).
+    def flush(self):
+        self.writer.flush()
+        if not self.writer.changes:
+            return None
+        try:
+            return self.writer.errors.get_nowait()
+        except queue.Empty:
+            return "error de escritura"
+
+    # Agrega una revisión con sus registros, descartando las más antiguas.
+    def add_revision(self, records):
+        self.revision += 1
+        self.log.append((self.revision, records))
+        if len(self.log) > CHANGE_LOG_LIMIT:
+            self.log_start = self.log.popleft()[0]
+
+    # Si TaskManager volvió a cargar todo (otro proceso había guardado), los registros anteriores
+    # ya no alcanzan para ponerse al día: se empieza una revisión sin registros.
+    def check_external_updates(self):
+        if self.manager.external_updates != self.external_updates:
+            self.external_updates = self.manager.external_updates
+            self.revision += 1
+            self.log.clear()
+            self.log_start = self.revision
+
+    # Aplica periódicamente los cambios que otro programa hace en los archivos.
+    async def watch_loop(self):
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL_MS / 1000)
+            self.check_external_updates()
+            try:
+                changes = self.watcher.poll()
+            except (OSError, ValueError):
+                continue
+            if changes:
+                self.add_revision([change_record(*change) for change in changes])
+
+
+# Ejecuta el servicio hasta que se interrumpa.
+async def serve(manager, host, port):
+    service = TaskService(manager)
+    server = await service.start(host, port)
+    address = server.sockets[0].getsockname()
+    print(f"Escuchando en http://{address[0]}:{address[1]}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m server',
+                                     description="Comparte la lista de actividades a través de HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="dirección donde escuchar (por defecto: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                        help="puerto (por defecto: %(default)s; 0 elige uno libre)")
+    parser.add_argument('--instrument', action='store_true', help="medir las operaciones (ver GET /stats)")
+    add_storage_options(parser)
+    args = parser.parse_args(argv)
+    manager = open_manager(args)
+    if args.instrument:
+        manager.enable_instrumentation()
+    try:
+        asyncio.run(serve(manager, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+
+
+if __name__ == "__main__":
+    main()
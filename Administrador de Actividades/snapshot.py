@@ -0,0 +1,203 @@
+# Módulo de instantánea binaria: una copia de tasks.csv y subtasks.csv en un formato que se carga
+# sin interpretar texto. Los CSV siguen siendo el formato de intercambio; la instantánea (archivo
+# .snap junto a ellos) solo acelera el arranque y se vuelve a generar cuando un CSV es más nuevo.
+#
+# Formato (enteros de 8 bytes little-endian, secciones alineadas a 8 bytes):
+#   - cabecera: MAGIC y, por cada tabla (tareas y sub-tareas), la firma del CSV del que salió
+#     (fecha de modificación en ns, tamaño y versión), la cantidad de filas, cuántas filas del
+#     principio tienen ids ordenados, el largo de los títulos y dónde empieza la tabla;
+#   - por cada tabla: la columna de ids, la de task_ids (solo sub-tareas), la tabla de
+#     desplazamientos de los títulos (filas + 1 valores), el mapa de bits de completadas y los
+#     títulos en UTF-8, uno detrás de otro.
+#
+# El archivo se abre con mmap: las columnas de enteros se copian de una vez (una copia de memoria,
+# sin un objeto por fila) y cada título se decodifica recién cuando alguien lo pide (SnapshotTitles).
+
+# Importa array para las columnas de enteros.
+from array import array
+
+# Importa mmap para abrir la instantánea sin leerla entera.
+import mmap
+
+# Importa os para reemplazar el archivo de forma atómica.
+import os
+
+# Importa struct para la cabecera.
+import struct
+
+# Importa sys para comprobar el orden de los bytes de la plataforma.
+import sys
+
+# Identificador del formato (cambia si cambia el formato).
+MAGIC = b'AASNAP01'
+
+# Por tabla: fecha de modificación, tamaño y versión del CSV, filas, filas ordenadas, largo de
+# los títulos y comienzo de la tabla en el archivo.
+TABLE_HEADER = struct.Struct('<7q')
+HEADER_SIZE = len(MAGIC) + 2 * TABLE_HEADER.size
+
+# Tipos de tabla, en el orden del archivo.
+KINDS = ('task', 'subtask')
+
+
+# Redondea 'size' al siguiente múltiplo de 8.
+def _align(size):
+    return (size + 7) & ~7
+
+
+# Devuelve el tamaño de cada sección de una tabla: ids, task_ids, desplazamientos, bits y títulos.
+def _section_sizes(kind, count, blob_size):
+    return (8 * count, 8 * count if kind == 'subtask' else 0, 8 * (count + 1),
+            _align((count + 7) // 8), _align(blob_size))
+
+
+# Define la clase SnapshotTitles: la columna de títulos de una tabla de la instantánea. Se comporta
+# como la lista de títulos de ColumnTable: cada título se decodifica al pedirlo, y los títulos
+# cambiados o agregados después de cargar se guardan aparte.
+class SnapshotTitles:
+
+    def __init__(self, data, offsets, blob_start, count):
+        self.data = data
+        self.offsets = offsets
+        self.blob_start = blob_start
+        self.count = count
+        # Fila -> título nuevo de las filas cambiadas, y títulos de las filas agregadas.
+        self.changed = {}
+        self.added = []
+
+    def __getitem__(self, row):
+        if row >= self.count:
+            return self.added[row - self.count]
+        title = self.changed.get(row)
+        if title is None:
+            start = self.blob_start + self.offsets[row]
+            title = self.data[start:self.blob_start + self.offsets[row + 1]].decode('utf-8')
+        return title
+
+    def __setitem__(self, row, title):
+        if row >= self.count:
+            self.added[row - self.count] = title
+        else:
+            self.changed[row] = title
+
+    def append(self, title):
+        self.added.append(title)
+
+    def __len__(self):
+        return self.count + len(self.added)
+
+
+# Define la clase SnapshotTable: una tabla de la instantánea abierta.
+class SnapshotTable:
+
+    def __init__(self, kind, data, signature, count, sorted_rows, blob_size, start):
+        self.kind = kind
+        self.signature = signature
+        self.count = count
+        self.sorted_rows = sorted_rows
+        view = memoryview(data)
+        ids_size, task_ids_size, offsets_size, bits_size, _ = _section_sizes(kind, count, blob_size)
+        position = start
+        self.ids = view[position:position + ids_size].cast('q')
+        position += ids_size
+        self.task_ids = view[position:position + task_ids_size].cast('q') if task_ids_size else None
+        position += task_ids_size
+        offsets = view[position:position + offsets_size].cast('q')
+        position += offsets_size
+        self.completed_bits = view[position:position + (count + 7) // 8]
+        position += bits_size
+        self.titles = SnapshotTitles(data, offsets, position, count)
+
+    # Recorre las filas ya convertidas, como CsvStorage.load_tasks / load_subtasks.
+    def rows(self):
+        ids, task_ids, titles, bits = self.ids, self.task_ids, self.titles, self.completed_bits
+        for row in range(self.count):
+            completed = bool(bits[row >> 3] & (1 << (row & 7)))
+            if task_ids is None:
+                yield ids[row], titles[row], completed
+            else:
+                yield ids[row], task_ids[row], titles[row], completed
+
+
+# Abre una instantánea. Devuelve un diccionario tipo -> SnapshotTable, o None si el archivo no
+# existe o no es válido (otro formato, truncado, o una plataforma big-endian).
+def open_snapshot(path):
+    if sys.byteorder != 'little':
+        return None
+    try:
+        with open(path, mode='rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(data) < HEADER_SIZE or data[:len(MAGIC)] != MAGIC:
+        data.close()
+        return None
+
+    tables = {}
+    position = len(MAGIC)
+    for kind in KINDS:
+        mtime, size, version, count, sorted_rows, blob_size, start = \
+            TABLE_HEADER.unpack_from(data, position)
+        position += TABLE_HEADER.size
+        if count < 0 or start < HEADER_SIZE or start + sum(_section_sizes(kind, count, blob_size)) > len(data):
+            data.close()
+            return None
+        tables[kind] = SnapshotTable(kind, data, (mtime, size, version), count, sorted_rows, blob_size, start)
+    return tables
+
+
+# Devuelve las columnas de una tabla a partir de sus elementos (objetos con id, título, completada
+# y, en las sub-tareas, task_id): (ids, task_ids, desplazamientos, bits, títulos, filas ordenadas).
+def _columns(kind, items):
+    ids = array('q')
+    task_ids = array('q')
+    offsets = array('q', [0])
+    bits = bytearray()
+    blob = bytearray()
+    sorted_rows = 0
+    previous = None
+    for row, item in enumerate(items):
+        if row & 7 == 0:
+            bits.append(0)
+        ids.append(item.id)
+        if kind == 'subtask':
+            task_ids.append(item.task_id)
+        blob += item.title.encode('utf-8')
+        offsets.append(len(blob))
+        if item.completed:
+            bits[row >> 3] |= 1 << (row & 7)
+        if sorted_rows == row and (previous is None or item.id > previous):
+            sorted_rows += 1
+        previous = item.id
+    return ids, task_ids, offsets, bits, blob, sorted_rows
+
+
+# Escribe una instantánea con las tareas y sub-tareas indicadas. 'signatures' tiene la firma
+# (fecha de modificación en ns, tamaño, versión) del CSV de cada tipo. Se escribe en un archivo
+# temporal que reemplaza al anterior de una sola vez. Devuelve False (sin escribir nada) en una
+# plataforma big-endian, donde no se podría abrir.
+def write_snapshot(path, signatures, tasks, subtasks):
+    if sys.byteorder != 'little':
+        return False
+    tables = [(kind, _columns(kind, items)) for kind, items in zip(KINDS, (tasks, subtasks))]
+    headers = []
+    start = HEADER_SIZE
+    for kind, (ids, _, _, _, blob, sorted_rows) in tables:
+        headers.append(TABLE_HEADER.pack(*signatures[kind], len(ids), sorted_rows, len(blob), start))
+        start += sum(_section_sizes(kind, len(ids), len(blob)))
+
+    temporary = path + '.tmp'
+    with open(temporary, mode='wb') as file:
+        file.write(MAGIC)
+        file.write(b''.join(headers))
+        for kind, (ids, task_ids, offsets, bits, blob, _) in tables:
+            file.write(ids)
+            if kind == 'subtask':
+                file.write(task_ids)
+            file.write(offsets)
+            file.write(bits)
+            file.write(bytes(_align(len(bits)) - len(bits)))
+            file.write(blob)
+            file.write(bytes(_align(len(blob)) - len(blob)))
+    os.replace(temporary, path)
+    return True
@@ -0,0 +1,871 @@
+# Módulo de almacenamiento: define los motores de persistencia que utiliza TaskManager.
+#
+# Todos los motores ofrecen la misma interfaz (la de la clase Storage):
+#   - load_tasks() y load_subtasks() devuelven filas (id, título, completada) y
+#     (id, task_id, título, completada) ya convertidas a sus tipos.
+#   - load_changes() devuelve los cambios pendientes de aplicar sobre esas filas (el diario).
+#   - scan_subtasks() y read_subtasks(locator) permiten cargar las sub-tareas de una tarea
+#     solo cuando se necesitan (modo perezoso de TaskManager).
+#   - apply(changes, tasks, subtasks) persiste una lista de cambios (operación, tipo, objeto).
+#   - save_all(tasks, subtasks) escribe una instantánea completa.
+#   - load_errors() informa las filas que no se pudieron leer en la última carga.
+#   - load_table(kind) devuelve la tabla de la instantánea binaria (ver snapshot.py) si está al
+#     día, para cargarla sin pasar por las filas; write_binary_snapshot() la vuelve a generar.
+#   - locked() bloquea el almacenamiento frente a otros procesos durante un ciclo de carga,
+#     modificación y guardado; is_stale() indica si otro proceso guardó desde la última lectura.
+#
+# Las operaciones de un cambio son 'add' (nueva tarea o sub-tarea), 'set' (cambio del estado
+# completada) y 'del' (borrado; el borrado de una tarea incluye sus sub-tareas).
+
+# Importa nullcontext para los motores que no necesitan bloquearse frente a otros procesos.
+from contextlib import nullcontext
+
+# Importa el módulo csv, que se utiliza para leer y escribir los archivos CSV.
+import csv
+
+# Importa el módulo io, que se utiliza para dar formato CSV a un registro en memoria.
+import io
+
+# Importa el módulo locale para decodificar los CSV leídos en binario con la misma codificación
+# que usa open() en modo texto.
+import locale
+
+# Importa el módulo os, que proporciona funciones para interactuar con el sistema operativo.
+import os
+
+# Importa shutil para guardar una copia de un archivo dañado antes de reescribirlo.
+import shutil
+
+# Importa el módulo sqlite3 de la biblioteca estándar para el motor SQLite.
+import sqlite3
+
+# Importa threading y time para agrupar las sincronizaciones con el disco (política 'batch').
+import threading
+import time
+
+# Importa el candado de archivo que coordina a los procesos que comparten los CSV.
+from locking import FileLock
+
+# Importa la instantánea binaria opcional de los CSV.
+from snapshot import open_snapshot, write_snapshot
+
+# Tamaño máximo por defecto del diario (en bytes) antes de compactarlo en los archivos CSV.
+JOURNAL_LIMIT = 1024 * 1024
+
+# Políticas de sincronización con el disco (fsync) después de escribir:
+#   - 'always': cada escritura se sincroniza antes de volver. Un corte de luz no pierde nada.
+#   - 'batch': se sincroniza como mucho una vez cada fsync_interval segundos; un corte de luz
+#     puede perder los cambios de ese último intervalo.
+#   - 'never': se deja al sistema operativo decidir cuándo escribir.
+# Con cualquier política, que el programa se cierre a mitad de una escritura no daña los CSV:
+# se escriben en un archivo temporal que reemplaza al original de forma atómica (os.replace).
+FSYNC_ALWAYS = 'always'
+FSYNC_BATCH = 'batch'
+FSYNC_NEVER = 'never'
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_BATCH, FSYNC_NEVER)
+
+# Intervalo por defecto (en segundos) entre sincronizaciones con la política 'batch'.
+FSYNC_INTERVAL = 0.05
+
+# Cabeceras de los archivos CSV.
+TASK_HEADER = ["id", "title", "completed"]
+SUBTASK_HEADER = ["id", "task_id", "title", "completed"]
+
+
+# Convierte una fila en una línea de texto con formato CSV, igual a la que escribiría csv.writer.
+def _format_csv_row(row):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(row)
+    return buffer.getvalue()
+
+
+# Convierte una fila de tasks.csv en una tupla (id, título, completada).
+# Devuelve una lista vacía si la fila no tiene exactamente 3 columnas válidas.
+def _parse_task_row(row):
+    if len(row) == 3:
+        try:
+            task_id, title, completed = row
+            return [(int(task_id), title, completed == 'True')]
+        except ValueError:
+            pass
+    return []
+
+
+# Convierte una fila de subtasks.csv en una tupla (id, task_id, título, completada).
+# Devuelve una lista vacía si la fila no tiene exactamente 4 columnas válidas.
+def _parse_subtask_row(row):
+    if len(row) == 4:
+        try:
+            subtask_id, task_id, title, completed = row
+            return [(int(subtask_id), int(task_id), title, completed == 'True')]
+        except ValueError:
+            pass
+    return []
+
+
+# Recorre un CSV abierto en binario y devuelve pares (desplazamiento, registro). Un registro puede
+# ocupar varias líneas si un título entre comillas contiene saltos de línea: el registro termina
+# cuando la cantidad de comillas leídas es par.
+def _iter_csv_records(file):
+    offset = file.tell()
+    for line in iter(file.readline, b''):
+        while line.count(b'"') % 2:
+            continuation = file.readline()
+            if not continuation:
+                break
+            line += continuation
+        yield offset, line
+        offset += len(line)
+
+
+# Define la clase Storage, la interfaz común de todos los motores de almacenamiento.
+class Storage:
+
+    # Función opcional que se llama con (archivo, bytes) después de cada escritura a un archivo
+    # (la usa la instrumentación de TaskManager). Los motores que no escriben archivos la ignoran.
+    on_write = None
+
+    # Devuelve las tareas guardadas como tuplas (id, título, completada), una a una.
+    def load_tasks(self):
+        raise NotImplementedError
+
+    # Devuelve la tabla ('task' o 'subtask') de la instantánea binaria si el motor tiene una al
+    # día, o None; en ese caso las filas se cargan con load_tasks / load_subtasks.
+    def load_table(self, kind):
+        return None
+
+    # Indica si la instantánea binaria debe volver a generarse con el estado cargado o guardado.
+    def binary_snapshot_outdated(self):
+        return False
+
+    # Genera la instantánea binaria con las tareas y sub-tareas indicadas, que deben ser las mismas
+    # que tienen los archivos. Devuelve True si la escribió.
+    def write_binary_snapshot(self, tasks, subtasks):
+        return False
+
+    # Devuelve las sub-tareas guardadas como tuplas (id, task_id, título, completada), una a una.
+    def load_subtasks(self):
+        raise NotImplementedError
+
+    # Recorre las sub-tareas sin construirlas. Devuelve un diccionario task_id -> localizador
+    # (lo que read_subtasks necesita para leerlas después) y el mayor id de sub-tarea.
+    def scan_subtasks(self):
+        raise NotImplementedError
+
+    # Devuelve las sub-tareas indicadas por un localizador obtenido con scan_subtasks().
+    def read_subtasks(self, locator):
+        raise NotImplementedError
+
+    # Devuelve los cambios registrados después de la última instantánea como tuplas
+    # (operación, tipo, id, task_id, título, completada). Por defecto no hay ninguno.
+    def load_changes(self):
+        return []
+
+    # Indica si conviene escribir una instantánea completa después de la carga.
+    def needs_compaction(self):
+        return False
+
+    # Indica si la próxima llamada a apply() recorrerá el estado completo ('tasks' y 'subtasks').
+    # Quien persiste desde otro hilo lo usa para saber si debe copiar el estado antes de escribir.
+    def needs_snapshot(self):
+        return True
+
+    # Persiste una lista de cambios. 'tasks' y 'subtasks' son el estado completo en memoria,
+    # disponible para los motores que necesitan reescribir archivos enteros.
+    def apply(self, changes, tasks, subtasks):
+        raise NotImplementedError
+
+    # Escribe una instantánea completa del estado.
+    def save_all(self, tasks, subtasks):
+        raise NotImplementedError
+
+    # Devuelve las filas que no se pudieron interpretar en la última carga, como tuplas
+    # (archivo, número de línea, contenido). Por defecto no hay ninguna.
+    def load_errors(self):
+        return []
+
+    # Devuelve un bloque 'with' durante el cual ningún otro proceso lee ni guarda. Por defecto no
+    # bloquea nada.
+    def locked(self):
+        return nullcontext()
+
+    # Indica si otro proceso guardó cambios después de la última carga o escritura de este.
+    def is_stale(self):
+        return False
+
+    # Devuelve los registros (como los de load_changes) que otros procesos agregaron desde la
+    # última lectura, o None si hay que volver a cargar todo.
+    def read_new_changes(self):
+        return None
+
+    # Libera los recursos del motor (conexiones, archivos abiertos).
+    def close(self):
+        pass
+
+
+# Define la clase CsvStorage, que guarda las tareas en tasks.csv y las sub-tareas en subtasks.csv.
+# En modo diario cada cambio se agrega a un archivo .journal junto a tasks.csv, que se compacta
+# en los CSV cuando supera journal_limit bytes.
+class CsvStorage(Storage):
+
+    def __init__(self, task_file='tasks.csv', subtask_file='subtasks.csv', journal=False,
+                 journal_limit=JOURNAL_LIMIT, fsync=FSYNC_ALWAYS, fsync_interval=FSYNC_INTERVAL,
+                 binary_snapshot=False):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconocida: {fsync!r}")
+        self.task_file = task_file
+        self.subtask_file = subtask_file
+        self.journal = journal
+        self.journal_file = os.path.splitext(task_file)[0] + '.journal'
+        self.journal_limit = journal_limit
+        self.journal_size = 0
+
+        # Candado entre procesos y número de versión de cada CSV. Cada proceso anota la versión que
+        # leyó o escribió; si al guardar el archivo .version tiene otra, otro proceso guardó en el
+        # medio. El diario no necesita versión: solo crece, así que basta comparar su tamaño.
+        stem = os.path.splitext(task_file)[0]
+        self.file_lock = FileLock(stem + '.lock')
+        self.version_file = stem + '.version'
+        self.task_version = 0
+        self.subtask_version = 0
+
+        # Instantánea binaria opcional (archivo .snap, ver snapshot.py). 'signatures' guarda la firma
+        # (fecha de modificación en ns, tamaño) de cada CSV al leerlo o escribirlo: la instantánea se
+        # usa solo si coincide con la actual. 'from_csv' son los tipos que se leyeron de los CSV
+        # porque la instantánea no estaba al día, y 'csv_written' indica que se reescribió algún CSV.
+        self.snapshot_file = stem + '.snap' if binary_snapshot else None
+        self.snapshot_tables = None
+        self.signatures = {}
+        self.from_csv = set()
+        self.csv_written = False
+
+        # Política de sincronización con el disco (ver FSYNC_POLICIES).
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+
+        # Con la política 'batch': archivos escritos pero todavía no sincronizados, momento a partir
+        # del cual se puede volver a sincronizar y temporizador que sincroniza lo pendiente.
+        self.unsynced = set()
+        self.next_sync = 0.0
+        self.sync_timer = None
+        self.sync_lock = threading.Lock()
+
+        # Filas ilegibles de la última carga (archivo, línea, contenido) y archivos que las tienen.
+        # Antes de reescribir un archivo dañado se guarda una copia, para no perder esas filas.
+        self.errors = []
+        self.damaged = set()
+
+        # Función opcional que se llama con (archivo, bytes) después de cada escritura; la usa la
+        # instrumentación de TaskManager para contar los bytes escritos.
+        self.on_write = None
+
+    # Crea el archivo con su cabecera si todavía no existe.
+    @staticmethod
+    def _ensure_file(path, header):
+        if not os.path.exists(path):
+            with open(path, mode='w', newline='') as file:
+                csv.writer(file).writerow(header)
+
+    # Anota una fila ilegible. Las líneas vacías no cuentan como error. Con keep=True se guardará
+    # una copia del archivo antes de reescribirlo.
+    def _report(self, path, line_number, content, keep=True):
+        if content in ([], b'\n', b'\r\n', ''):
+            return
+        self.errors.append((path, line_number, content))
+        if keep:
+            self.damaged.add(path)
+
+    # Olvida los errores anteriores de un archivo que se vuelve a leer.
+    def _reset_errors(self, path):
+        self.errors = [error for error in self.errors if error[0] != path]
+        self.damaged.discard(path)
+
+    def load_errors(self):
+        return list(self.errors)
+
+    def locked(self):
+        return self.file_lock
+
+    # Lee las versiones (tareas, sub-tareas) del archivo .version; (0, 0) si todavía no existe.
+    def _read_versions(self):
+        try:
+            with open(self.version_file, mode='r') as file:
+                task_version, subtask_version = file.read().split(',')
+                return int(task_version), int(subtask_version)
+        except (OSError, ValueError):
+            return 0, 0
+
+    # Aumenta la versión de un CSV antes de reescribirlo. Si el programa se interrumpe entre medio,
+    # los demás procesos solo vuelven a cargar sin necesidad; al revés perderían cambios.
+    def _bump_version(self, path):
+        task_version, subtask_version = self._read_versions()
+        if path == self.task_file:
+            task_version += 1
+        else:
+            subtask_version += 1
+        temporary = self.version_file + '.tmp'
+        with open(temporary, mode='w') as file:
+            file.write(f"{task_version},{subtask_version}")
+            self._sync(file, self.version_file)
+        os.replace(temporary, self.version_file)
+        self.task_version, self.subtask_version = task_version, subtask_version
+
+    def _journal_file_size(self):
+        try:
+            return os.path.getsize(self.journal_file)
+        except OSError:
+            return 0
+
+    def is_stale(self):
+        if self._read_versions() != (self.task_version, self.subtask_version):
+            return True
+        return self.journal and self._journal_file_size() != self.journal_size
+
+    # Si los CSV no cambiaron, los registros nuevos del diario se leen desde donde quedó la última
+    # lectura o escritura de este proceso.
+    def read_new_changes(self):
+        if not self.journal or self._read_versions() != (self.task_version, self.subtask_version):
+            return None
+        records, self.journal_size = self.read_changes(self.journal_size)
+        return records
+
+    # Prepara la lectura de un tipo ('task' o 'subtask'): crea el CSV si falta, olvida sus errores
+    # anteriores y anota su versión y su firma.
+    def _start_load(self, kind):
+        path, header = (self.task_file, TASK_HEADER) if kind == 'task' else (self.subtask_file, SUBTASK_HEADER)
+        self._ensure_file(path, header)
+        self._reset_errors(path)
+        versions = self._read_versions()
+        if kind == 'task':
+            self.task_version = versions[0]
+        else:
+            self.subtask_version = versions[1]
+        self.signatures[path] = self._signature(path)
+        return path
+
+    # Firma de un archivo: (fecha de modificación en ns, tamaño), o None si no existe.
+    @staticmethod
+    def _signature(path):
+        try:
+            status = os.stat(path)
+        except OSError:
+            return None
+        return status.st_mtime_ns, status.st_size
+
+    # Prepara la lectura de un tipo y devuelve su tabla de la instantánea si está al día (misma
+    # firma y versión que el CSV). La instantánea se vuelve a abrir al empezar cada carga (las
+    # tareas se cargan primero).
+    def load_table(self, kind):
+        path = self._start_load(kind)
+        if self.snapshot_file is None:
+            return None
+        if kind == 'task' or self.snapshot_tables is None:
+            self.snapshot_tables = open_snapshot(self.snapshot_file)
+        table = self.snapshot_tables.get(kind) if self.snapshot_tables else None
+        version = self.task_version if kind == 'task' else self.subtask_version
+        if table is None or table.signature != (*self.signatures[path], version):
+            self.from_csv.add(kind)
+            return None
+        self.from_csv.discard(kind)
+        return table
+
+    # La instantánea está desactualizada si algún tipo se leyó del CSV o se reescribió un CSV.
+    # Con registros en el diario los datos en memoria ya no son los de los CSV: se espera a la
+    # próxima carga o compactación.
+    def binary_snapshot_outdated(self):
+        if self.snapshot_file is None or self.journal and self.journal_size:
+            return False
+        return bool(self.from_csv) or self.csv_written
+
+    # Escribe la instantánea si los CSV siguen siendo los que este proceso leyó o escribió y no
+    # tienen filas dañadas. Un error al escribirla no es grave: se sigue usando el CSV.
+    def write_binary_snapshot(self, tasks, subtasks):
+        if self.snapshot_file is None or self.errors:
+            return False
+        with self.file_lock:
+            paths = (self.task_file, self.subtask_file)
+            if self._read_versions() != (self.task_version, self.subtask_version) or \
+                    any(self._signature(path) != self.signatures.get(path) for path in paths):
+                return False
+            signatures = {'task': (*self.signatures[self.task_file], self.task_version),
+                          'subtask': (*self.signatures[self.subtask_file], self.subtask_version)}
+            try:
+                written = write_snapshot(self.snapshot_file, signatures, tasks, subtasks)
+            except OSError:
+                return False
+            if written:
+                self.from_csv.clear()
+                self.csv_written = False
+            return written
+
+    # Las filas se convierten a medida que se leen, sin guardar en memoria la lista de filas crudas.
+    def load_tasks(self):
+        table = self.load_table('task')
+        if table is not None:
+            yield from table.rows()
+            return
+        with open(self.task_file, mode='r') as file:
+            reader = csv.reader(file)
+            # Se ignora la cabecera. Las filas que no tienen exactamente 3 columnas válidas se informan.
+            next(reader, None)
+            for row in reader:
+                parsed = _parse_task_row(row)
+                if not parsed:
+                    self._report(self.task_file, reader.line_num, row)
+                yield from parsed
+
+    def load_subtasks(self):
+        table = self.load_table('subtask')
+        if table is not None:
+            yield from table.rows()
+            return
+        with open(self.subtask_file, mode='r') as file:
+            reader = csv.reader(file)
+            # Se ignora la cabecera. Las filas que no tienen exactamente 4 columnas válidas se informan.
+            next(reader, None)
+            for row in reader:
+                parsed = _parse_subtask_row(row)
+                if not parsed:
+                    self._report(self.subtask_file, reader.line_num, row)
+                yield from parsed
+
+    # Recorre subtasks.csv en binario y anota el desplazamiento en bytes de cada fila, agrupado por
+    # task_id. Solo se convierten a entero las dos primeras columnas; el título no se decodifica.
+    def scan_subtasks(self):
+        # Las sub-tareas se leen del CSV, así que no se usa la instantánea.
+        self._start_load('subtask')
+        self.from_csv.add('subtask')
+        offsets_by_task = {}
+        max_id = 0
+        with open(self.subtask_file, mode='rb') as file:
+            file.readline()
+            # Número de línea de cada registro, solo para informar las filas ilegibles.
+            line_number = 2
+            for offset, line in _iter_csv_records(file):
+                record_line, line_number = line_number, line_number + line.count(b'\n')
+                fields = line.split(b',', 2)
+                try:
+                    subtask_id = int(fields[0])
+                    task_id = int(fields[1])
+                except (ValueError, IndexError):
+                    self._report(self.subtask_file, record_line, line)
+                    continue
+                offsets = offsets_by_task.get(task_id)
+                if offsets is None:
+                    offsets_by_task[task_id] = [offset]
+                else:
+                    offsets.append(offset)
+                if subtask_id > max_id:
+                    max_id = subtask_id
+        return offsets_by_task, max_id
+
+    # Lee las filas que empiezan en los desplazamientos indicados.
+    def read_subtasks(self, locator):
+        encoding = locale.getpreferredencoding(False)
+        subtasks = []
+        with open(self.subtask_file, mode='rb') as file:
+            for offset in locator:
+                file.seek(offset)
+                _, line = next(_iter_csv_records(file), (None, b''))
+                for row in csv.reader([line.decode(encoding)]):
+                    parsed = _parse_subtask_row(row)
+                    if not parsed:
+                        self._report(self.subtask_file, None, row)
+                    subtasks.extend(parsed)
+        return subtasks
+
+    # Interpreta un tramo de tasks.csv (kind='task') o de subtasks.csv leído en binario, sin la
+    # cabecera. Devuelve las filas convertidas y la cantidad de filas que no se pudieron leer.
+    def parse_rows(self, kind, data):
+        parse = _parse_task_row if kind == 'task' else _parse_subtask_row
+        rows = []
+        errors = 0
+        text = data.decode(locale.getpreferredencoding(False))
+        for row in csv.reader(io.StringIO(text, newline='')):
+            parsed = parse(row)
+            if not parsed and row:
+                errors += 1
+            rows.extend(parsed)
+        return rows, errors
+
+    def load_changes(self):
+        if not self.journal or not os.path.exists(self.journal_file):
+            self.journal_size = 0
+            return []
+        self._reset_errors(self.journal_file)
+
+        with open(self.journal_file, mode='rb') as file:
+            data = file.read()
+
+        # Un registro escrito a medias antes de un corte queda al final, sin salto de línea. Se
+        # informa y se recorta, para que el próximo registro no se pegue a él.
+        end = data.rfind(b'\n') + 1
+        if end < len(data):
+            self._report(self.journal_file, data.count(b'\n', 0, end) + 1, data[end:], keep=False)
+            with open(self.journal_file, mode='r+b') as file:
+                file.truncate(end)
+            data = data[:end]
+
+        self.journal_size = end
+        return self._parse_changes(data)
+
+    # Lee los registros agregados al diario desde el desplazamiento 'start', por ejemplo por otro
+    # proceso. No repara nada: un último registro sin terminar puede estar escribiéndose y se deja
+    # para la próxima lectura. Devuelve los cambios y el desplazamiento hasta donde se leyó.
+    def read_changes(self, start=0):
+        if not self.journal or not os.path.exists(self.journal_file):
+            return [], 0
+        with open(self.journal_file, mode='rb') as file:
+            file.seek(start)
+            data = file.read()
+        end = data.rfind(b'\n') + 1
+        return self._parse_changes(data[:end], report=False), start + end
+
+    # Convierte los registros del diario en tuplas (operación, tipo, id, task_id, título, completada).
+    def _parse_changes(self, data, report=True):
+        changes = []
+        text = data.decode(locale.getpreferredencoding(False))
+        reader = csv.reader(io.StringIO(text, newline=''))
+        for record in reader:
+            try:
+                op, kind, item_id, task_id, title, completed = record
+                item_id = int(item_id)
+                task_id = int(task_id) if task_id else None
+            except ValueError:
+                if report:
+                    self._report(self.journal_file, reader.line_num, record)
+                continue
+            changes.append((op, kind, item_id, task_id, title, completed == 'True'))
+        return changes
+
+    def needs_compaction(self):
+        return self.journal and self.journal_size >= self.journal_limit
+
+    # Sin diario siempre se reescriben los archivos; con diario, solo al compactar.
+    def needs_snapshot(self):
+        return not self.journal or self.needs_compaction()
+
+    def apply(self, changes, tasks, subtasks):
+        if not changes:
+            return
+        with self.file_lock:
+            self._apply(changes, tasks, subtasks)
+
+    def _apply(self, changes, tasks, subtasks):
+        if self.journal:
+            # Cuando el diario superó el límite, en lugar de agregar los cambios se escribe una
+            # instantánea completa (que ya los incluye) y se vacía el diario.
+            if self.needs_compaction():
+                self.save_all(tasks, subtasks)
+            else:
+                self._append_journal(changes)
+            return
+
+        # Sin diario se reescribe cada archivo afectado una sola vez.
+        if any(kind == 'task' for _, kind, _ in changes):
+            self.save_tasks(tasks)
+        if any(kind == 'subtask' or op == 'del' for op, kind, _ in changes):
+            self.save_subtasks(subtasks)
+
+    # Agrega al diario un registro por cambio con el formato:
+    # operación, tipo, id, task_id, título, completada.
+    def _append_journal(self, changes):
+        lines = []
+        for op, kind, item in changes:
+            # El task_id se anota en todos los registros de sub-tareas para que el modo perezoso
+            # sepa qué sub-tareas cargar antes de aplicar el registro.
+            task_id = item.task_id if kind == 'subtask' else ''
+            if op == 'add':
+                record = [op, kind, item.id, task_id, item.title, item.completed]
+            elif op == 'set':
+                record = [op, kind, item.id, task_id, '', item.completed]
+            else:
+                record = [op, kind, item.id, task_id, '', '']
+            lines.append(_format_csv_row(record))
+
+        # Se abre en modo 'a' para que la escritura cueste lo mismo sin importar cuántas tareas existan.
+        data = ''.join(lines)
+        with open(self.journal_file, mode='a', newline='') as file:
+            start = file.tell()
+            file.write(data)
+            self._sync(file, self.journal_file)
+            # El tamaño se toma del archivo: incluye lo que hayan agregado otros procesos antes.
+            self.journal_size = file.tell()
+        if self.on_write is not None:
+            self.on_write(self.journal_file, self.journal_size - start)
+
+    # Sincroniza con el disco un archivo recién escrito, según la política de fsync. Con 'batch',
+    # si se sincronizó hace menos de fsync_interval segundos, el archivo queda pendiente y lo
+    # sincroniza un temporizador al terminar el intervalo. Devuelve True si se sincronizó.
+    def _sync(self, file, path):
+        if self.fsync == FSYNC_NEVER:
+            return False
+        file.flush()
+        if self.fsync == FSYNC_BATCH:
+            with self.sync_lock:
+                delay = self.next_sync - time.monotonic()
+                if delay > 0:
+                    self.unsynced.add(path)
+                    if self.sync_timer is None:
+                        self.sync_timer = threading.Timer(delay, self.sync)
+                        self.sync_timer.daemon = True
+                        self.sync_timer.start()
+                    return False
+                self.next_sync = time.monotonic() + self.fsync_interval
+                self.unsynced.discard(path)
+        os.fsync(file.fileno())
+        return True
+
+    # Sincroniza con el disco los archivos que quedaron pendientes con la política 'batch'.
+    def sync(self):
+        with self.sync_lock:
+            paths, self.unsynced = self.unsynced, set()
+            self.sync_timer = None
+            self.next_sync = time.monotonic() + self.fsync_interval
+        for path in paths:
+            if os.path.exists(path):
+                with open(path, mode='ab') as file:
+                    os.fsync(file.fileno())
+
+    # Las filas ilegibles de un archivo se perderían al reescribirlo: antes se guarda una copia.
+    def _backup_damaged(self, path):
+        if path in self.damaged and os.path.exists(path):
+            shutil.copyfile(path, f"{path}.{time.strftime('%Y%m%d-%H%M%S')}.bak")
+            self.damaged.discard(path)
+
+    # Escribe un CSV completo sin dañar el original si el programa se interrumpe: las filas van a
+    # un archivo temporal que luego reemplaza al original de una sola vez con os.replace.
+    def _write_csv(self, path, header, rows):
+        self._bump_version(path)
+        temporary = path + '.tmp'
+        with open(temporary, mode='w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            writer.writerows(rows)
+            synced = self._sync(file, path)
+            size = file.tell()
+
+        self._backup_damaged(path)
+        os.replace(temporary, path)
+        self.signatures[path] = self._signature(path)
+        self.csv_written = True
+        if self.on_write is not None:
+            self.on_write(path, size)
+
+        # Con 'always' se sincroniza también la carpeta, para que el reemplazo sobreviva a un corte.
+        # En Windows no se pueden abrir carpetas con os.open: allí basta con os.replace.
+        if synced and self.fsync == FSYNC_ALWAYS and os.name == 'posix':
+            directory = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    # Guarda las tareas en el archivo CSV de tareas.
+    def save_tasks(self, tasks):
+        self._write_csv(self.task_file, TASK_HEADER,
+                        ([task.id, task.title, task.completed] for task in tasks))
+
+    # Guarda las sub-tareas en el archivo CSV de sub-tareas.
+    def save_subtasks(self, subtasks):
+        self._write_csv(self.subtask_file, SUBTASK_HEADER,
+                        ([subtask.id, subtask.task_id, subtask.title, subtask.completed]
+                         for subtask in subtasks))
+
+    # Escribe ambos CSV y vacía el diario, cuyos cambios ya quedan incluidos en la instantánea.
+    # Si el programa se interrumpe entre medio, el diario sigue completo y volver a aplicarlo no
+    # duplica nada.
+    def save_all(self, tasks, subtasks):
+        with self.file_lock:
+            self.save_tasks(tasks)
+            self.save_subtasks(subtasks)
+            if self.journal:
+                self._backup_damaged(self.journal_file)
+                with open(self.journal_file, mode='w'):
+                    pass
+                self.journal_size = 0
+
+    # Sincroniza lo que haya quedado pendiente y detiene el temporizador.
+    def close(self):
+        with self.sync_lock:
+            timer = self.sync_timer
+        if timer is not None:
+            timer.cancel()
+        if self.unsynced:
+            self.sync()
+        self.file_lock.close()
+
+
+# Define la clase SqliteStorage, que guarda las tareas en una base de datos SQLite.
+# Cada cambio se traduce en sentencias INSERT/UPDATE/DELETE sobre una sola fila, así que una
+# mutación no reescribe el resto de los datos. Las sub-tareas tienen un índice por task_id.
+class SqliteStorage(Storage):
+
+    # Las políticas de fsync equivalen a los niveles de PRAGMA synchronous de SQLite (en modo WAL,
+    # NORMAL sincroniza en cada punto de control en lugar de en cada transacción). Por defecto se
+    # usa la misma política que CsvStorage, para que cambiar de motor no debilite la durabilidad.
+    SYNCHRONOUS = {FSYNC_ALWAYS: 'FULL', FSYNC_BATCH: 'NORMAL', FSYNC_NEVER: 'OFF'}
+
+    def __init__(self, database='tasks.db', fsync=FSYNC_ALWAYS):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync desconocida: {fsync!r}")
+        self.database = database
+        # check_same_thread=False permite que otro hilo persista los cambios; el acceso se serializa fuera.
+        self.connection = sqlite3.connect(database, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={self.SYNCHRONOUS[fsync]}")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id INTEGER PRIMARY KEY, title TEXT NOT NULL, completed INTEGER NOT NULL DEFAULT 0)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS subtasks ("
+                "id INTEGER PRIMARY KEY, task_id INTEGER NOT NULL, title TEXT NOT NULL, "
+                "completed INTEGER NOT NULL DEFAULT 0)")
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS subtasks_task_id ON subtasks (task_id)")
+
+    def load_tasks(self):
+        cursor = self.connection.execute("SELECT id, title, completed FROM tasks ORDER BY id")
+        for task_id, title, completed in cursor:
+            yield task_id, title, bool(completed)
+
+    def load_subtasks(self):
+        cursor = self.connection.execute(
+            "SELECT id, task_id, title, completed FROM subtasks ORDER BY id")
+        for subtask_id, task_id, title, completed in cursor:
+            yield subtask_id, task_id, title, bool(completed)
+
+    # El localizador de cada tarea es su propio id: read_subtasks consulta el índice por task_id.
+    def scan_subtasks(self):
+        task_ids = self.connection.execute("SELECT DISTINCT task_id FROM subtasks")
+        locators = {task_id: task_id for task_id, in task_ids}
+        max_id, = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM subtasks").fetchone()
+        return locators, max_id
+
+    def read_subtasks(self, locator):
+        return self.load_subtasks_for(locator)
+
+    # Cada cambio toca una sola fila: nunca hace falta el estado completo.
+    def needs_snapshot(self):
+        return False
+
+    # Devuelve las sub-tareas de una tarea usando el índice por task_id.
+    def load_subtasks_for(self, task_id):
+        cursor = self.connection.execute(
+            "SELECT id, task_id, title, completed FROM subtasks WHERE task_id = ? ORDER BY id",
+            (task_id,))
+        return [(subtask_id, parent_id, title, bool(completed))
+                for subtask_id, parent_id, title, completed in cursor]
+
+    # Aplica todos los cambios en una única transacción.
+    def apply(self, changes, tasks, subtasks):
+        if not changes:
+            return
+        with self.connection:
+            for op, kind, item in changes:
+                self._apply_change(op, kind, item)
+
+    def _apply_change(self, op, kind, item):
+        execute = self.connection.execute
+        if kind == 'task':
+            if op == 'add':
+                execute("INSERT OR REPLACE INTO tasks (id, title, completed) VALUES (?, ?, ?)",
+                        (item.id, item.title, item.completed))
+            elif op == 'set':
+                execute("UPDATE tasks SET completed = ? WHERE id = ?", (item.completed, item.id))
+            elif op == 'del':
+                execute("DELETE FROM subtasks WHERE task_id = ?", (item.id,))
+                execute("DELETE FROM tasks WHERE id = ?", (item.id,))
+        elif kind == 'subtask':
+            if op == 'add':
+                execute("INSERT OR REPLACE INTO subtasks (id, task_id, title, completed) "
+                        "VALUES (?, ?, ?, ?)", (item.id, item.task_id, item.title, item.completed))
+            elif op == 'set':
+                execute("UPDATE subtasks SET completed = ? WHERE id = ?", (item.completed, item.id))
+            elif op == 'del':
+                execute("DELETE FROM subtasks WHERE id = ?", (item.id,))
+
+    # Reemplaza todo el contenido de la base de datos en una única transacción.
+    def save_all(self, tasks, subtasks):
+        with self.connection:
+            self.connection.execute("DELETE FROM subtasks")
+            self.connection.execute("DELETE FROM tasks")
+            self.connection.executemany(
+                "INSERT INTO tasks (id, title, completed) VALUES (?, ?, ?)",
+                ((task.id, task.title, task.completed) for task in tasks))
+            self.connection.executemany(
+                "INSERT INTO subtasks (id, task_id, title, completed) VALUES (?, ?, ?, ?)",
+                ((subtask.id, subtask.task_id, subtask.title, subtask.completed)
+                 for subtask in subtasks))
+
+    def close(self):
+        self.connection.close()
+
+
+# Define la clase _Row, un registro mínimo con los atributos que esperan los métodos save_*.
+class _Row:
+    __slots__ = ('id', 'task_id', 'title', 'completed')
+
+    def __init__(self, item_id, task_id, title, completed):
+        self.id = item_id
+        self.task_id = task_id
+        self.title = title
+        self.completed = completed
+
+
+# Lee las filas válidas de un CSV sin modificarlo; un archivo que no existe no tiene filas.
+def _read_rows(path, parse):
+    if not os.path.exists(path):
+        return
+    with open(path, mode='r') as file:
+        reader = csv.reader(file)
+        next(reader, None)
+        for row in reader:
+            yield from parse(row)
+
+
+# Importa de una sola vez tasks.csv y subtasks.csv (incluido su diario, si existe) a una base SQLite.
+# Devuelve la cantidad de tareas y sub-tareas importadas. Los archivos de origen solo se leen: no se
+# toma el candado (no se crea el .lock) ni se recorta un último registro del diario escrito a medias.
+def import_csv_to_sqlite(task_file='tasks.csv', subtask_file='subtasks.csv', database='tasks.db'):
+    tasks = {task_id: _Row(task_id, None, title, completed)
+             for task_id, title, completed in _read_rows(task_file, _parse_task_row)}
+    subtasks = {subtask_id: _Row(subtask_id, task_id, title, completed)
+                for subtask_id, task_id, title, completed in _read_rows(subtask_file, _parse_subtask_row)}
+
+    # Aplica el diario pendiente para importar el estado más reciente. read_changes lee los
+    # registros completos y deja el archivo como está.
+    changes, _ = CsvStorage(task_file, subtask_file, journal=True).read_changes()
+    subtask_ids_by_task = {}
+    if changes:
+        for row in subtasks.values():
+            subtask_ids_by_task.setdefault(row.task_id, set()).add(row.id)
+    for op, kind, item_id, task_id, title, completed in changes:
+        rows = tasks if kind == 'task' else subtasks
+        if op == 'add':
+            rows[item_id] = _Row(item_id, task_id, title, completed)
+            if kind == 'subtask':
+                subtask_ids_by_task.setdefault(task_id, set()).add(item_id)
+        elif op == 'set' and item_id in rows:
+            rows[item_id].completed = completed
+        elif op == 'del' and kind == 'task':
+            tasks.pop(item_id, None)
+            for subtask_id in subtask_ids_by_task.pop(item_id, ()):
+                subtasks.pop(subtask_id, None)
+        elif op == 'del':
+            subtasks.pop(item_id, None)
+
+    target = SqliteStorage(database)
+    try:
+        target.save_all(tasks.values(), subtasks.values())
+    finally:
+        target.close()
+    return len(tasks), len(subtasks)
+
+
+# Permite ejecutar el importador directamente: python storage.py [tasks.csv subtasks.csv tasks.db]
+if __name__ == "__main__":
+    import sys
+    task_count, subtask_count = import_csv_to_sqlite(*sys.argv[1:4])
+    print(f"Importadas {task_count} tareas y {subtask_count} sub-tareas.")
@@ -0,0 +1,218 @@
+# Módulo de vigilancia de archivos: detecta los cambios que otro programa (u otra copia de la
+# aplicación) hace en los archivos CSV y los aplica sobre TaskManager sin volver a cargarlo todo.
+#
+# FileWatcher consulta periódicamente (poll) la fecha de modificación y el tamaño de cada archivo.
+# Cuando cambian, lee el archivo y lo divide en fragmentos: cada fila cuyo id termina en 000 (una
+# "fila ancla") empieza un fragmento nuevo. Como las filas están ordenadas por id, un fragmento
+# contiene todas las filas con ids desde su ancla hasta la siguiente, y los fragmentos no se
+# desplazan aunque cambie el largo de otras filas. De cada fragmento se recuerda un crc32 y la
+# ancla siguiente; solo los fragmentos distintos de la versión anterior se interpretan y se
+# comparan con los índices en memoria. Del diario se leen solo los registros nuevos.
+#
+# Leer el archivo, buscar las anclas y calcular los crc sigue siendo proporcional a su tamaño, pero
+# se hace en C y es mucho más rápido que interpretarlo; convertir filas y actualizar los índices,
+# lo costoso, es proporcional a la cantidad de fragmentos que cambiaron.
+
+# Importa operator para comparar listas de ids elemento a elemento.
+import operator
+
+# Importa os para consultar la fecha de modificación y el tamaño de los archivos.
+import os
+
+# Importa re para comprobar que los ids de un archivo estén ordenados.
+import re
+
+# Importa zlib para calcular el crc32 de cada fragmento.
+import zlib
+
+# Importa CsvStorage, el único motor cuyos archivos se pueden vigilar.
+from storage import CsvStorage
+
+# Cada cuántos milisegundos la interfaz consulta si los archivos cambiaron.
+WATCH_INTERVAL_MS = 1000
+
+# Final del id de una fila ancla, seguido de la coma que lo separa del resto de la fila.
+ANCHOR = b'000,'
+
+# Id al principio de una línea, para comprobar el orden de un archivo completo.
+LEADING_ID = re.compile(rb'^(\d+),', re.MULTILINE)
+
+
+# Indica si una secuencia de ids está en orden creciente.
+def _ascending(ids):
+    ids = list(ids)
+    return all(map(operator.lt, ids, ids[1:]))
+
+
+# Devuelve las anclas de un archivo como pares (id, posición), en el orden del archivo. La primera,
+# con id 0, es el comienzo de las filas (después de la cabecera, que termina en 'body').
+def _anchors(data, body):
+    anchors = [(0, body)]
+    find, rfind = data.find, data.rfind
+    position = find(ANCHOR, body)
+    while position >= 0:
+        start = rfind(b'\n', 0, position) + 1
+        if start >= body and data[start:position].isdigit():
+            anchors.append((int(data[start:position + len(ANCHOR) - 1]), start))
+        position = find(ANCHOR, position + len(ANCHOR))
+    return anchors
+
+
+# Divide un archivo en fragmentos. Devuelve un diccionario ancla -> (crc, ancla siguiente), la
+# lista de (ancla, inicio, fin, ancla siguiente) y si las anclas están ordenadas.
+def _chunks(data):
+    body = data.find(b'\n') + 1 or len(data)
+    anchors = _anchors(data, body)
+    view = memoryview(data)
+    chunks = {}
+    bounds = []
+    for (anchor, start), (following, end) in zip(anchors, anchors[1:] + [(None, len(data))]):
+        chunks[anchor] = (zlib.crc32(view[start:end]), following)
+        bounds.append((anchor, start, end, following))
+    return chunks, bounds, _ascending(anchor for anchor, _ in anchors)
+
+
+# Define la clase _FileState: lo que se recuerda de un archivo CSV entre dos consultas.
+class _FileState:
+
+    def __init__(self, path):
+        self.path = path
+        # (fecha de modificación en ns, tamaño) de la última versión leída.
+        self.signature = None
+        # Ancla -> (crc, ancla siguiente) de cada fragmento.
+        self.chunks = {}
+        # Indica si los ids del archivo están ordenados; si no, cada cambio se compara completo.
+        self.ordered = False
+
+    # Lee el archivo. La firma se toma del archivo abierto, que es el que se lee aunque otro
+    # programa lo reemplace mientras tanto.
+    def read(self):
+        with open(self.path, mode='rb') as file:
+            status = os.fstat(file.fileno())
+            return (status.st_mtime_ns, status.st_size), file.read()
+
+    # Indica si el archivo cambió desde la última lectura.
+    def changed(self):
+        try:
+            status = os.stat(self.path)
+        except OSError:
+            return False
+        return (status.st_mtime_ns, status.st_size) != self.signature
+
+
+# Define la clase FileWatcher, que aplica sobre un TaskManager los cambios externos de sus archivos.
+# Se crea justo después de cargar el TaskManager: lo que tengan los archivos en ese momento es lo
+# que se considera ya cargado.
+class FileWatcher:
+
+    def __init__(self, manager):
+        if not isinstance(manager.storage, CsvStorage):
+            raise TypeError("Solo se pueden vigilar los archivos del almacenamiento CSV")
+        self.manager = manager
+        storage = manager.storage
+        self.files = {'task': _FileState(storage.task_file), 'subtask': _FileState(storage.subtask_file)}
+        for kind, state in self.files.items():
+            if not os.path.exists(state.path):
+                continue
+            state.signature, data = state.read()
+            state.chunks, _, ordered = _chunks(data)
+            # Los índices recién cargados conservan el orden del archivo, así que basta revisarlos.
+            # En modo perezoso no todas las sub-tareas están en memoria y se revisa el archivo.
+            if kind == 'task':
+                ids = manager.task_index
+            elif not manager.pending_subtasks:
+                ids = manager.subtask_index
+            else:
+                ids = map(int, LEADING_ID.findall(data, data.find(b'\n') + 1))
+            state.ordered = ordered and _ascending(ids)
+
+        # Hasta dónde se leyó el diario.
+        self.journal_offset = os.path.getsize(storage.journal_file) \
+            if storage.journal and os.path.exists(storage.journal_file) else 0
+
+    # Consulta si los archivos cambiaron y aplica los cambios. Devuelve la lista de cambios
+    # aplicados (operación, tipo, objeto), como TaskManager.apply_records, para actualizar la
+    # interfaz. Mientras haya cambios propios sin escribir no se compara nada: los archivos todavía
+    # no los tienen y parecerían borrados; se compara en la próxima consulta.
+    def poll(self):
+        manager = self.manager
+        if manager.pending_changes is not None or (manager.writer is not None and manager.writer.pending()):
+            return []
+
+        changes = []
+        rewritten = False
+        with manager.lock:
+            # Primero las tareas, para que las sub-tareas nuevas encuentren su tarea.
+            for kind in ('task', 'subtask'):
+                state = self.files[kind]
+                if not state.changed():
+                    continue
+                try:
+                    signature, data = state.read()
+                except OSError:
+                    continue
+                changes.extend(self._merge(kind, state, data))
+                state.signature = signature
+                rewritten = True
+
+            if manager.storage.journal:
+                changes.extend(self._read_journal(rewritten))
+        return changes
+
+    # Compara una nueva versión de un archivo con la anterior y aplica los fragmentos que cambiaron.
+    def _merge(self, kind, state, data):
+        storage = self.manager.storage
+        chunks, bounds, ordered = _chunks(data)
+
+        rows = []
+        ranges = []
+        if state.ordered and ordered:
+            for anchor, start, end, following in bounds:
+                if state.chunks.get(anchor) == chunks[anchor]:
+                    continue
+                chunk_rows = self._chunk_rows(kind, data[start:end], anchor, following)
+                if chunk_rows is None:
+                    ordered = False
+                    break
+                rows.extend(chunk_rows)
+                # Ids desde la ancla (incluida) hasta la siguiente (excluida).
+                ranges.append((anchor - 1, following))
+
+        if not (state.ordered and ordered):
+            # Sin orden, o con un fragmento dudoso (filas fuera de orden, títulos con saltos de
+            # línea), se compara el archivo completo.
+            rows, _ = storage.parse_rows(kind, data[data.find(b'\n') + 1:])
+            ordered = _ascending(row[0] for row in rows)
+            ranges = [(0, None)]
+
+        state.chunks = chunks
+        state.ordered = ordered
+        return self.manager.merge_rows(kind, rows, ranges)
+
+    # Interpreta las filas de un fragmento y comprueba que se puedan comparar solas: todas legibles,
+    # sin comillas abiertas y con ids crecientes desde 'anchor' y menores que 'following'. Devuelve
+    # las filas, o None si hay que comparar el archivo completo.
+    def _chunk_rows(self, kind, data, anchor, following):
+        if data.count(b'"') % 2:
+            return None
+        rows, errors = self.manager.storage.parse_rows(kind, data)
+        ids = [row[0] for row in rows]
+        if errors or not _ascending(ids) or ids and (ids[0] < anchor or
+                                                     following is not None and ids[-1] >= following):
+            return None
+        return rows
+
+    # Aplica los registros nuevos del diario. Si otro programa compactó (los CSV se reescribieron
+    # o el diario se achicó), el diario se vuelve a leer desde el principio; aplicarlo es idempotente.
+    def _read_journal(self, rewritten):
+        storage = self.manager.storage
+        try:
+            size = os.path.getsize(storage.journal_file)
+        except OSError:
+            size = 0
+        if rewritten or size < self.journal_offset:
+            self.journal_offset = 0
+        if size == self.journal_offset:
+            return []
+        records, self.journal_offset = storage.read_changes(self.journal_offset)
+        return self.manager.apply_records(records)